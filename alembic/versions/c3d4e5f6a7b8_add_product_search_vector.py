@@ -0,0 +1,39 @@
+"""Add product full-text search vector
+
+Revision ID: c3d4e5f6a7b8
+Revises: b7c8d9e0f1a2
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op  # type: ignore[attr-defined]
+
+from app.models.product import SEARCH_VECTOR_EXPRESSION
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c3d4e5f6a7b8"
+down_revision: Union[str, Sequence[str], None] = "b7c8d9e0f1a2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Generated column keeps the search document in sync with name/description
+    op.execute(
+        "ALTER TABLE product ADD COLUMN IF NOT EXISTS search_vector tsvector "
+        f"GENERATED ALWAYS AS ({SEARCH_VECTOR_EXPRESSION}) STORED"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_product_search_vector "
+        "ON product USING gin (search_vector)"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP INDEX IF EXISTS idx_product_search_vector")
+    op.execute("ALTER TABLE product DROP COLUMN IF EXISTS search_vector")
@@ -0,0 +1,38 @@
+"""Add composite product indexes for filtered and sorted listings
+
+Revision ID: d4e5f6a7b8c9
+Revises: c3d4e5f6a7b8
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op  # type: ignore[attr-defined]
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d4e5f6a7b8c9"
+down_revision: Union[str, Sequence[str], None] = "c3d4e5f6a7b8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = {
+    "idx_product_price_id": ["price", "id"],
+    "idx_product_category_price_id": ["category", "price", "id"],
+    "idx_product_created_at_id": ["created_at", "id"],
+    "idx_product_category_created_at_id": ["category", "created_at", "id"],
+    "idx_product_category_name_id": ["category", "name", "id"],
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for name, columns in INDEXES.items():
+        op.create_index(name, "product", columns, unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name in reversed(list(INDEXES)):
+        op.drop_index(name, table_name="product")
@@ -0,0 +1,62 @@
+"""Add stored cart totals maintained by CartService
+
+Revision ID: f6a7b8c9d0e1
+Revises: e5f6a7b8c9d0
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op  # type: ignore[attr-defined]
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f6a7b8c9d0e1"
+down_revision: Union[str, Sequence[str], None] = "e5f6a7b8c9d0"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "cart",
+        sa.Column("total_items", sa.Integer(), nullable=False, server_default="0"),
+    )
+    op.add_column(
+        "cart",
+        sa.Column("total_quantity", sa.Integer(), nullable=False, server_default="0"),
+    )
+    op.add_column(
+        "cart",
+        sa.Column("subtotal", sa.Float(), nullable=False, server_default="0"),
+    )
+    op.execute(
+        """
+        UPDATE cart SET
+            total_items = totals.total_items,
+            total_quantity = totals.total_quantity,
+            subtotal = totals.subtotal
+        FROM (
+            SELECT
+                cart_id,
+                COUNT(*) AS total_items,
+                SUM(quantity) AS total_quantity,
+                SUM(quantity * unit_price) AS subtotal
+            FROM cart_item
+            GROUP BY cart_id
+        ) AS totals
+        WHERE cart.id = totals.cart_id
+        """
+    )
+    for column in ("total_items", "total_quantity", "subtotal"):
+        op.alter_column("cart", column, server_default=None)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("cart", "subtotal")
+    op.drop_column("cart", "total_quantity")
+    op.drop_column("cart", "total_items")
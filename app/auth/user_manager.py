@@ -1,11 +1,14 @@
 from typing import Optional
 from uuid import UUID
-from fastapi import Depends, Request
+from fastapi import Depends, Request, Response
 from fastapi_users import BaseUserManager, UUIDIDMixin
+from fastapi_users_db_sqlalchemy import SQLAlchemyUserDatabase
 
 from app.models.user import User
 from app.core.config import SECRET_KEY
 from app.database import get_user_db
+from app.middleware import get_session_id_from_state, mark_cart_merged
+from app.services.cart_service import CartService
 
 
 class UserManager(UUIDIDMixin, BaseUserManager[User, UUID]):  # type: ignore[type-var]
@@ -15,6 +18,23 @@ class UserManager(UUIDIDMixin, BaseUserManager[User, UUID]):  # type: ignore[typ
     async def on_after_register(self, user: User, request: Optional[Request] = None):
         print(f"User {user.id} has registered.")
 
+    async def on_after_login(
+        self,
+        user: User,
+        request: Optional[Request] = None,
+        response: Optional[Response] = None,
+    ):
+        # Merge the guest cart once, here, in the request's session, and mark
+        # the session so cart requests no longer look up the session cart
+        if request is None or not isinstance(self.user_db, SQLAlchemyUserDatabase):
+            return
+        session_id = get_session_id_from_state(request)
+        if session_id:
+            await CartService(self.user_db.session).merge_session_cart(
+                user.id, session_id
+            )
+            mark_cart_merged(request, user.id)
+
 
 async def get_user_manager(user_db=Depends(get_user_db)):
     yield UserManager(user_db)
@@ -0,0 +1,192 @@
+"""In-process caching primitives shared by the read-heavy services."""
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    List,
+    Set,
+    Tuple,
+    TypeVar,
+)
+
+from prometheus_client import Counter, Gauge
+
+CACHE_HITS = Counter("pyshop_cache_hits_total", "Cache hits", ["cache"])
+CACHE_MISSES = Counter("pyshop_cache_misses_total", "Cache misses", ["cache"])
+CACHE_EVICTIONS = Counter(
+    "pyshop_cache_evictions_total",
+    "Entries evicted to stay within the size bound",
+    ["cache"],
+)
+CACHE_INVALIDATIONS = Counter(
+    "pyshop_cache_invalidations_total",
+    "Entries dropped by write-through invalidation",
+    ["cache"],
+)
+CACHE_ENTRIES = Gauge("pyshop_cache_entries", "Entries currently cached", ["cache"])
+CACHE_COALESCED = Counter(
+    "pyshop_cache_coalesced_loads_total",
+    "Loads that waited on an identical in-flight load instead of querying",
+    ["cache"],
+)
+
+T = TypeVar("T")
+
+MISSING = object()
+
+_registry: List[Any] = []
+
+
+def register_cache(cache: Any) -> None:
+    """Register an in-process structure with a clear() method for clear_all_caches."""
+    _registry.append(cache)
+
+
+class TTLCache:
+    """
+    Bounded LRU cache whose entries also expire after a fixed TTL.
+
+    Entries can carry tags so writers can invalidate every entry derived from a
+    given row or filter without flushing the whole cache.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_entries: int,
+        ttl_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any, Tuple[str, ...]]]" = (
+            OrderedDict()
+        )
+        self._tags: Dict[str, Set[Hashable]] = {}
+        register_cache(self)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Any:
+        """Return the cached value or MISSING."""
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= self.clock():
+            if entry is not None:
+                self._remove(key)
+            CACHE_MISSES.labels(self.name).inc()
+            return MISSING
+
+        self._entries.move_to_end(key)
+        CACHE_HITS.labels(self.name).inc()
+        return entry[1]
+
+    def set(self, key: Hashable, value: Any, tags: Iterable[str] = ()) -> None:
+        """Cache a value, evicting the least recently used entries if full."""
+        if key in self._entries:
+            self._remove(key)
+
+        tags = tuple(tags)
+        self._entries[key] = (self.clock() + self.ttl_seconds, value, tags)
+        for tag in tags:
+            self._tags.setdefault(tag, set()).add(key)
+
+        while len(self._entries) > self.max_entries:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            CACHE_EVICTIONS.labels(self.name).inc()
+
+        CACHE_ENTRIES.labels(self.name).set(len(self._entries))
+
+    def invalidate(self, key: Hashable) -> None:
+        """Drop a single entry."""
+        if key in self._entries:
+            self._remove(key)
+            CACHE_INVALIDATIONS.labels(self.name).inc()
+            CACHE_ENTRIES.labels(self.name).set(len(self._entries))
+
+    def invalidate_tags(self, *tags: str) -> None:
+        """Drop every entry carrying any of the given tags."""
+        keys: Set[Hashable] = set()
+        for tag in tags:
+            keys |= self._tags.get(tag, set())
+
+        for key in keys:
+            self._remove(key)
+
+        if keys:
+            CACHE_INVALIDATIONS.labels(self.name).inc(len(keys))
+            CACHE_ENTRIES.labels(self.name).set(len(self._entries))
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        self._entries.clear()
+        self._tags.clear()
+        CACHE_ENTRIES.labels(self.name).set(0)
+
+    def _remove(self, key: Hashable) -> None:
+        _, _, tags = self._entries.pop(key)
+        for tag in tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+
+class SingleFlight:
+    """
+    Collapses concurrent loads of the same key into a single call.
+
+    The first caller runs the loader; callers arriving while it is in flight
+    await the same result instead of issuing their own query.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._inflight: Dict[Hashable, "asyncio.Future[Any]"] = {}
+
+    async def do(self, key: Hashable, loader: Callable[[], Awaitable[T]]) -> T:
+        future = self._inflight.get(key)
+        if future is not None:
+            CACHE_COALESCED.labels(self.name).inc()
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+                # The leading request was cancelled; load on our own behalf
+                return await self.do(key, loader)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await loader()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark as retrieved so a load without followers does not warn
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._inflight[key]
+
+
+def clear_all_caches() -> None:
+    """Empty every cache created in this process (used by tests and admin tasks)."""
+    for cache in _registry:
+        cache.clear()
@@ -22,3 +22,31 @@ CORS_ORIGINS = [
 CORS_ORIGINS_ENV = os.getenv("CORS_ORIGINS", "")
 if CORS_ORIGINS_ENV:
     CORS_ORIGINS = [origin.strip() for origin in CORS_ORIGINS_ENV.split(",")]
+
+# Encode hot product, cart and order responses directly (with orjson)
+# instead of re-validating them against the response model
+FAST_JSON_RESPONSES = os.getenv("FAST_JSON_RESPONSES", "false").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+
+# In-process product catalog cache
+PRODUCT_CACHE_MAX_ENTRIES = int(os.getenv("PRODUCT_CACHE_MAX_ENTRIES", "1024"))
+PRODUCT_CACHE_TTL_SECONDS = float(os.getenv("PRODUCT_CACHE_TTL_SECONDS", "60"))
+
+# Largest number of ids resolved by one batch product lookup
+PRODUCT_BATCH_MAX_IDS = int(os.getenv("PRODUCT_BATCH_MAX_IDS", "200"))
+
+# Shared-cache lifetime of the public catalog routes (/catalog)
+CATALOG_CACHE_MAX_AGE = int(os.getenv("CATALOG_CACHE_MAX_AGE", "60"))
+CATALOG_CACHE_STALE_WHILE_REVALIDATE = int(
+    os.getenv("CATALOG_CACHE_STALE_WHILE_REVALIDATE", "300")
+)
+
+# Minimum gap between two recorded activity touches of the same cart; reads
+# inside the window leave cart.updated_at alone and commit nothing
+CART_ACTIVITY_TOUCH_SECONDS = int(os.getenv("CART_ACTIVITY_TOUCH_SECONDS", "300"))
+
+# Bulk product import
+PRODUCT_IMPORT_BATCH_SIZE = int(os.getenv("PRODUCT_IMPORT_BATCH_SIZE", "5000"))
@@ -1,10 +1,12 @@
-from typing import Optional
+from typing import Callable, Optional
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import (
     create_async_engine,
     AsyncSession,
     async_sessionmaker,
     AsyncEngine,
 )
+from sqlalchemy.orm import Session
 from fastapi import Depends
 from fastapi_users.db import SQLAlchemyUserDatabase
 from app.models.user import User, Base
@@ -16,10 +18,74 @@ async_session = async_sessionmaker(engine, expire_on_commit=False)
 
 
 async def get_session() -> AsyncSession:  # type: ignore # FastAPI dependency
+    """
+    The request's session: one per request, shared by every dependency and
+    service, open until the response has been sent (streamed exports read
+    from it after the endpoint returns).
+
+    Services flush and leave the commit to unit_of_work; work that must wait
+    for the commit registers with after_commit. The bulk product importer is
+    the one exception and commits each batch itself.
+    """
     async with async_session() as session:
         yield session
 
 
+async def unit_of_work(session: AsyncSession = Depends(get_session)):
+    """
+    Commit the request's session once, after the endpoint returns.
+
+    Installed app-wide with scope="function", so it finishes before the
+    response is sent and a failed commit still reaches the client as an
+    error. Any exception from the endpoint rolls the whole request back.
+    """
+    try:
+        yield session
+    except Exception:
+        await session.rollback()
+        raise
+    await session.commit()
+
+
+def after_commit(session: AsyncSession, callback: Callable[[], None]) -> None:
+    """
+    Run callback once the session's current transaction commits.
+
+    Used for in-process state derived from the database (caches, indexes),
+    which must not change for writes that are later rolled back. Callbacks
+    are dropped on rollback and must not touch the session.
+    """
+    session.info.setdefault("after_commit", []).append(callback)
+
+
+@event.listens_for(Session, "after_commit")
+def _run_after_commit(session: Session) -> None:
+    for callback in session.info.pop("after_commit", []):
+        callback()
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_after_commit(session: Session) -> None:
+    session.info.pop("after_commit", None)
+
+
+def dialect_name(session: AsyncSession) -> str:
+    """Name of the SQL dialect a session is bound to (e.g. "postgresql", "sqlite")."""
+    return session.get_bind().dialect.name
+
+
+def dialect_insert(session: AsyncSession):
+    """
+    INSERT construct of the session's dialect, which supports
+    on_conflict_do_update / on_conflict_do_nothing (Postgres and SQLite).
+    """
+    if dialect_name(session) == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert
+
+
 async def init_db(db_engine: Optional[AsyncEngine] = None) -> None:
     _engine = db_engine or engine
     async with _engine.begin() as conn:
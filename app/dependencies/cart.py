@@ -7,7 +7,12 @@ from app.services.cart_service import CartService
 from app.models.cart import Cart
 from app.models.user import User
 from app.routers.profile import current_user_optional
-from app.middleware import get_session_id_from_state
+from app.middleware import (
+    get_cart_merged_user_id,
+    get_session_id_from_state,
+    is_new_session,
+    mark_cart_merged,
+)
 
 
 def get_cart_service(session: AsyncSession = Depends(get_session)) -> CartService:
@@ -31,6 +36,7 @@ def get_session_id(request: Request) -> Optional[str]:
 
 
 async def get_current_cart(
+    request: Request,
     cart_service: CartService = Depends(get_cart_service),
     session_id: Optional[str] = Depends(get_session_id),
     current_user: Optional[User] = Depends(current_user_optional),
@@ -40,45 +46,53 @@ async def get_current_cart(
 
     Priority:
     1. If user is authenticated, get/create user cart
-    2. If user is not authenticated, get/create session cart
-    3. If both exist (user logged in with session cart), merge them
+    2. If user is not authenticated, get the session cart, or a virtual empty
+       cart when the session has none; see get_or_create_current_cart
+
+    The guest cart is merged into the user cart once, normally at login. The
+    signed marker the merge leaves in the session cookie lets authenticated
+    requests skip the session-cart lookup, as do clients without a session
+    cookie (bearer-only API clients); requests from sessions without it (e.g.
+    logged in before the marker existed) merge here once instead.
     """
-    user_id = current_user.id if current_user else None
-
-    if user_id:
-        # User is authenticated
-        try:
-            # Try to get user's cart
-            user_cart = await cart_service.get_or_create_cart(user_id=user_id)
-
-            # Check if there's also a session cart to merge
-            if session_id and session_id != str(user_cart.id):
-                try:
-                    session_cart = await cart_service.get_or_create_cart(
-                        session_id=session_id
-                    )
-                    if session_cart.id != user_cart.id and session_cart.items:
-                        # Merge session cart into user cart
-                        user_cart = await cart_service.merge_carts(
-                            source_cart_id=session_cart.id, target_cart_id=user_cart.id
-                        )
-                except Exception:
-                    # If session cart doesn't exist or merge fails, continue with user cart
-                    pass
-
-            return user_cart
-
-        except Exception as e:
-            # Fallback to session cart if user cart fails
-            if session_id:
-                return await cart_service.get_or_create_cart(session_id=session_id)
-            raise e
-    else:
-        # User is not authenticated, use session cart
-        if not session_id:
-            raise ValueError("No session ID available for guest cart")
-
-        return await cart_service.get_or_create_cart(session_id=session_id)
+    if current_user:
+        cart = None
+        if (
+            session_id
+            and not is_new_session(request)
+            and get_cart_merged_user_id(request) != str(current_user.id)
+        ):
+            cart, _ = await cart_service.merge_session_cart(current_user.id, session_id)
+            mark_cart_merged(request, current_user.id)
+        return cart or await cart_service.get_or_create_cart(user_id=current_user.id)
+
+    # User is not authenticated, use session cart
+    if not session_id:
+        raise ValueError("No session ID available for guest cart")
+
+    # Guest activity after a merge must be merged again at the next login
+    mark_cart_merged(request, None)
+
+    # Crawlers and bounce visitors only read, so no row is inserted for them;
+    # a session minted by this very request cannot have a cart to look up
+    cart = None
+    if not is_new_session(request):
+        cart = await cart_service.get_active_cart(session_id=session_id)
+    return cart or cart_service.virtual_cart(session_id)
+
+
+async def get_or_create_current_cart(
+    current_cart: Cart = Depends(get_current_cart),
+    cart_service: CartService = Depends(get_cart_service),
+) -> Cart:
+    """
+    Get the current cart, inserting the row of a virtual guest cart.
+
+    For adding items, the only operation that needs a persisted cart.
+    """
+    if not cart_service.is_virtual(current_cart):
+        return current_cart
+    return await cart_service.get_or_create_cart(session_id=current_cart.session_id)
 
 
 async def get_cart_by_id(
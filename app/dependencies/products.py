@@ -0,0 +1,23 @@
+from fastapi import Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_session
+from app.models.product import parse_product_fields
+from app.services.product_service import ProductService
+
+
+def get_product_service(session: AsyncSession = Depends(get_session)) -> ProductService:
+    """Dependency to get product service instance."""
+    return ProductService(session)
+
+
+def get_product_fields(
+    fields: str | None = Query(
+        None,
+        description="Comma-separated fields to return, e.g. id,name,price,image_url",
+    )
+) -> tuple[str, ...] | None:
+    """Dependency parsing the sparse fieldset of product endpoints."""
+    try:
+        return parse_product_fields(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
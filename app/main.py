@@ -1,10 +1,11 @@
 # app/main.py
 from contextlib import asynccontextmanager
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from app.routers import products, profile, cart, auth, orders
-from app.database import init_db
+from app.routers import products, catalog, profile, cart, auth, orders
+from app.database import init_db, async_session, unit_of_work
+from app.services.product_suggest import suggest_index
 from app.core.config import GIT_SHA, CORS_ORIGINS
 from app.middleware import SessionMiddleware
 from prometheus_fastapi_instrumentator import Instrumentator
@@ -23,11 +24,16 @@ async def lifespan(app: FastAPI):
     await init_db()
     logger.info("DB schema ensured")
 
+    async with async_session() as session:
+        await suggest_index.load(session)
+    logger.info(f"Product suggest index built with {len(suggest_index)} names")
+
     yield
     logger.info("App shutdown complete")
 
 
-app = FastAPI(lifespan=lifespan)
+# Commit each request's session once, after the endpoint returns
+app = FastAPI(lifespan=lifespan, dependencies=[Depends(unit_of_work, scope="function")])
 
 # Session middleware for cart functionality (before CORS)
 app.add_middleware(SessionMiddleware)
@@ -39,6 +45,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag"],
 )
 
 instrumentator = Instrumentator()
@@ -53,6 +60,8 @@ app.include_router(auth.router)
 
 app.include_router(products.router)
 
+app.include_router(catalog.router)
+
 app.include_router(profile.router)
 
 app.include_router(cart.router)
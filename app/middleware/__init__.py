@@ -2,6 +2,9 @@ from .session import (
     SessionMiddleware,
     CookieCleanupMiddleware,
     get_session_id_from_state,
+    is_new_session,
+    get_cart_merged_user_id,
+    mark_cart_merged,
     get_secure_session_cookie,
 )
 
@@ -9,5 +12,8 @@ __all__ = [
     "SessionMiddleware",
     "CookieCleanupMiddleware",
     "get_session_id_from_state",
+    "is_new_session",
+    "get_cart_merged_user_id",
+    "mark_cart_merged",
     "get_secure_session_cookie",
 ]
@@ -1,11 +1,30 @@
-from typing import Callable, Optional
-from uuid import uuid4
+from typing import Callable, Optional, Tuple
+from uuid import UUID, uuid4
 from fastapi import Request, Response
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.types import ASGIApp
 from app.utils.cookies import create_session_cookie
 
 
+def parse_session_cookie(value: Optional[str]) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Split a session cookie value into (session_id, merged_user_id).
+
+    The value is the session ID, optionally followed by ":<user id>" once the
+    session's guest cart has been merged into that user's cart. Cookies
+    written before the marker existed hold the bare session ID.
+    """
+    if not value:
+        return None, None
+    session_id, _, merged_user_id = value.partition(":")
+    return session_id or None, merged_user_id or None
+
+
+def format_session_cookie(session_id: str, merged_user_id: Optional[str]) -> str:
+    """Inverse of parse_session_cookie."""
+    return f"{session_id}:{merged_user_id}" if merged_user_id else session_id
+
+
 class SessionMiddleware(BaseHTTPMiddleware):
     """
     Enhanced middleware for secure session management with shopping cart functionality.
@@ -38,26 +57,39 @@ class SessionMiddleware(BaseHTTPMiddleware):
         """Process request and manage secure session state."""
 
         # Extract and validate session ID from secure cookie
-        session_id: Optional[str] = self.secure_cookie.get_cookie(request)
+        session_id, merged_user_id = parse_session_cookie(
+            self.secure_cookie.get_cookie(request)
+        )
 
         # Generate new session ID if none exists or cookie was invalid
+        is_new_session = not session_id
         if not session_id:
             session_id = str(uuid4())
 
-        # Store session ID in request state for dependency access
+        # Store session ID and merge marker in request state for dependency
+        # access
         request.state.session_id = session_id
+        request.state.session_is_new = is_new_session
+        request.state.cart_merged_user_id = merged_user_id
 
         # Process the request
         response = await call_next(request)
 
         # Set/update secure session cookie if this is a cart-related endpoint
-        # and we don't have an existing valid session cookie
-        if self._should_set_cookie(request, session_id):
-            self.secure_cookie.set_cookie(response, session_id)
+        # and we don't have an existing valid session cookie, or if the
+        # request merged the guest cart (e.g. at login)
+        cookie_value = format_session_cookie(
+            session_id, request.state.cart_merged_user_id
+        )
+        if (
+            self._should_set_cookie(request, cookie_value)
+            or request.state.cart_merged_user_id != merged_user_id
+        ):
+            self.secure_cookie.set_cookie(response, cookie_value)
 
         return response
 
-    def _should_set_cookie(self, request: Request, session_id: str) -> bool:
+    def _should_set_cookie(self, request: Request, cookie_value: str) -> bool:
         """
         Determine if we should set the session cookie.
 
@@ -73,8 +105,8 @@ class SessionMiddleware(BaseHTTPMiddleware):
             return False
 
         # Check if we have a valid existing cookie
-        existing_session = self.secure_cookie.get_cookie(request)
-        if existing_session == session_id:
+        existing_value = self.secure_cookie.get_cookie(request)
+        if existing_value == cookie_value:
             return False
 
         # Set cookie for new sessions or when session ID differs/is invalid
@@ -143,6 +175,28 @@ def get_session_id_from_state(request: Request) -> Optional[str]:
     return getattr(request.state, "session_id", None)
 
 
+def is_new_session(request: Request) -> bool:
+    """
+    Whether the session ID was minted for this request (no valid cookie), in
+    which case nothing can have been stored under it yet.
+    """
+    return getattr(request.state, "session_is_new", False)
+
+
+def get_cart_merged_user_id(request: Request) -> Optional[str]:
+    """ID of the user this session's guest cart was last merged into."""
+    return getattr(request.state, "cart_merged_user_id", None)
+
+
+def mark_cart_merged(request: Request, user_id: Optional[UUID]) -> None:
+    """
+    Record in the session cookie that the guest cart was merged into a user's
+    cart, or clear the marker with None once the session is used as a guest
+    again. The middleware writes the signed cookie on the way out.
+    """
+    request.state.cart_merged_user_id = str(user_id) if user_id else None
+
+
 def get_secure_session_cookie(
     cookie_name: str = "pyshop_cart_session",
     secure: bool = False,
@@ -55,10 +55,16 @@ class Cart(Base):
     expires_at: Mapped[Optional[datetime]] = mapped_column(
         DateTime, nullable=True, index=True
     )
-
-    # Relationships
+    # Stored totals, kept in step with the items by every CartService mutation
+    # so the summary never has to load the items
+    total_items: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    total_quantity: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    subtotal: Mapped[float] = mapped_column(Float, default=0.0, nullable=False)
+
+    # Relationships load lazily; queries pick a profile from
+    # app.services.loader_profiles for what they need
     items: Mapped[List["CartItem"]] = relationship(
-        "CartItem", back_populates="cart", cascade="all, delete-orphan", lazy="selectin"
+        "CartItem", back_populates="cart", cascade="all, delete-orphan", lazy="select"
     )
     # Note: User relationship handled by foreign key
 
@@ -95,7 +101,7 @@ class CartItem(Base):
 
     # Relationships
     cart: Mapped["Cart"] = relationship("Cart", back_populates="items")
-    product: Mapped["Product"] = relationship(Product, lazy="selectin")
+    product: Mapped["Product"] = relationship(Product, lazy="select")
 
     __table_args__ = (
         UniqueConstraint("cart_id", "product_id", name="uq_cart_product"),
@@ -88,12 +88,13 @@ class Order(Base):
     shipped_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
     delivered_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
 
-    # Relationships
+    # Relationships load lazily; queries pick a profile from
+    # app.services.loader_profiles for what they need
     items: Mapped[List["OrderItem"]] = relationship(
         "OrderItem",
         back_populates="order",
         cascade="all, delete-orphan",
-        lazy="selectin",
+        lazy="select",
     )
 
     __table_args__ = (
@@ -129,9 +130,10 @@ class OrderItem(Base):
         DateTime, default=datetime.utcnow, nullable=False
     )
 
-    # Relationships
+    # Relationships; product_name snapshots the name, so order reads never
+    # need the product
     order: Mapped["Order"] = relationship("Order", back_populates="items")
-    product: Mapped["Product"] = relationship(Product, lazy="selectin")
+    product: Mapped["Product"] = relationship(Product, lazy="select")
 
     __table_args__ = (Index("idx_orderitem_order_id", "order_id"),)
 
@@ -1,8 +1,11 @@
 from datetime import datetime
-from sqlalchemy import String, Float
+from enum import Enum
+from functools import lru_cache
+from sqlalchemy import DDL, String, Float, Index, event
 from sqlalchemy.orm import Mapped, mapped_column
+from app.core.config import PRODUCT_BATCH_MAX_IDS
 from app.models.user import Base
-from pydantic import BaseModel, ConfigDict, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, create_model, field_validator
 
 
 class Product(Base):
@@ -16,6 +19,55 @@ class Product(Base):
     image_url: Mapped[str | None] = mapped_column(String, nullable=True)
     stock: Mapped[int] = mapped_column(default=100)
     created_at: Mapped[datetime] = mapped_column(default=datetime.now)
+    updated_at: Mapped[datetime] = mapped_column(
+        default=datetime.now, onupdate=datetime.now
+    )
+
+    __table_args__ = (
+        # Keyset pagination seeks on (<sort key>, id), optionally behind an
+        # equality filter on category, so every listing is an index range scan
+        Index("idx_product_category_id", "category", "id"),
+        Index("idx_product_price_id", "price", "id"),
+        Index("idx_product_category_price_id", "category", "price", "id"),
+        Index("idx_product_created_at_id", "created_at", "id"),
+        Index("idx_product_category_created_at_id", "category", "created_at", "id"),
+        Index("idx_product_category_name_id", "category", "name", "id"),
+    )
+
+
+class ProductSort(str, Enum):
+    ID = "id"
+    PRICE = "price"
+    PRICE_DESC = "-price"
+    CREATED_AT = "created_at"
+    CREATED_AT_DESC = "-created_at"
+    NAME = "name"
+
+
+# Full-text search document: name matches (weight A) rank above description
+# matches (weight B). Postgres maintains it as a generated column, so it is not
+# mapped on the model and never loaded with a product.
+SEARCH_VECTOR_EXPRESSION = (
+    "setweight(to_tsvector('english', coalesce(name, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'B')"
+)
+
+event.listen(
+    Product.__table__,
+    "after_create",
+    DDL(
+        "ALTER TABLE product ADD COLUMN IF NOT EXISTS search_vector tsvector "
+        f"GENERATED ALWAYS AS ({SEARCH_VECTOR_EXPRESSION}) STORED"
+    ).execute_if(dialect="postgresql"),
+)
+event.listen(
+    Product.__table__,
+    "after_create",
+    DDL(
+        "CREATE INDEX IF NOT EXISTS idx_product_search_vector "
+        "ON product USING gin (search_vector)"
+    ).execute_if(dialect="postgresql"),
+)
 
 
 class ProductBase(BaseModel):
@@ -138,7 +190,77 @@ class ProductUpdate(BaseModel):
         return v
 
 
+class ProductImportResult(BaseModel):
+    received: int = Field(..., description="Rows read from the upload")
+    imported: int = Field(..., description="Rows inserted or updated")
+    rejected: int = Field(..., description="Rows that failed validation")
+    errors: list[str] = Field(
+        default_factory=list, description="First validation errors, by row number"
+    )
+
+
+class CategoryFacet(BaseModel):
+    category: str = Field(..., description="Category name")
+    product_count: int = Field(..., description="Products in the category")
+    in_stock_count: int = Field(..., description="Products with stock > 0")
+    min_price: float = Field(..., description="Lowest price in the category")
+    max_price: float = Field(..., description="Highest price in the category")
+
+
+class ProductBatchRequest(BaseModel):
+    ids: list[int] = Field(
+        ...,
+        min_length=1,
+        max_length=PRODUCT_BATCH_MAX_IDS,
+        description="Product IDs, returned in this order",
+    )
+
+
+class ProductSuggestion(BaseModel):
+    id: int = Field(..., description="Product ID")
+    name: str = Field(..., description="Product name")
+
+
 class ProductRead(ProductBase):
     id: int = Field(..., gt=0, description="Product ID must be positive")
     created_at: datetime = Field(..., description="Product creation timestamp")
+    updated_at: datetime | None = Field(
+        None, description="Product last update timestamp"
+    )
     model_config = ConfigDict(from_attributes=True)
+
+
+# Fields a client can select with ?fields=, in response order
+PRODUCT_READ_FIELDS = tuple(ProductRead.model_fields)
+
+
+def parse_product_fields(fields: str | None) -> tuple[str, ...] | None:
+    """
+    Parse a comma-separated sparse fieldset.
+
+    Returns the selected fields in response order, always including id, or
+    None when every field is wanted. Raises ValueError for unknown fields.
+    """
+    if not fields:
+        return None
+    selected = {f.strip() for f in fields.split(",") if f.strip()}
+    unknown = selected - set(PRODUCT_READ_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown product fields: {', '.join(sorted(unknown))}")
+    selected.add("id")
+    if len(selected) == len(PRODUCT_READ_FIELDS):
+        return None
+    return tuple(f for f in PRODUCT_READ_FIELDS if f in selected)
+
+
+@lru_cache(maxsize=None)
+def product_read_model(fields: tuple[str, ...]) -> type[BaseModel]:
+    """ProductRead trimmed to a sparse fieldset from parse_product_fields."""
+    return create_model(
+        "ProductRead_" + "_".join(fields),
+        __config__=ConfigDict(from_attributes=True),
+        **{
+            f: (ProductRead.model_fields[f].annotation, ProductRead.model_fields[f])
+            for f in fields
+        },
+    )
@@ -1,9 +1,11 @@
 from typing import Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from app.core.config import FAST_JSON_RESPONSES
 from app.dependencies.cart import (
     get_cart_service,
     get_current_cart,
+    get_or_create_current_cart,
     get_session_id,
     get_cart_resolution_service,
 )
@@ -18,44 +20,60 @@ from app.models.cart import (
     BulkCartUpdate,
     CartValidationResult,
 )
+from app.middleware import mark_cart_merged
 from app.models.user import User
-from app.routers.profile import current_active_user
-
-
-router = APIRouter(prefix="/cart", tags=["cart"])
+from app.routers.profile import current_active_user, current_user_optional
+from app.utils.etags import PRIVATE_CACHE_HEADERS, etag_matches, not_modified
+from app.utils.negotiation import NegotiatedRoute
+from app.utils.responses import NegotiatedResponse, fast_json_response
+
+router = APIRouter(
+    prefix="/cart",
+    tags=["cart"],
+    route_class=NegotiatedRoute,
+    default_response_class=NegotiatedResponse,
+)
 
 
 @router.get("", response_model=CartRead)
 async def get_cart(
+    request: Request,
+    response: Response,
     current_cart: Cart = Depends(get_current_cart),
     cart_service: CartService = Depends(get_cart_service),
 ):
-    """Get current user's cart with all items."""
+    """
+    Get current user's cart with all items.
+
+    Supports If-None-Match: an unchanged cart answers 304 without building
+    the read model.
+    """
+    headers = {
+        **PRIVATE_CACHE_HEADERS,
+        "ETag": cart_service.get_cart_etag(current_cart),
+    }
+    if etag_matches(request, headers["ETag"]):
+        return not_modified(headers["ETag"], headers)
+
+    if FAST_JSON_RESPONSES:
+        return fast_json_response(
+            await cart_service.get_cart_payload(current_cart), headers=headers
+        )
+    response.headers.update(headers)
     return await cart_service.get_cart_read_model(current_cart)
 
 
 @router.post("/items", response_model=CartItemRead)
 async def add_item_to_cart(
     item: CartItemCreate,
-    current_cart: Cart = Depends(get_current_cart),
+    current_cart: Cart = Depends(get_or_create_current_cart),
     cart_service: CartService = Depends(get_cart_service),
 ):
     """Add item to cart or update quantity if item already exists."""
     try:
-        cart_item = await cart_service.add_item(
+        return await cart_service.add_item(
             cart_id=current_cart.id, product_id=item.product_id, quantity=item.quantity
         )
-
-        return CartItemRead(
-            id=cart_item.id,
-            product_id=cart_item.product_id,
-            product_name=cart_item.product.name,
-            quantity=cart_item.quantity,
-            unit_price=cart_item.unit_price,
-            total_price=round(cart_item.quantity * cart_item.unit_price, 2),
-            created_at=cart_item.created_at,
-            updated_at=cart_item.updated_at,
-        )
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception:
@@ -122,7 +140,10 @@ async def clear_cart(
 ):
     """Remove all items from cart."""
     try:
-        success = await cart_service.clear_cart(current_cart.id)
+        # A virtual cart has no row and nothing to clear
+        success = cart_service.is_virtual(current_cart) or (
+            await cart_service.clear_cart(current_cart.id)
+        )
 
         if not success:
             raise HTTPException(status_code=404, detail="Cart not found")
@@ -136,12 +157,22 @@ async def clear_cart(
 
 @router.get("/summary", response_model=CartSummary)
 async def get_cart_summary(
-    current_cart: Cart = Depends(get_current_cart),
     cart_service: CartService = Depends(get_cart_service),
+    session_id: Optional[str] = Depends(get_session_id),
+    current_user: Optional[User] = Depends(current_user_optional),
 ):
-    """Get cart summary with totals and item count."""
+    """
+    Get cart summary with totals and item count.
+
+    Cheap enough for a header badge: one cart row is read, items are not
+    loaded and no cart is created.
+    """
     try:
-        return await cart_service.calculate_cart_summary(current_cart)
+        return await cart_service.get_summary(
+            user_id=current_user.id if current_user else None, session_id=session_id
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception:
         raise HTTPException(status_code=500, detail="Failed to calculate cart summary")
 
@@ -154,17 +185,16 @@ async def bulk_update_cart(
 ):
     """Bulk update multiple cart items."""
     try:
-        # Update each item
-        for item_data in bulk_update.items:
-            item_id = UUID(item_data["id"])
-            quantity = item_data["quantity"]
-
-            await cart_service.update_item_quantity(
-                cart_id=current_cart.id, item_id=item_id, quantity=quantity
-            )
-
-        # Return updated cart
-        updated_cart = await cart_service.get_cart_by_id(current_cart.id)
+        quantities = {
+            UUID(item_data["id"]): item_data["quantity"]
+            for item_data in bulk_update.items
+        }
+        if cart_service.is_virtual(current_cart):
+            # No items to update
+            return await cart_service.get_cart_read_model(current_cart)
+        updated_cart = await cart_service.bulk_update_quantities(
+            cart_id=current_cart.id, quantities=quantities
+        )
         if updated_cart is None:
             raise HTTPException(status_code=404, detail="Cart not found")
         return await cart_service.get_cart_read_model(updated_cart)
@@ -176,13 +206,17 @@ async def bulk_update_cart(
 
 @router.post("/merge")
 async def merge_session_cart(
+    request: Request,
     current_user: User = Depends(current_active_user),
     cart_service: CartService = Depends(get_cart_service),
     session_id: Optional[str] = Depends(get_session_id),
 ):
     """
     Merge session cart with user cart when user logs in.
-    This endpoint is typically called after authentication.
+
+    Login already does this; the endpoint is for clients that authenticate
+    another way. Either records the merge in the session cookie, so later cart
+    requests skip the session-cart lookup.
     """
     if not current_user:
         raise HTTPException(status_code=401, detail="Authentication required")
@@ -191,24 +225,18 @@ async def merge_session_cart(
         return {"message": "No session cart to merge"}
 
     try:
-        # Get user cart
-        user_cart = await cart_service.get_or_create_cart(user_id=current_user.id)
-
-        # Get session cart
-        session_cart = await cart_service.get_or_create_cart(session_id=session_id)
-
-        if user_cart.id == session_cart.id:
-            return {"message": "Carts are already the same"}
-
-        # Merge session cart into user cart
-        merged_cart = await cart_service.merge_carts(
-            source_cart_id=session_cart.id, target_cart_id=user_cart.id
+        merged_cart, items_merged = await cart_service.merge_session_cart(
+            user_id=current_user.id, session_id=session_id
         )
+        mark_cart_merged(request, current_user.id)
+
+        if not merged_cart:
+            return {"message": "No session cart to merge"}
 
         return {
             "message": "Session cart merged successfully",
             "cart_id": str(merged_cart.id),
-            "items_merged": len(session_cart.items),
+            "items_merged": items_merged,
         }
     except Exception:
         raise HTTPException(status_code=500, detail="Failed to merge carts")
@@ -245,7 +273,7 @@ async def validate_cart(
     """
     try:
         validation_result = await resolution_service.resolve_and_validate_cart(
-            current_cart.id
+            current_cart
         )
         return validation_result
     except Exception as e:
@@ -263,7 +291,7 @@ async def optimize_cart(
     Optimize cart by removing invalid items and fixing quantity constraints.
     """
     try:
-        changes_made, messages = await resolution_service.optimize_cart(current_cart.id)
+        changes_made, messages = await resolution_service.optimize_cart(current_cart)
 
         return {
             "optimized": changes_made,
@@ -285,7 +313,7 @@ async def get_cart_health(
     Get comprehensive health report for the current cart.
     """
     try:
-        health_report = await resolution_service.get_cart_health_report(current_cart.id)
+        health_report = await resolution_service.get_cart_health_report(current_cart)
         return health_report
     except Exception as e:
         raise HTTPException(
@@ -0,0 +1,154 @@
+from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+
+from app.core.config import (
+    CATALOG_CACHE_MAX_AGE,
+    CATALOG_CACHE_STALE_WHILE_REVALIDATE,
+    FAST_JSON_RESPONSES,
+    PRODUCT_BATCH_MAX_IDS,
+)
+from app.dependencies.products import get_product_fields, get_product_service
+from app.models.product import CategoryFacet, ProductRead, ProductSort
+from app.services.product_service import ProductService
+from app.utils.pagination import InvalidCursorError
+from app.utils.etags import etag_matches, not_modified
+from app.utils.negotiation import NegotiatedRoute
+from app.utils.responses import (
+    NegotiatedResponse,
+    fast_json_response,
+    fieldset_response,
+)
+
+router = APIRouter(
+    prefix="/catalog",
+    tags=["catalog"],
+    route_class=NegotiatedRoute,
+    default_response_class=NegotiatedResponse,
+)
+
+# Responses are identical for every visitor, so shared caches (CDN, reverse
+# proxy) may store them; they are never personalized and set no cookies.
+CACHE_HEADERS = {
+    "Cache-Control": (
+        f"public, max-age={CATALOG_CACHE_MAX_AGE}, "
+        f"stale-while-revalidate={CATALOG_CACHE_STALE_WHILE_REVALIDATE}"
+    ),
+    "Vary": "Accept, Accept-Encoding",
+}
+
+
+def public_cache(response: Response) -> Response:
+    """Dependency marking a successful response as publicly cacheable."""
+    response.headers.update(CACHE_HEADERS)
+    return response
+
+
+@router.get("/products", response_model=List[ProductRead])
+async def list_catalog_products(
+    request: Request,
+    response: Response = Depends(public_cache),
+    product_service: ProductService = Depends(get_product_service),
+    limit: int = Query(10, ge=1, le=100),
+    category: str | None = Query(None, description="Filter by category"),
+    cursor: str | None = Query(
+        None, description="Opaque cursor from the X-Next-Cursor response header"
+    ),
+    min_price: float | None = Query(None, ge=0, description="Minimum price"),
+    max_price: float | None = Query(None, ge=0, description="Maximum price"),
+    in_stock: bool | None = Query(None, description="Only products in stock"),
+    sort: ProductSort = Query(ProductSort.ID, description="Sort order"),
+    fields: tuple[str, ...] | None = Depends(get_product_fields),
+):
+    """
+    Public, anonymously cacheable product listing.
+
+    Cursor paging only, so every page has a small, stable set of URLs for a
+    shared cache to key on.
+    """
+    try:
+        products, next_cursor, etag = await product_service.list_products(
+            limit=limit,
+            category=category,
+            cursor=cursor,
+            min_price=min_price,
+            max_price=max_price,
+            in_stock=in_stock,
+            sort=sort,
+            fields=fields,
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    response.headers["ETag"] = etag
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    if etag_matches(request, etag):
+        return not_modified(etag, response.headers)
+    if fields:
+        return fieldset_response(products, fields, headers=response.headers)
+    if FAST_JSON_RESPONSES:
+        return fast_json_response(products, headers=response.headers)
+    return products
+
+
+@router.get("/products/batch", response_model=List[ProductRead])
+async def get_catalog_products_batch(
+    ids: str = Query(..., description="Comma-separated product IDs"),
+    fields: tuple[str, ...] | None = Depends(get_product_fields),
+    response: Response = Depends(public_cache),
+    product_service: ProductService = Depends(get_product_service),
+):
+    try:
+        product_ids = [int(i) for i in ids.split(",") if i.strip()]
+    except ValueError:
+        raise HTTPException(status_code=400, detail="ids must be integers")
+    if not product_ids or len(product_ids) > PRODUCT_BATCH_MAX_IDS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Between 1 and {PRODUCT_BATCH_MAX_IDS} ids per request",
+        )
+
+    products = await product_service.get_products(product_ids)
+    if fields:
+        return fieldset_response(products, fields, headers=response.headers)
+    return products
+
+
+@router.get("/products/{product_id}", response_model=ProductRead)
+async def get_catalog_product(
+    product_id: int,
+    fields: tuple[str, ...] | None = Depends(get_product_fields),
+    response: Response = Depends(public_cache),
+    product_service: ProductService = Depends(get_product_service),
+):
+    product = await product_service.get_product(product_id)
+    if not product:
+        raise HTTPException(status_code=404, detail="Product not found")
+    if fields:
+        return fieldset_response(product, fields, headers=response.headers)
+    if FAST_JSON_RESPONSES:
+        return fast_json_response(product, headers=response.headers)
+    return product
+
+
+@router.get("/search", response_model=List[ProductRead])
+async def search_catalog(
+    q: str = Query(..., min_length=1, max_length=200, description="Search keywords"),
+    limit: int = Query(20, ge=1, le=100),
+    category: str | None = Query(None, description="Filter by category"),
+    fields: tuple[str, ...] | None = Depends(get_product_fields),
+    response: Response = Depends(public_cache),
+    product_service: ProductService = Depends(get_product_service),
+):
+    products = await product_service.search_products(q, limit=limit, category=category)
+    if fields:
+        return fieldset_response(products, fields, headers=response.headers)
+    return products
+
+
+@router.get("/facets", response_model=List[CategoryFacet])
+async def get_catalog_facets(
+    response: Response = Depends(public_cache),
+    product_service: ProductService = Depends(get_product_service),
+):
+    return await product_service.get_facets()
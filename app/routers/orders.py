@@ -1,7 +1,8 @@
 from typing import List
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import FAST_JSON_RESPONSES
 from app.database import get_session
 from app.models.user import User
 from app.routers.profile import current_active_user
@@ -13,8 +14,16 @@ from app.models.order import (
 )
 from app.services.checkout_service import CheckoutService
 from app.dependencies.cart import get_user_cart
-
-router = APIRouter(prefix="/orders", tags=["orders"])
+from app.utils.etags import PRIVATE_CACHE_HEADERS, etag_matches, not_modified
+from app.utils.negotiation import NegotiatedRoute
+from app.utils.responses import NegotiatedResponse, fast_json_response
+
+router = APIRouter(
+    prefix="/orders",
+    tags=["orders"],
+    route_class=NegotiatedRoute,
+    default_response_class=NegotiatedResponse,
+)
 
 
 @router.post("/checkout", response_model=OrderRead, status_code=status.HTTP_201_CREATED)
@@ -69,6 +78,8 @@ async def checkout(
 
 @router.get("", response_model=List[OrderListItem])
 async def get_orders(
+    request: Request,
+    response: Response,
     limit: int = 50,
     offset: int = 0,
     user: User = Depends(current_active_user),
@@ -87,26 +98,38 @@ async def get_orders(
         user_id=user.id, limit=limit, offset=offset
     )
 
-    # Convert to list items
-    order_list = []
-    for order in orders:
-        order_list.append(
-            OrderListItem(
-                id=order.id,
-                order_number=order.order_number,
-                status=order.status,
-                payment_status=order.payment_status,
-                total=order.total,
-                items_count=len(order.items),
-                created_at=order.created_at,
-            )
-        )
-
+    headers = {
+        **PRIVATE_CACHE_HEADERS,
+        "ETag": checkout_service.get_orders_etag(orders),
+    }
+    if etag_matches(request, headers["ETag"]):
+        return not_modified(headers["ETag"], headers)
+
+    # Shaped like OrderListItem; validated by the response model unless the
+    # fast JSON path is enabled
+    order_list = [
+        {
+            "id": order.id,
+            "order_number": order.order_number,
+            "status": order.status,
+            "payment_status": order.payment_status,
+            "total": order.total,
+            "items_count": len(order.items),
+            "created_at": order.created_at,
+        }
+        for order in orders
+    ]
+
+    if FAST_JSON_RESPONSES:
+        return fast_json_response(order_list, headers=headers)
+    response.headers.update(headers)
     return order_list
 
 
 @router.get("/{order_id}", response_model=OrderRead)
 async def get_order(
+    request: Request,
+    response: Response,
     order_id: UUID,
     user: User = Depends(current_active_user),
     session: AsyncSession = Depends(get_session),
@@ -124,6 +147,15 @@ async def get_order(
             status_code=status.HTTP_404_NOT_FOUND, detail="Order not found"
         )
 
+    headers = {**PRIVATE_CACHE_HEADERS, "ETag": checkout_service.get_order_etag(order)}
+    if etag_matches(request, headers["ETag"]):
+        return not_modified(headers["ETag"], headers)
+
+    if FAST_JSON_RESPONSES:
+        return fast_json_response(
+            await checkout_service.get_order_payload(order), headers=headers
+        )
+    response.headers.update(headers)
     order_read = await checkout_service.get_order_read_model(order)
     return order_read
 
@@ -1,35 +1,91 @@
 from fastapi import HTTPException
 from typing import List
-from fastapi import APIRouter, Depends, status, Query
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, Request, Response, status, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
 
-from app.models.product import Product
+from app.core.config import FAST_JSON_RESPONSES, PRODUCT_BATCH_MAX_IDS
 from app.database import get_session
-from app.models.product import ProductCreate, ProductRead, ProductUpdate
+from app.models.product import (
+    CategoryFacet,
+    ProductBatchRequest,
+    ProductCreate,
+    ProductImportResult,
+    ProductRead,
+    ProductSort,
+    ProductSuggestion,
+    ProductUpdate,
+)
 from app.models.user import User
 from app.routers.profile import current_active_user
+from app.dependencies.products import get_product_fields, get_product_service
+from app.services.product_import import ImportFormat, ProductImporter
+from app.services.product_service import ProductService
+from app.services.product_suggest import suggest_index
+from app.utils.pagination import InvalidCursorError
+from app.utils.etags import etag_matches, not_modified
+from app.utils.negotiation import NegotiatedRoute
+from app.utils.responses import (
+    NegotiatedResponse,
+    fast_json_response,
+    fieldset_response,
+)
 
-router = APIRouter()
+router = APIRouter(
+    route_class=NegotiatedRoute, default_response_class=NegotiatedResponse
+)
 
 
 @router.get("/products/", response_model=List[ProductRead])
 async def list_products(
+    request: Request,
+    response: Response,
     user: User = Depends(current_active_user),
-    session: AsyncSession = Depends(get_session),
+    product_service: ProductService = Depends(get_product_service),
     limit: int = Query(10, ge=1),
     offset: int = Query(0, ge=0),
     category: str | None = Query(None, description="Filter by category"),
+    cursor: str | None = Query(
+        None, description="Opaque cursor from the X-Next-Cursor response header"
+    ),
+    min_price: float | None = Query(None, ge=0, description="Minimum price"),
+    max_price: float | None = Query(None, ge=0, description="Maximum price"),
+    in_stock: bool | None = Query(None, description="Only products in stock"),
+    sort: ProductSort = Query(ProductSort.ID, description="Sort order"),
+    fields: tuple[str, ...] | None = Depends(get_product_fields),
 ):
-    query = select(Product)
+    if cursor is not None and offset:
+        raise HTTPException(
+            status_code=400, detail="Use either cursor or offset, not both"
+        )
 
-    if category:
-        query = query.where(Product.category == category)
+    try:
+        products, next_cursor, etag = await product_service.list_products(
+            limit=limit,
+            offset=offset,
+            category=category,
+            cursor=cursor,
+            min_price=min_price,
+            max_price=max_price,
+            in_stock=in_stock,
+            sort=sort,
+            fields=fields,
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-    query = query.order_by(Product.id).offset(offset).limit(limit)
-    result = await session.execute(query)
-    return result.scalars().all()
+    headers = {"ETag": etag}
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
+    if etag_matches(request, etag):
+        return not_modified(etag, headers)
+    if fields:
+        return fieldset_response(products, fields, headers=headers)
+    if FAST_JSON_RESPONSES:
+        return fast_json_response(products, headers=headers)
+    response.headers.update(headers)
+    return products
 
 
 @router.post(
@@ -38,16 +94,160 @@ async def list_products(
 async def create_product(
     product_data: ProductCreate,
     user: User = Depends(current_active_user),
-    session: AsyncSession = Depends(get_session),
+    product_service: ProductService = Depends(get_product_service),
 ):
-    product = Product(**product_data.model_dump())
-    session.add(product)
     try:
-        await session.commit()
+        return await product_service.create_product(product_data)
     except IntegrityError:
-        await session.rollback()
         raise HTTPException(status_code=409, detail="Product with this name exists")
-    await session.refresh(product)
+
+
+@router.get("/products/search", response_model=List[ProductRead])
+async def search_products(
+    q: str = Query(..., min_length=1, max_length=200, description="Search keywords"),
+    limit: int = Query(20, ge=1, le=100),
+    category: str | None = Query(None, description="Filter by category"),
+    fields: tuple[str, ...] | None = Depends(get_product_fields),
+    user: User = Depends(current_active_user),
+    product_service: ProductService = Depends(get_product_service),
+):
+    products = await product_service.search_products(q, limit=limit, category=category)
+    if fields:
+        return fieldset_response(products, fields)
+    return products
+
+
+@router.get("/products/batch", response_model=List[ProductRead])
+async def get_products_batch(
+    ids: str = Query(..., description="Comma-separated product IDs"),
+    fields: tuple[str, ...] | None = Depends(get_product_fields),
+    user: User = Depends(current_active_user),
+    product_service: ProductService = Depends(get_product_service),
+):
+    """
+    Resolve many products in one round trip, returned in request order.
+
+    Unknown ids are skipped. Use POST /products/batch for long id lists.
+    """
+    try:
+        product_ids = [int(i) for i in ids.split(",") if i.strip()]
+    except ValueError:
+        raise HTTPException(status_code=400, detail="ids must be integers")
+    if not product_ids:
+        raise HTTPException(status_code=400, detail="ids is required")
+    if len(product_ids) > PRODUCT_BATCH_MAX_IDS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {PRODUCT_BATCH_MAX_IDS} ids per request",
+        )
+    products = await product_service.get_products(product_ids)
+    if fields:
+        return fieldset_response(products, fields)
+    return products
+
+
+@router.post("/products/batch", response_model=List[ProductRead])
+async def post_products_batch(
+    payload: ProductBatchRequest,
+    fields: tuple[str, ...] | None = Depends(get_product_fields),
+    user: User = Depends(current_active_user),
+    product_service: ProductService = Depends(get_product_service),
+):
+    """Body form of GET /products/batch."""
+    products = await product_service.get_products(payload.ids)
+    if fields:
+        return fieldset_response(products, fields)
+    return products
+
+
+@router.get("/products/suggest", response_model=List[ProductSuggestion])
+async def suggest_products(
+    q: str = Query(..., min_length=1, max_length=100, description="Typed prefix"),
+    limit: int = Query(10, ge=1, le=50),
+):
+    """
+    Typeahead suggestions for product names.
+
+    Served entirely from the in-memory prefix index; no authentication or
+    database access, as it fires on every keystroke.
+    """
+    return suggest_index.suggest(q, limit=limit)
+
+
+@router.get("/products/facets", response_model=List[CategoryFacet])
+async def get_product_facets(
+    user: User = Depends(current_active_user),
+    product_service: ProductService = Depends(get_product_service),
+):
+    """Per-category counts and price ranges for category pages and tiles."""
+    return await product_service.get_facets()
+
+
+@router.get("/products/export", response_class=StreamingResponse)
+async def export_products(
+    format: ImportFormat = Query(ImportFormat.NDJSON, description="ndjson or csv"),
+    user: User = Depends(current_active_user),
+    product_service: ProductService = Depends(get_product_service),
+):
+    """
+    Stream the whole catalog for indexers and price-comparison feeds.
+
+    Uses a server-side cursor, so the response starts immediately and memory
+    stays flat however many products there are.
+    """
+    media_type = "text/csv" if format == ImportFormat.CSV else "application/x-ndjson"
+    return StreamingResponse(
+        product_service.export_products(format.value),
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="products.{format.value}"'
+        },
+    )
+
+
+@router.post("/products/import", response_model=ProductImportResult)
+async def import_products(
+    request: Request,
+    format: ImportFormat | None = Query(
+        None, description="csv or ndjson; inferred from Content-Type if omitted"
+    ),
+    user: User = Depends(current_active_user),
+    session: AsyncSession = Depends(get_session),
+):
+    """
+    Bulk import products from a CSV or NDJSON request body.
+
+    Rows are upserted on name. The body is streamed and written in batches,
+    so uploads of any size use bounded memory.
+    """
+    if format is None:
+        content_type = request.headers.get("content-type", "")
+        if "csv" in content_type:
+            format = ImportFormat.CSV
+        elif "ndjson" in content_type or "jsonl" in content_type:
+            format = ImportFormat.NDJSON
+        else:
+            raise HTTPException(
+                status_code=415, detail="Upload text/csv or application/x-ndjson"
+            )
+
+    return await ProductImporter(session).run(request.stream(), format)
+
+
+@router.get("/products/{product_id}", response_model=ProductRead)
+async def get_product(
+    product_id: int,
+    fields: tuple[str, ...] | None = Depends(get_product_fields),
+    user: User = Depends(current_active_user),
+    product_service: ProductService = Depends(get_product_service),
+):
+    product = await product_service.get_product(product_id)
+    if not product:
+        raise HTTPException(status_code=404, detail="Product not found")
+    if fields:
+        return fieldset_response(product, fields)
+    if FAST_JSON_RESPONSES:
+        return fast_json_response(product)
     return product
 
 
@@ -56,18 +256,11 @@ async def update_product(
     product_id: int,
     payload: ProductUpdate,
     user: User = Depends(current_active_user),
-    session: AsyncSession = Depends(get_session),
+    product_service: ProductService = Depends(get_product_service),
 ):
-    result = await session.execute(select(Product).where(Product.id == product_id))
-    product = result.scalars().first()
+    product = await product_service.update_product(product_id, payload)
     if not product:
         raise HTTPException(status_code=404, detail="Product not found")
-
-    for key, value in payload.model_dump(exclude_unset=True).items():
-        setattr(product, key, value)
-
-    await session.commit()
-    await session.refresh(product)
     return product
 
 
@@ -75,12 +268,8 @@ async def update_product(
 async def delete_product(
     product_id: int,
     user: User = Depends(current_active_user),
-    session: AsyncSession = Depends(get_session),
+    product_service: ProductService = Depends(get_product_service),
 ):
-    result = await session.execute(select(Product).where(Product.id == product_id))
-    product = result.scalars().first()
-    if not product:
+    if not await product_service.delete_product(product_id):
         raise HTTPException(status_code=404, detail="Product not found")
-    await session.delete(product)
-    await session.commit()
     return
@@ -6,6 +6,7 @@ from fastapi_users.authentication import (
     JWTStrategy,
 )
 from fastapi_users.password import PasswordHelper
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import UUID
 
 from app.auth.user_manager import get_user_manager
@@ -18,8 +19,13 @@ from app.models.user import (
 )
 from app.core.config import SECRET_KEY, ACCESS_TOKEN_EXPIRE_MINUTES
 from app.core.storage import save_avatar, delete_avatar
+from app.database import get_session
+from app.utils.negotiation import NegotiatedRoute
+from app.utils.responses import NegotiatedResponse
 
-router = APIRouter()
+router = APIRouter(
+    route_class=NegotiatedRoute, default_response_class=NegotiatedResponse
+)
 
 # Configure bearer transport
 bearer_transport = BearerTransport(tokenUrl="/auth/jwt/login")
@@ -84,6 +90,7 @@ async def get_me(user: User = Depends(current_active_user)):
 async def change_password(
     password_data: ChangePasswordRequest,
     user: User = Depends(current_active_user),
+    session: AsyncSession = Depends(get_session),
 ):
     """
     Change user password with current password verification.
@@ -115,34 +122,24 @@ async def change_password(
     # Hash new password
     new_hashed_password = password_helper.hash(password_data.new_password)
 
-    # Update user in database
-    from app.database import async_session
-    from sqlalchemy import select
-
-    async with async_session() as session:
-        # Get user from this session
-        result = await session.execute(select(User).where(User.id == user.id))
-        db_user = result.scalar_one()
+    # The user was loaded by this request's session, so this is an
+    # identity map hit; the request's unit of work commits the change
+    db_user = await session.get(User, user.id)
+    db_user.hashed_password = new_hashed_password
+    await session.flush()
 
-        # Update password
-        db_user.hashed_password = new_hashed_password
-
-        await session.commit()
-        await session.refresh(db_user)
-
-        return db_user
+    return db_user
 
 
 @router.post("/upload-avatar", response_model=UserRead)
 async def upload_avatar(
     file: UploadFile = File(...),
     user: User = Depends(current_active_user),
+    session: AsyncSession = Depends(get_session),
 ):
     """
     Upload user avatar image.
     """
-    from app.database import async_session
-    from sqlalchemy import select
 
     # Delete old avatar if exists
     if user.avatar_url:
@@ -152,44 +149,30 @@ async def upload_avatar(
     avatar_url = await save_avatar(file, str(user.id))
 
     # Update user avatar_url in database
-    async with async_session() as session:
-        # Get user from this session
-        result = await session.execute(select(User).where(User.id == user.id))
-        db_user = result.scalar_one()
-
-        # Update avatar_url
-        db_user.avatar_url = avatar_url
-
-        await session.commit()
-        await session.refresh(db_user)
+    db_user = await session.get(User, user.id)
+    db_user.avatar_url = avatar_url
+    await session.flush()
 
-        return db_user
+    return db_user
 
 
 @router.delete("/delete-avatar", response_model=UserRead)
-async def delete_user_avatar(user: User = Depends(current_active_user)):
+async def delete_user_avatar(
+    user: User = Depends(current_active_user),
+    session: AsyncSession = Depends(get_session),
+):
     """
     Delete user avatar image.
     """
-    from app.database import async_session
-    from sqlalchemy import select
-
     # Delete avatar file
     if user.avatar_url:
         delete_avatar(user.avatar_url)
 
         # Update user in database
-        async with async_session() as session:
-            # Get user from this session
-            result = await session.execute(select(User).where(User.id == user.id))
-            db_user = result.scalar_one()
+        db_user = await session.get(User, user.id)
+        db_user.avatar_url = None
+        await session.flush()
 
-            # Clear avatar_url
-            db_user.avatar_url = None
-
-            await session.commit()
-            await session.refresh(db_user)
-
-            return db_user
+        return db_user
 
     return user
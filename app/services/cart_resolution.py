@@ -1,15 +1,23 @@
 from datetime import datetime
-from typing import List, Tuple
+from typing import Dict, List, Tuple
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import DateTime, case, delete, func, literal, select
+from app.database import dialect_insert, dialect_name
 from app.models.cart import (
     Cart,
+    CartItem,
+    CartItemRead,
     CartStatus,
     CartValidationResult,
 )
-from app.models.product import Product
 from app.services.cart_service import CartService
+from app.services.cart_validation import (
+    MAX_ITEM_QUANTITY,
+    CartValidationEngine,
+    prices_differ,
+)
+from app.services.loader_profiles import CART_ITEMS
 
 
 class CartResolutionService:
@@ -21,102 +29,39 @@ class CartResolutionService:
     def __init__(self, session: AsyncSession):
         self.session = session
         self.cart_service = CartService(session)
+        self.validator = CartValidationEngine(session)
 
-    async def resolve_and_validate_cart(self, cart_id: UUID) -> CartValidationResult:
+    async def resolve_and_validate_cart(self, cart: Cart) -> CartValidationResult:
         """
         Comprehensive cart resolution with validation, price checks,
         and conflict resolution.
-        """
-        cart = await self.cart_service.get_cart_by_id(cart_id)
-        if not cart:
-            return CartValidationResult(
-                is_valid=False,
-                errors=["Cart not found"],
-                warnings=[],
-                updated_items=[],
-            )
-
-        errors = []
-        warnings = []
-        updated_items = []
-
-        # 1. Validate cart items exist and are available
-        for item in cart.items:
-            # Check if product still exists
-            product_query = select(Product).where(Product.id == item.product_id)
-            product_result = await self.session.execute(product_query)
-            product = product_result.scalar_one_or_none()
-
-            if not product:
-                errors.append(f"Product {item.product_id} is no longer available")
-                continue
-
-            # 2. Check price changes
-            if abs(item.unit_price - product.price) > 0.01:  # Price changed
-                warnings.append(
-                    f"Price for '{product.name}' has changed from "
-                    f"${item.unit_price:.2f} to ${product.price:.2f}"
-                )
-                # Update item with new price
-                item.unit_price = product.price
-                item.updated_at = datetime.utcnow()
-                updated_items.append(item)
-
-            # 3. Validate quantity constraints
-            if item.quantity < 1:
-                errors.append(
-                    f"Invalid quantity {item.quantity} for product {product.name}"
-                )
-            elif item.quantity > 99:
-                warnings.append(
-                    f"Quantity {item.quantity} for '{product.name}' exceeds maximum (99)"
-                )
-                item.quantity = 99
-                item.updated_at = datetime.utcnow()
-                updated_items.append(item)
-
-        # 4. Check cart-level constraints
-        total_items = len(cart.items)
-        if total_items > 100:
-            errors.append(f"Cart has {total_items} items, maximum allowed is 100")
 
-        total_quantity = sum(item.quantity for item in cart.items)
-        if total_quantity > 500:
-            warnings.append(f"Total quantity {total_quantity} is very high")
-
-        # 5. Check cart expiration for guest carts
-        if cart.expires_at and cart.expires_at < datetime.utcnow():
-            errors.append("Cart has expired")
+        Takes the loaded cart, which may be a virtual guest cart with no row.
+        """
+        validation = await self.validator.validate(cart)
+        updated_items = self.validator.apply_fixes(validation)
 
-        # 6. Save any updates
         if updated_items:
-            await self.session.commit()
-            # Refresh cart to get updated items
-            await self.session.refresh(cart)
+            await self.cart_service.recount_totals(cart.id)
 
-        # Convert updated items to read models
-        updated_items_read = []
-        for item in updated_items:
-            await self.session.refresh(item, ["product"])
-            from app.models.cart import CartItemRead
-
-            item_read = CartItemRead(
+        updated_items_read = [
+            CartItemRead(
                 id=item.id,
                 product_id=item.product_id,
-                product_name=item.product.name,
+                product_name=validation.products[item.product_id].name,
                 quantity=item.quantity,
                 unit_price=item.unit_price,
                 total_price=round(item.quantity * item.unit_price, 2),
                 created_at=item.created_at,
                 updated_at=item.updated_at,
             )
-            updated_items_read.append(item_read)
+            for item in updated_items
+        ]
 
-        is_valid = len(errors) == 0
         return CartValidationResult(
-            is_valid=is_valid,
-            errors=errors,
-            warnings=warnings,
+            is_valid=validation.is_valid,
+            errors=validation.errors,
+            warnings=validation.warnings,
             updated_items=updated_items_read,
         )
 
@@ -126,6 +71,14 @@ class CartResolutionService:
         """
         Resolve conflicts when merging user and session carts.
         Returns the resolved cart and list of resolution messages.
+
+        Every session item is moved or combined into the user cart by a
+        single INSERT ... SELECT ... ON CONFLICT (cart_id, product_id) DO
+        UPDATE: quantities of the same product are summed and capped at
+        MAX_ITEM_QUANTITY, and the more recently updated price wins. Dialects
+        without ON CONFLICT merge the loaded items in Python instead. The
+        messages are worked out from both carts' items, matched by
+        product_id.
         """
         resolution_messages = []
 
@@ -133,140 +86,192 @@ class CartResolutionService:
             resolution_messages.append("Session cart is empty, no conflicts to resolve")
             return user_cart, resolution_messages
 
-        if not user_cart.items:
+        user_items = {item.product_id: item for item in user_cart.items}
+        if not user_items:
             resolution_messages.append(
                 "User cart is empty, adopting all session cart items"
             )
-            # Transfer all session items to user cart
-            for item in session_cart.items:
-                item.cart_id = user_cart.id
-                item.updated_at = datetime.utcnow()
-            await self.session.commit()
-            await self.session.refresh(user_cart)
-            return user_cart, resolution_messages
 
-        # Handle conflicts for items that exist in both carts
         for session_item in session_cart.items:
-            # Find matching item in user cart
-            user_item = None
-            for user_cart_item in user_cart.items:
-                if user_cart_item.product_id == session_item.product_id:
-                    user_item = user_cart_item
-                    break
-
-            if user_item:
-                # Conflict: same product in both carts
-                old_quantity = user_item.quantity
-                new_quantity = user_item.quantity + session_item.quantity
-
-                # Respect quantity limits
-                if new_quantity > 99:
-                    new_quantity = 99
+            user_item = user_items.get(session_item.product_id)
+            if user_item is None:
+                if user_items:
                     resolution_messages.append(
-                        f"Product {session_item.product_id}: Combined quantity "
-                        f"({user_item.quantity} + {session_item.quantity}) exceeds maximum, "
-                        f"capped at 99"
-                    )
-                else:
-                    resolution_messages.append(
-                        f"Product {session_item.product_id}: Merged quantities "
-                        f"({old_quantity} + {session_item.quantity} = {new_quantity})"
+                        f"Added product {session_item.product_id} from session cart"
                     )
+                continue
 
-                user_item.quantity = new_quantity
-                user_item.updated_at = datetime.utcnow()
-
-                # Use the most recent price
-                if session_item.updated_at > user_item.updated_at:
-                    if abs(user_item.unit_price - session_item.unit_price) > 0.01:
-                        resolution_messages.append(
-                            f"Product {session_item.product_id}: Using newer price "
-                            f"${session_item.unit_price:.2f} from session cart"
-                        )
-                        user_item.unit_price = session_item.unit_price
+            # Conflict: same product in both carts
+            combined = user_item.quantity + session_item.quantity
+            if combined > MAX_ITEM_QUANTITY:
+                resolution_messages.append(
+                    f"Product {session_item.product_id}: Combined quantity "
+                    f"({user_item.quantity} + {session_item.quantity}) exceeds maximum, "
+                    f"capped at {MAX_ITEM_QUANTITY}"
+                )
             else:
-                # No conflict: add session item to user cart
-                session_item.cart_id = user_cart.id
-                session_item.updated_at = datetime.utcnow()
                 resolution_messages.append(
-                    f"Added product {session_item.product_id} from session cart"
+                    f"Product {session_item.product_id}: Merged quantities "
+                    f"({user_item.quantity} + {session_item.quantity} = {combined})"
+                )
+            if session_item.updated_at > user_item.updated_at and prices_differ(
+                user_item.unit_price, session_item.unit_price
+            ):
+                resolution_messages.append(
+                    f"Product {session_item.product_id}: Using newer price "
+                    f"${session_item.unit_price:.2f} from session cart"
                 )
 
+        now = datetime.utcnow()
+        if dialect_name(self.session) in ("postgresql", "sqlite"):
+            await self._merge_items_in_sql(user_cart.id, session_cart.id, now)
+        else:
+            await self._merge_items_in_python(user_cart, user_items, session_cart, now)
+
         # Mark session cart as abandoned
         session_cart.status = CartStatus.ABANDONED
-        session_cart.updated_at = datetime.utcnow()
+        session_cart.updated_at = now
 
         # Update user cart timestamp
-        user_cart.updated_at = datetime.utcnow()
+        user_cart.updated_at = now
 
-        await self.session.commit()
-        await self.session.refresh(user_cart)
+        await self.cart_service.recount_totals(user_cart.id)
+        await self.cart_service.recount_totals(session_cart.id)
+        user_cart = await self.cart_service.reload_cart(user_cart.id)
 
         return user_cart, resolution_messages
 
-    async def optimize_cart(self, cart_id: UUID) -> Tuple[bool, List[str]]:
+    async def _merge_items_in_sql(
+        self, user_cart_id: UUID, session_cart_id: UUID, now: datetime
+    ) -> None:
+        """Upsert the session cart's items into the user cart, then drop them."""
+        cart_items = CartItem.__table__
+        if dialect_name(self.session) == "postgresql":
+            new_id = func.gen_random_uuid()
+            least = func.least
+        else:
+            # SQLite stores UUIDs as 32 hex digits; its min() is scalar with
+            # several arguments
+            new_id = func.lower(func.hex(func.randomblob(16)))
+            least = func.min
+
+        insert = dialect_insert(self.session)
+        merge = insert(cart_items).from_select(
+            [
+                "id",
+                "cart_id",
+                "product_id",
+                "quantity",
+                "unit_price",
+                "created_at",
+                "updated_at",
+            ],
+            select(
+                new_id,
+                literal(user_cart_id, cart_items.c.cart_id.type),
+                cart_items.c.product_id,
+                least(cart_items.c.quantity, MAX_ITEM_QUANTITY),
+                cart_items.c.unit_price,
+                cart_items.c.created_at,
+                cart_items.c.updated_at,
+            ).where(cart_items.c.cart_id == session_cart_id),
+        )
+        merge = merge.on_conflict_do_update(
+            index_elements=[cart_items.c.cart_id, cart_items.c.product_id],
+            set_={
+                "quantity": least(
+                    cart_items.c.quantity + merge.excluded.quantity,
+                    MAX_ITEM_QUANTITY,
+                ),
+                "unit_price": case(
+                    (
+                        merge.excluded.updated_at > cart_items.c.updated_at,
+                        merge.excluded.unit_price,
+                    ),
+                    else_=cart_items.c.unit_price,
+                ),
+                "updated_at": literal(now, DateTime),
+            },
+        )
+        await self.session.execute(merge)
+        await self.session.execute(
+            delete(cart_items).where(cart_items.c.cart_id == session_cart_id)
+        )
+
+    async def _merge_items_in_python(
+        self,
+        user_cart: Cart,
+        user_items: Dict[int, CartItem],
+        session_cart: Cart,
+        now: datetime,
+    ) -> None:
+        """Apply the same merge to the loaded items, one dict lookup per item."""
+        for session_item in session_cart.items:
+            user_item = user_items.get(session_item.product_id)
+            if user_item is None:
+                # No conflict: move the session item to the user cart
+                session_item.cart_id = user_cart.id
+                session_item.quantity = min(session_item.quantity, MAX_ITEM_QUANTITY)
+                continue
+
+            if session_item.updated_at > user_item.updated_at:
+                user_item.unit_price = session_item.unit_price
+            user_item.quantity = min(
+                user_item.quantity + session_item.quantity, MAX_ITEM_QUANTITY
+            )
+            user_item.updated_at = now
+            await self.session.delete(session_item)
+
+    async def optimize_cart(self, cart: Cart) -> Tuple[bool, List[str]]:
         """
         Optimize cart by removing invalid items, consolidating duplicates,
         and applying business rules.
         """
-        cart = await self.cart_service.get_cart_by_id(cart_id)
-        if not cart:
-            return False, ["Cart not found"]
-
         optimization_messages = []
         changes_made = False
 
-        # Remove items with invalid products
-        items_to_remove = []
-        for item in cart.items:
-            product_query = select(Product).where(Product.id == item.product_id)
-            product_result = await self.session.execute(product_query)
-            product = product_result.scalar_one_or_none()
-
-            if not product:
-                items_to_remove.append(item)
-                optimization_messages.append(
-                    f"Removed unavailable product {item.product_id}"
-                )
-                changes_made = True
+        validation = await self.validator.validate(cart)
 
-        # Remove invalid items
-        for item in items_to_remove:
+        # Remove items with invalid products
+        for item in validation.unavailable:
             await self.session.delete(item)
+            optimization_messages.append(
+                f"Removed unavailable product {item.product_id}"
+            )
+            changes_made = True
 
         # Fix quantity constraints
-        for item in cart.items:
-            if item not in items_to_remove:
-                if item.quantity < 1:
-                    await self.session.delete(item)
-                    optimization_messages.append(
-                        f"Removed item with invalid quantity: {item.quantity}"
-                    )
-                    changes_made = True
-                elif item.quantity > 99:
-                    item.quantity = 99
-                    item.updated_at = datetime.utcnow()
-                    optimization_messages.append(
-                        f"Reduced quantity for product {item.product_id} to maximum (99)"
-                    )
-                    changes_made = True
+        for item in validation.invalid_quantity:
+            await self.session.delete(item)
+            optimization_messages.append(
+                f"Removed item with invalid quantity: {item.quantity}"
+            )
+            changes_made = True
+        for item in validation.over_limit:
+            item.quantity = MAX_ITEM_QUANTITY
+            item.updated_at = datetime.utcnow()
+            optimization_messages.append(
+                f"Reduced quantity for product {item.product_id} to maximum "
+                f"({MAX_ITEM_QUANTITY})"
+            )
+            changes_made = True
 
         # Update cart if changes were made
         if changes_made:
             cart.updated_at = datetime.utcnow()
-            await self.session.commit()
+            await self.cart_service.recount_totals(cart.id)
 
         if not optimization_messages:
             optimization_messages.append("Cart is already optimized")
 
         return changes_made, optimization_messages
 
-    async def check_cart_availability(self, cart_id: UUID) -> CartValidationResult:
+    async def check_cart_availability(self, cart: Cart) -> CartValidationResult:
         """
         Check if all items in cart are available and have current pricing.
         This is typically called before checkout.
         """
-        validation_result = await self.resolve_and_validate_cart(cart_id)
+        validation_result = await self.resolve_and_validate_cart(cart)
 
         # Additional availability checks can be added here
         # For example, integration with inventory management system
@@ -280,9 +285,14 @@ class CartResolutionService:
         cutoff_date = datetime.utcnow().timestamp() - (days_old * 24 * 60 * 60)
         cutoff_datetime = datetime.fromtimestamp(cutoff_date)
 
-        # Find abandoned carts older than cutoff
-        query = select(Cart).where(
-            Cart.status == CartStatus.ABANDONED, Cart.updated_at < cutoff_datetime
+        # Find abandoned carts older than cutoff; the items are loaded so the
+        # delete cascade can remove them, their products are not
+        query = (
+            select(Cart)
+            .where(
+                Cart.status == CartStatus.ABANDONED, Cart.updated_at < cutoff_datetime
+            )
+            .options(*CART_ITEMS)
         )
         result = await self.session.execute(query)
         abandoned_carts = result.scalars().all()
@@ -293,18 +303,14 @@ class CartResolutionService:
             await self.session.delete(cart)
             count += 1
 
-        await self.session.commit()
+        await self.session.flush()
         return count
 
-    async def get_cart_health_report(self, cart_id: UUID) -> dict:
+    async def get_cart_health_report(self, cart: Cart) -> dict:
         """
         Generate a comprehensive health report for a cart.
         """
-        cart = await self.cart_service.get_cart_by_id(cart_id)
-        if not cart:
-            return {"error": "Cart not found"}
-
-        validation_result = await self.resolve_and_validate_cart(cart_id)
+        validation_result = await self.resolve_and_validate_cart(cart)
 
         # Calculate cart metrics
         total_items = len(cart.items)
@@ -315,8 +321,8 @@ class CartResolutionService:
         cart_age_hours = (datetime.utcnow() - cart.created_at).total_seconds() / 3600
 
         return {
-            "cart_id": str(cart_id),
-            "status": cart.status.value,
+            "cart_id": str(cart.id),
+            "status": CartStatus(cart.status).value,
             "is_valid": validation_result.is_valid,
             "error_count": len(validation_result.errors),
             "warning_count": len(validation_result.warnings),
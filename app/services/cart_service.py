@@ -1,32 +1,86 @@
 from datetime import datetime, timedelta
-from typing import Optional
-from uuid import UUID, uuid4
+from typing import Any, Dict, Optional, Sequence, Tuple
+from uuid import NAMESPACE_URL, UUID, uuid4, uuid5
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
-from sqlalchemy import select, delete, and_, or_
+from sqlalchemy.orm.interfaces import ORMOption
+from sqlalchemy import (
+    DateTime,
+    Integer,
+    bindparam,
+    case,
+    column,
+    func,
+    inspect,
+    literal,
+    select,
+    delete,
+    update,
+    values,
+    and_,
+    or_,
+)
+from app.core.config import CART_ACTIVITY_TOUCH_SECONDS
+from app.database import dialect_insert, dialect_name
 from app.models.cart import (
     Cart,
     CartItem,
+    CartItemRead,
     CartStatus,
     CartRead,
-    CartItemRead,
     CartSummary,
 )
 from app.models.product import Product
+from app.services.loader_profiles import (
+    CART_ITEM_VIEW,
+    CART_ITEMS,
+    CART_TOTALS_ONLY,
+    CART_VIEW,
+)
+from app.utils.etags import weak_etag
+
+CART_ACTIVITY_TOUCH_INTERVAL = timedelta(seconds=CART_ACTIVITY_TOUCH_SECONDS)
+
+
+def _adjusted_totals(items: Any, quantity: Any, subtotal: Any) -> Dict[str, Any]:
+    """SET clause adding deltas to a cart's stored totals, atomically in SQL."""
+    carts = Cart.__table__
+    return {
+        "total_items": carts.c.total_items + items,
+        "total_quantity": carts.c.total_quantity + quantity,
+        "subtotal": carts.c.subtotal + subtotal,
+    }
+
+
+def _recounted_totals(cart_id: Any) -> Dict[str, Any]:
+    """
+    SET clause recomputing a cart's stored totals from its item rows.
+
+    Pass the cart table's id column instead of a value to recount every
+    cart an UPDATE matches, through correlated subqueries.
+    """
+    items = CartItem.__table__
+    in_cart = items.c.cart_id == cart_id
+    return {
+        "total_items": select(func.count()).where(in_cart).scalar_subquery(),
+        "total_quantity": select(func.coalesce(func.sum(items.c.quantity), 0))
+        .where(in_cart)
+        .scalar_subquery(),
+        "subtotal": select(
+            func.coalesce(func.sum(items.c.quantity * items.c.unit_price), 0.0)
+        )
+        .where(in_cart)
+        .scalar_subquery(),
+    }
 
 
 class CartService:
     def __init__(self, session: AsyncSession):
         self.session = session
 
-    async def get_or_create_cart(
+    async def get_active_cart(
         self, user_id: Optional[UUID] = None, session_id: Optional[str] = None
-    ) -> Cart:
-        """Get existing cart or create new one based on user/session identity."""
-        if not user_id and not session_id:
-            raise ValueError("Either user_id or session_id must be provided")
-
-        # Try to find existing active cart
+    ) -> Optional[Cart]:
+        """Get the active cart of a user or session, or None; never creates one."""
         conditions = [Cart.status == CartStatus.ACTIVE]
 
         or_conditions = []
@@ -38,19 +92,29 @@ class CartService:
         if or_conditions:
             conditions.append(or_(*or_conditions))
 
-        query = (
-            select(Cart)
-            .where(and_(*conditions))
-            .options(selectinload(Cart.items).selectinload(CartItem.product))
-        )
+        query = select(Cart).where(and_(*conditions)).options(*CART_VIEW)
 
         result = await self.session.execute(query)
         cart = result.scalar_one_or_none()
 
         if cart:
-            # Update cart activity
-            cart.updated_at = datetime.utcnow()
-            await self.session.commit()
+            # Record activity at most once per touch interval, so reading a
+            # cart doesn't turn every request into a write transaction
+            now = datetime.utcnow()
+            if now - cart.updated_at >= CART_ACTIVITY_TOUCH_INTERVAL:
+                cart.updated_at = now
+        return cart
+
+    async def get_or_create_cart(
+        self, user_id: Optional[UUID] = None, session_id: Optional[str] = None
+    ) -> Cart:
+        """Get existing cart or create new one based on user/session identity."""
+        if not user_id and not session_id:
+            raise ValueError("Either user_id or session_id must be provided")
+
+        # Try to find existing active cart
+        cart = await self.get_active_cart(user_id=user_id, session_id=session_id)
+        if cart:
             return cart
 
         # Create new cart
@@ -62,79 +126,184 @@ class CartService:
             created_at=datetime.utcnow(),
             updated_at=datetime.utcnow(),
             expires_at=datetime.utcnow() + timedelta(days=7) if session_id else None,
+            items=[],
         )
 
         self.session.add(cart)
-        await self.session.commit()
-        await self.session.refresh(cart)
+        await self.session.flush()
 
         return cart
 
-    async def get_cart_by_id(self, cart_id: UUID) -> Optional[Cart]:
-        """Get cart by ID with items and products loaded."""
-        query = (
+    def virtual_cart(self, session_id: str) -> Cart:
+        """
+        Unsaved empty cart for a guest session that has no cart yet.
+
+        Reads render it like any empty cart; it is never added to the session,
+        so the row is only inserted by the first item add. Its ID is derived
+        from the session ID, which keeps its ETag stable between reads.
+        """
+        now = datetime.utcnow()
+        return Cart(
+            id=uuid5(NAMESPACE_URL, f"cart:{session_id}"),
+            user_id=None,
+            session_id=session_id,
+            status=CartStatus.ACTIVE,
+            created_at=now,
+            updated_at=now,
+            expires_at=None,
+            total_items=0,
+            total_quantity=0,
+            subtotal=0.0,
+            items=[],
+        )
+
+    @staticmethod
+    def is_virtual(cart: Cart) -> bool:
+        """Whether a cart is a virtual_cart() with no row behind it."""
+        return inspect(cart).transient
+
+    async def get_cart_by_id(
+        self, cart_id: UUID, profile: Sequence[ORMOption] = CART_VIEW
+    ) -> Optional[Cart]:
+        """
+        Get cart by ID, loading what the given profile names.
+
+        Served from the session's identity map when the cart was already
+        loaded in this request (e.g. by get_current_cart).
+        """
+        return await self.session.get(Cart, cart_id, options=list(profile))
+
+    async def reload_cart(
+        self, cart_id: UUID, profile: Sequence[ORMOption] = CART_VIEW
+    ) -> Optional[Cart]:
+        """
+        Re-read a cart and its relationships, overwriting the session's copy.
+
+        For callers that moved items between carts, whose loaded item
+        collections no longer match the rows.
+        """
+        result = await self.session.execute(
             select(Cart)
             .where(Cart.id == cart_id)
-            .options(selectinload(Cart.items).selectinload(CartItem.product))
+            .options(*profile)
+            .execution_options(populate_existing=True)
         )
-        result = await self.session.execute(query)
         return result.scalar_one_or_none()
 
     async def add_item(
         self, cart_id: UUID, product_id: int, quantity: int = 1
-    ) -> CartItem:
-        """Add item to cart or update quantity if exists."""
-        # Validate product exists
-        product_query = select(Product).where(Product.id == product_id)
-        product_result = await self.session.execute(product_query)
-        product = product_result.scalar_one_or_none()
-
-        if not product:
-            raise ValueError(f"Product with id {product_id} not found")
-
-        # Check if item already exists in cart
-        existing_item_query = select(CartItem).where(
-            and_(CartItem.cart_id == cart_id, CartItem.product_id == product_id)
+    ) -> CartItemRead:
+        """
+        Add item to cart or update quantity if exists.
+
+        One INSERT ... SELECT ... ON CONFLICT (cart_id, product_id) DO UPDATE:
+        the unit price is read from the product row by the same statement and
+        concurrent adds of the same product sum their quantities instead of
+        failing on uq_cart_product. The cart's updated_at and stored totals
+        are adjusted by the returned row: a returned quantity equal to the
+        added one means the item is new. On Postgres the upsert, the cart
+        update and the product name lookup are CTEs of a single statement.
+        SQLite has no DML in CTEs, so it runs them one after the other in the
+        same transaction.
+        """
+        now = datetime.utcnow()
+        cart_items = CartItem.__table__
+        insert = dialect_insert(self.session)
+
+        upsert = insert(cart_items).from_select(
+            [
+                "id",
+                "cart_id",
+                "product_id",
+                "quantity",
+                "unit_price",
+                "created_at",
+                "updated_at",
+            ],
+            select(
+                literal(uuid4(), cart_items.c.id.type),
+                literal(cart_id, cart_items.c.cart_id.type),
+                Product.id,
+                literal(quantity, Integer),
+                Product.price,
+                literal(now, DateTime),
+                literal(now, DateTime),
+            ).where(Product.id == product_id),
         )
-        existing_result = await self.session.execute(existing_item_query)
-        existing_item = existing_result.scalar_one_or_none()
-
-        if existing_item:
-            # Update existing item quantity
-            existing_item.quantity += quantity
-            existing_item.updated_at = datetime.utcnow()
-            cart_item = existing_item
-        else:
-            # Create new cart item
-            cart_item = CartItem(
-                id=uuid4(),
-                cart_id=cart_id,
-                product_id=product_id,
-                quantity=quantity,
-                unit_price=product.price,
-                created_at=datetime.utcnow(),
-                updated_at=datetime.utcnow(),
+        upsert = upsert.on_conflict_do_update(
+            index_elements=[cart_items.c.cart_id, cart_items.c.product_id],
+            set_={
+                "quantity": cart_items.c.quantity + upsert.excluded.quantity,
+                "updated_at": upsert.excluded.updated_at,
+            },
+        ).returning(
+            cart_items.c.id,
+            cart_items.c.product_id,
+            cart_items.c.quantity,
+            cart_items.c.unit_price,
+            cart_items.c.created_at,
+            cart_items.c.updated_at,
+        )
+        touch_cart = update(Cart.__table__).where(Cart.__table__.c.id == cart_id)
+
+        if dialect_name(self.session) == "postgresql":
+            upserted = upsert.cte("upserted")
+            touch_cart = touch_cart.where(upserted.c.product_id == product_id).values(
+                updated_at=now,
+                **_adjusted_totals(
+                    case((upserted.c.quantity == quantity, 1), else_=0),
+                    quantity,
+                    upserted.c.unit_price * quantity,
+                ),
             )
-            self.session.add(cart_item)
-
-        # Update cart timestamp
-        cart_query = select(Cart).where(Cart.id == cart_id)
-        cart_result = await self.session.execute(cart_query)
-        cart = cart_result.scalar_one_or_none()
-        if cart:
-            cart.updated_at = datetime.utcnow()
-
-        await self.session.commit()
-        await self.session.refresh(cart_item, ["product"])
+            query = (
+                select(upserted, Product.name.label("product_name"))
+                .join(Product, Product.id == upserted.c.product_id)
+                .add_cte(touch_cart.cte("touched_cart"))
+            )
+            row = (await self.session.execute(query)).mappings().one_or_none()
+        else:
+            row = (await self.session.execute(upsert)).mappings().one_or_none()
+            if row:
+                await self.session.execute(
+                    touch_cart.values(
+                        updated_at=now,
+                        **_adjusted_totals(
+                            int(row["quantity"] == quantity),
+                            quantity,
+                            row["unit_price"] * quantity,
+                        ),
+                    )
+                )
+                product_name = await self.session.scalar(
+                    select(Product.name).where(Product.id == product_id)
+                )
+                row = {**row, "product_name": product_name}
+
+        if not row:
+            raise ValueError(f"Product with id {product_id} not found")
 
-        return cart_item
+        return CartItemRead(
+            **row, total_price=round(row["quantity"] * row["unit_price"], 2)
+        )
 
     async def update_item_quantity(
         self, cart_id: UUID, item_id: UUID, quantity: int
     ) -> Optional[CartItem]:
-        """Update cart item quantity."""
-        query = select(CartItem).where(
-            and_(CartItem.id == item_id, CartItem.cart_id == cart_id)
+        """
+        Update cart item quantity.
+
+        The item row is locked (SELECT ... FOR UPDATE) and re-read before the
+        delta to the stored totals is worked out, so concurrent updates of the
+        same item apply one after the other instead of from the same old
+        quantity.
+        """
+        query = (
+            select(CartItem)
+            .where(and_(CartItem.id == item_id, CartItem.cart_id == cart_id))
+            .options(*CART_ITEM_VIEW)
+            .with_for_update(of=CartItem)
+            .execution_options(populate_existing=True)
         )
         result = await self.session.execute(query)
         cart_item = result.scalar_one_or_none()
@@ -144,30 +313,78 @@ class CartService:
 
         if quantity <= 0:
             # Remove item if quantity is 0 or negative
+            totals = _adjusted_totals(
+                -1, -cart_item.quantity, -cart_item.quantity * cart_item.unit_price
+            )
             await self.session.delete(cart_item)
             cart_item = None
         else:
+            delta = quantity - cart_item.quantity
+            totals = _adjusted_totals(0, delta, delta * cart_item.unit_price)
             cart_item.quantity = quantity
             cart_item.updated_at = datetime.utcnow()
 
-        # Update cart timestamp
-        cart_query = select(Cart).where(Cart.id == cart_id)
-        cart_result = await self.session.execute(cart_query)
-        cart = cart_result.scalar_one_or_none()
-        if cart:
-            cart.updated_at = datetime.utcnow()
+        await self.session.execute(
+            update(Cart.__table__)
+            .where(Cart.__table__.c.id == cart_id)
+            .values(updated_at=datetime.utcnow(), **totals)
+        )
+        return cart_item
 
-        await self.session.commit()
+    async def bulk_update_quantities(
+        self, cart_id: UUID, quantities: Dict[UUID, int]
+    ) -> Optional[Cart]:
+        """
+        Set the quantity of many cart items at once and return the reloaded cart.
 
-        if cart_item:
-            await self.session.refresh(cart_item, ["product"])
+        Postgres applies every quantity with one UPDATE ... FROM (VALUES ...);
+        SQLite sends the same UPDATE as a single executemany. Ids that are not
+        items of this cart are ignored. The cart's stored totals are then
+        recounted by one UPDATE and the cart reloaded in the same transaction.
+        """
+        now = datetime.utcnow()
+        cart_items = CartItem.__table__
+
+        if dialect_name(self.session) == "postgresql":
+            updates = values(
+                column("id", cart_items.c.id.type),
+                column("quantity", Integer),
+                name="updates",
+            ).data(list(quantities.items()))
+            await self.session.execute(
+                update(cart_items)
+                .where(cart_items.c.id == updates.c.id)
+                .where(cart_items.c.cart_id == cart_id)
+                .values(quantity=updates.c.quantity, updated_at=now)
+            )
+        else:
+            await self.session.execute(
+                update(cart_items)
+                .where(cart_items.c.id == bindparam("item_id"))
+                .where(cart_items.c.cart_id == cart_id)
+                .values(quantity=bindparam("item_quantity"), updated_at=now),
+                [
+                    {"item_id": item_id, "item_quantity": quantity}
+                    for item_id, quantity in quantities.items()
+                ],
+            )
 
-        return cart_item
+        await self.session.execute(
+            update(Cart.__table__)
+            .where(Cart.__table__.c.id == cart_id)
+            .values(updated_at=now, **_recounted_totals(cart_id))
+        )
+        # The cart and its items may already be in the session from
+        # get_current_cart; overwrite them with the updated rows
+        return await self.reload_cart(cart_id)
 
     async def remove_item(self, cart_id: UUID, item_id: UUID) -> bool:
-        """Remove item from cart."""
-        query = select(CartItem).where(
-            and_(CartItem.id == item_id, CartItem.cart_id == cart_id)
+        """Remove item from cart; the row is locked like in update_item_quantity."""
+        query = (
+            select(CartItem)
+            .where(and_(CartItem.id == item_id, CartItem.cart_id == cart_id))
+            .with_for_update()
+            .execution_options(populate_existing=True)
         )
         result = await self.session.execute(query)
         cart_item = result.scalar_one_or_none()
@@ -176,15 +393,16 @@ class CartService:
             return False
 
         await self.session.delete(cart_item)
-
-        # Update cart timestamp
-        cart_query = select(Cart).where(Cart.id == cart_id)
-        cart_result = await self.session.execute(cart_query)
-        cart = cart_result.scalar_one_or_none()
-        if cart:
-            cart.updated_at = datetime.utcnow()
-
-        await self.session.commit()
+        await self.session.execute(
+            update(Cart.__table__)
+            .where(Cart.__table__.c.id == cart_id)
+            .values(
+                updated_at=datetime.utcnow(),
+                **_adjusted_totals(
+                    -1, -cart_item.quantity, -cart_item.quantity * cart_item.unit_price
+                ),
+            )
+        )
         return True
 
     async def clear_cart(self, cart_id: UUID) -> bool:
@@ -193,68 +411,178 @@ class CartService:
         delete_query = delete(CartItem).where(CartItem.cart_id == cart_id)
         await self.session.execute(delete_query)
 
-        # Update cart timestamp
-        cart_query = select(Cart).where(Cart.id == cart_id)
-        cart_result = await self.session.execute(cart_query)
-        cart = cart_result.scalar_one_or_none()
+        # Update cart timestamp and reset its totals
+        result = await self.session.execute(
+            update(Cart.__table__)
+            .where(Cart.__table__.c.id == cart_id)
+            .values(
+                updated_at=datetime.utcnow(),
+                total_items=0,
+                total_quantity=0,
+                subtotal=0.0,
+            )
+        )
 
-        if not cart:
-            return False
+        return bool(result.rowcount)
 
-        cart.updated_at = datetime.utcnow()
-        await self.session.commit()
-        return True
+    async def recount_totals(self, cart_id: UUID) -> Optional[Cart]:
+        """
+        Recompute a cart's stored totals from its item rows.
+
+        For mutations that move or rewrite several items at once; the
+        single-item paths adjust the totals incrementally instead. Pending
+        item changes are flushed first, and a cart already in the session is
+        updated in place.
+        """
+        result = await self.session.execute(
+            update(Cart)
+            .where(Cart.id == cart_id)
+            .values(**_recounted_totals(cart_id))
+            .returning(Cart)
+            .execution_options(synchronize_session=False, populate_existing=True)
+        )
+        return result.scalar_one_or_none()
+
+    async def remove_product_from_carts(self, product_id: int) -> int:
+        """
+        Delete every cart item of a product and recount the carts that held it.
+
+        For product deletion: the foreign key would cascade to the items, but
+        the stored totals must follow. Returns the number of carts changed.
+        """
+        cart_items = CartItem.__table__
+        carts = Cart.__table__
+        result = await self.session.execute(
+            delete(cart_items)
+            .where(cart_items.c.product_id == product_id)
+            .returning(cart_items.c.cart_id)
+        )
+        cart_ids = set(result.scalars())
+        if cart_ids:
+            await self.session.execute(
+                update(carts)
+                .where(carts.c.id.in_(cart_ids))
+                .values(**_recounted_totals(carts.c.id))
+            )
+        return len(cart_ids)
 
     async def calculate_cart_summary(self, cart: Cart) -> CartSummary:
-        """Calculate cart totals and summary."""
-        total_items = len(cart.items)
-        total_quantity = sum(item.quantity for item in cart.items)
-        subtotal = sum(item.quantity * item.unit_price for item in cart.items)
+        """Cart totals and summary, from the totals stored on the cart row."""
+        if cart.subtotal is None:
+            # Never flushed, so no totals are stored yet: add up the items
+            return CartSummary(
+                total_items=len(cart.items),
+                total_quantity=sum(item.quantity for item in cart.items),
+                subtotal=round(
+                    sum(item.quantity * item.unit_price for item in cart.items), 2
+                ),
+            )
+        return CartSummary(
+            total_items=cart.total_items,
+            total_quantity=cart.total_quantity,
+            subtotal=round(cart.subtotal, 2),
+        )
 
+    async def get_summary(
+        self, user_id: Optional[UUID] = None, session_id: Optional[str] = None
+    ) -> CartSummary:
+        """
+        Summary of the active cart of a user or guest session.
+
+        Reads the stored totals of a single cart row without loading items or
+        creating a cart; no cart means an empty summary. A user's own cart
+        takes precedence over the guest session's.
+        """
+        if user_id:
+            identity = Cart.user_id == user_id
+        elif session_id:
+            identity = Cart.session_id == session_id
+        else:
+            raise ValueError("Either user_id or session_id must be provided")
+
+        result = await self.session.execute(
+            select(Cart.total_items, Cart.total_quantity, Cart.subtotal)
+            .where(identity, Cart.status == CartStatus.ACTIVE)
+            .limit(1)
+        )
+        row = result.one_or_none()
+        if not row:
+            return CartSummary(total_items=0, total_quantity=0, subtotal=0.0)
         return CartSummary(
-            total_items=total_items,
-            total_quantity=total_quantity,
-            subtotal=round(subtotal, 2),
+            total_items=row.total_items,
+            total_quantity=row.total_quantity,
+            subtotal=round(row.subtotal, 2),
         )
 
-    async def get_cart_read_model(self, cart: Cart) -> CartRead:
-        """Convert cart to read model with calculated summary."""
-        summary = await self.calculate_cart_summary(cart)
+    def get_cart_etag(self, cart: Cart) -> str:
+        """
+        Weak ETag of the cart read model, from the loaded rows' versions.
 
-        cart_items = []
-        for item in cart.items:
-            cart_item_read = CartItemRead(
-                id=item.id,
-                product_id=item.product_id,
-                product_name=item.product.name,
-                quantity=item.quantity,
-                unit_price=item.unit_price,
-                total_price=round(item.quantity * item.unit_price, 2),
-                created_at=item.created_at,
-                updated_at=item.updated_at,
-            )
-            cart_items.append(cart_item_read)
-
-        return CartRead(
-            id=cart.id,
-            user_id=cart.user_id,
-            session_id=cart.session_id,
-            status=cart.status,
-            items=cart_items,
-            summary=summary,
-            created_at=cart.created_at,
-            updated_at=cart.updated_at,
-            expires_at=cart.expires_at,
+        The cart's own updated_at is left out: it records activity and moves
+        on reads, while the items and their products define the content.
+        """
+        return weak_etag(
+            cart.id,
+            CartStatus(cart.status).value,
+            cart.expires_at,
+            [
+                (
+                    item.id,
+                    item.product_id,
+                    item.product.name,
+                    item.quantity,
+                    item.unit_price,
+                    item.updated_at,
+                )
+                for item in cart.items
+            ],
         )
 
+    async def get_cart_payload(self, cart: Cart) -> Dict[str, Any]:
+        """
+        Cart read model as plain data, in the shape of CartRead.
+
+        Used directly by the fast JSON path, which encodes it without building
+        pydantic objects.
+        """
+        summary = await self.calculate_cart_summary(cart)
+
+        return {
+            "id": cart.id,
+            "user_id": cart.user_id,
+            "session_id": cart.session_id,
+            "status": cart.status,
+            "items": [
+                {
+                    "id": item.id,
+                    "product_id": item.product_id,
+                    "product_name": item.product.name,
+                    "quantity": item.quantity,
+                    "unit_price": item.unit_price,
+                    "total_price": round(item.quantity * item.unit_price, 2),
+                    "created_at": item.created_at,
+                    "updated_at": item.updated_at,
+                }
+                for item in cart.items
+            ],
+            "summary": summary.model_dump(),
+            "created_at": cart.created_at,
+            "updated_at": cart.updated_at,
+            "expires_at": cart.expires_at,
+        }
+
+    async def get_cart_read_model(self, cart: Cart) -> CartRead:
+        """Convert cart to read model with calculated summary."""
+        return CartRead.model_validate(await self.get_cart_payload(cart))
+
     async def merge_carts(self, source_cart_id: UUID, target_cart_id: UUID) -> Cart:
         """
         Merge source cart items into target cart using advanced resolution logic.
         This method now uses CartResolutionService for conflict resolution.
         """
         # Get both carts
-        source_cart = await self.get_cart_by_id(source_cart_id)
-        target_cart = await self.get_cart_by_id(target_cart_id)
+        source_cart = await self.get_cart_by_id(source_cart_id, CART_ITEMS)
+        target_cart = await self.get_cart_by_id(target_cart_id, CART_ITEMS)
 
         if not source_cart or not target_cart:
             raise ValueError("Source or target cart not found")
@@ -272,17 +600,52 @@ class CartService:
 
         return resolved_cart
 
+    async def merge_session_cart(
+        self, user_id: UUID, session_id: str
+    ) -> Tuple[Optional[Cart], int]:
+        """
+        Merge the session's active guest cart into the user's cart.
+
+        Meant to run once per login: the caller records the merge in the
+        session cookie so later requests skip this lookup. Never creates a
+        guest cart. Returns the merged user cart and the number of guest items
+        merged, or (None, 0) when the session has no guest cart with items.
+        """
+        result = await self.session.execute(
+            select(Cart)
+            .where(
+                Cart.session_id == session_id,
+                Cart.user_id.is_(None),
+                Cart.status == CartStatus.ACTIVE,
+            )
+            .options(*CART_ITEMS)
+        )
+        session_cart = result.scalars().first()
+        if not session_cart or not session_cart.items:
+            return None, 0
+
+        items_merged = len(session_cart.items)
+        user_cart = await self.get_or_create_cart(user_id=user_id)
+        merged_cart = await self.merge_carts(
+            source_cart_id=session_cart.id, target_cart_id=user_cart.id
+        )
+        return merged_cart, items_merged
+
     async def cleanup_expired_carts(self) -> int:
         """Clean up expired guest carts. Returns number of carts cleaned up."""
         now = datetime.utcnow()
 
         # Find expired carts
-        query = select(Cart).where(
-            and_(
-                Cart.expires_at.is_not(None),
-                Cart.expires_at < now,
-                Cart.status == CartStatus.ACTIVE,
+        query = (
+            select(Cart)
+            .where(
+                and_(
+                    Cart.expires_at.is_not(None),
+                    Cart.expires_at < now,
+                    Cart.status == CartStatus.ACTIVE,
+                )
             )
+            .options(*CART_TOTALS_ONLY)
         )
         result = await self.session.execute(query)
         expired_carts = result.scalars().all()
@@ -294,5 +657,5 @@ class CartService:
             cart.updated_at = now
             count += 1
 
-        await self.session.commit()
+        await self.session.flush()
         return count
@@ -0,0 +1,130 @@
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.cart import Cart, CartItem
+from app.models.product import Product
+from app.services.product_loader import ProductLoader
+
+MAX_ITEM_QUANTITY = 99
+MAX_CART_ITEMS = 100
+HIGH_TOTAL_QUANTITY = 500
+
+
+def prices_differ(a: float, b: float) -> bool:
+    """
+    Whether two prices differ by at least a cent.
+
+    Compares whole cents, so float noise is ignored while a one-cent change
+    is caught at every price level.
+    """
+    return round(a * 100) != round(b * 100)
+
+
+class CartValidation:
+    """
+    Outcome of validating a cart against the current catalog.
+
+    Holds the messages for the caller to report and the items that need
+    fixing, so each call site decides what to repair and how to word it.
+    """
+
+    def __init__(self) -> None:
+        self.errors: List[str] = []
+        self.warnings: List[str] = []
+        # Current product of every item whose product still exists
+        self.products: Dict[int, Product] = {}
+        self.unavailable: List[CartItem] = []
+        self.invalid_quantity: List[CartItem] = []
+        self.over_limit: List[CartItem] = []
+        self.price_updates: List[Tuple[CartItem, Product]] = []
+
+    @property
+    def is_valid(self) -> bool:
+        return not self.errors
+
+
+class CartValidationEngine:
+    """
+    Validates every item of a cart with at most one product query.
+
+    Products already loaded on the items are reused; the rest are resolved
+    together through a ProductLoader, so a 100-item cart costs one
+    `WHERE id IN (...)` query instead of one query per item.
+    """
+
+    def __init__(self, session: AsyncSession, products: Optional[ProductLoader] = None):
+        self.products = products or ProductLoader(session)
+
+    async def load_products(self, items: List[CartItem]) -> List[Optional[Product]]:
+        """Current product of each item, in item order; None if it is gone."""
+        for item in items:
+            if "product" not in inspect(item).unloaded and item.product is not None:
+                self.products.prime(item.product)
+        return await self.products.load_many(item.product_id for item in items)
+
+    async def validate(self, cart: Cart) -> CartValidation:
+        result = CartValidation()
+        products = await self.load_products(cart.items)
+
+        for item, product in zip(cart.items, products):
+            if product is None:
+                result.unavailable.append(item)
+                result.errors.append(
+                    f"Product {item.product_id} is no longer available"
+                )
+                continue
+            result.products[product.id] = product
+
+            if prices_differ(item.unit_price, product.price):
+                result.price_updates.append((item, product))
+                result.warnings.append(
+                    f"Price for '{product.name}' has changed from "
+                    f"${item.unit_price:.2f} to ${product.price:.2f}"
+                )
+
+            if item.quantity < 1:
+                result.invalid_quantity.append(item)
+                result.errors.append(
+                    f"Invalid quantity {item.quantity} for product {product.name}"
+                )
+            elif item.quantity > MAX_ITEM_QUANTITY:
+                result.over_limit.append(item)
+                result.warnings.append(
+                    f"Quantity {item.quantity} for '{product.name}' exceeds "
+                    f"maximum ({MAX_ITEM_QUANTITY})"
+                )
+
+        total_items = len(cart.items)
+        if total_items > MAX_CART_ITEMS:
+            result.errors.append(
+                f"Cart has {total_items} items, maximum allowed is {MAX_CART_ITEMS}"
+            )
+
+        total_quantity = sum(item.quantity for item in cart.items)
+        if total_quantity > HIGH_TOTAL_QUANTITY:
+            result.warnings.append(f"Total quantity {total_quantity} is very high")
+
+        if cart.expires_at and cart.expires_at < datetime.utcnow():
+            result.errors.append("Cart has expired")
+
+        return result
+
+    def apply_fixes(self, validation: CartValidation) -> List[CartItem]:
+        """
+        Apply current prices and quantity caps to the items in memory.
+
+        Returns the changed items; the caller flushes and commits.
+        """
+        now = datetime.utcnow()
+        changed: List[CartItem] = []
+        for item, product in validation.price_updates:
+            item.unit_price = product.price
+            item.updated_at = now
+            changed.append(item)
+        for item in validation.over_limit:
+            item.quantity = MAX_ITEM_QUANTITY
+            item.updated_at = now
+            if item not in changed:
+                changed.append(item)
+        return changed
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional, Tuple
+from typing import Any, Dict, Optional, Tuple
 from uuid import UUID
 import secrets
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -12,14 +12,18 @@ from app.models.order import (
     PaymentStatus,
     CheckoutRequest,
     OrderRead,
-    OrderItemRead,
 )
-from app.models.product import Product
+from app.services.cart_validation import CartValidationEngine
+from app.services.loader_profiles import ORDER_DETAIL, ORDER_LIST
+from app.services.product_loader import ProductLoader
+from app.utils.etags import weak_etag
 
 
 class CheckoutService:
     def __init__(self, session: AsyncSession):
         self.session = session
+        self.products = ProductLoader(session)
+        self.validator = CartValidationEngine(session, products=self.products)
 
     def generate_order_number(self) -> str:
         """Generate unique order number."""
@@ -43,18 +47,14 @@ class CheckoutService:
             errors.append("Cart is empty")
             return False, errors
 
-        # Validate all products still exist and prices are current
-        for item in cart.items:
-            product_query = select(Product).where(Product.id == item.product_id)
-            product_result = await self.session.execute(product_query)
-            product = product_result.scalar_one_or_none()
-
-            if not product:
-                errors.append(f"Product {item.product_id} no longer available")
-            elif product.price != item.unit_price:
-                errors.append(
-                    f"Price changed for {product.name}: was ${item.unit_price}, now ${product.price}"
-                )
+        # Every product is checked with at most one query; at checkout a price
+        # change is an error rather than something to fix silently
+        validation = await self.validator.validate(cart)
+        errors.extend(validation.errors)
+        for item, product in validation.price_updates:
+            errors.append(
+                f"Price changed for {product.name}: was ${item.unit_price}, now ${product.price}"
+            )
 
         return len(errors) == 0, errors
 
@@ -135,7 +135,7 @@ class CheckoutService:
         cart.status = CartStatus.CONVERTED
         cart.updated_at = datetime.utcnow()
 
-        await self.session.commit()
+        await self.session.flush()
         await self.session.refresh(order, ["items"])
 
         return order
@@ -148,7 +148,11 @@ class CheckoutService:
 
     async def get_order_by_id(self, order_id: UUID, user_id: UUID) -> Optional[Order]:
         """Get order by ID for specific user."""
-        query = select(Order).where(Order.id == order_id, Order.user_id == user_id)
+        query = (
+            select(Order)
+            .where(Order.id == order_id, Order.user_id == user_id)
+            .options(*ORDER_DETAIL)
+        )
         result = await self.session.execute(query)
         return result.scalar_one_or_none()
 
@@ -156,8 +160,10 @@ class CheckoutService:
         self, order_number: str, user_id: UUID
     ) -> Optional[Order]:
         """Get order by order number for specific user."""
-        query = select(Order).where(
-            Order.order_number == order_number, Order.user_id == user_id
+        query = (
+            select(Order)
+            .where(Order.order_number == order_number, Order.user_id == user_id)
+            .options(*ORDER_DETAIL)
         )
         result = await self.session.execute(query)
         return result.scalar_one_or_none()
@@ -169,6 +175,7 @@ class CheckoutService:
         query = (
             select(Order)
             .where(Order.user_id == user_id)
+            .options(*ORDER_LIST)
             .order_by(Order.created_at.desc())
             .limit(limit)
             .offset(offset)
@@ -193,8 +200,7 @@ class CheckoutService:
         elif status == OrderStatus.DELIVERED and not order.delivered_at:
             order.delivered_at = datetime.utcnow()
 
-        await self.session.commit()
-        await self.session.refresh(order)
+        await self.session.flush()
         return order
 
     async def update_payment_status(
@@ -214,48 +220,62 @@ class CheckoutService:
             if order.status == OrderStatus.PENDING:
                 order.status = OrderStatus.CONFIRMED
 
-        await self.session.commit()
-        await self.session.refresh(order)
+        await self.session.flush()
         return order
 
+    def get_order_etag(self, order: Order) -> str:
+        """Weak ETag of an order; items never change after checkout."""
+        return weak_etag(order.id, order.updated_at)
+
+    def get_orders_etag(self, orders: list[Order]) -> str:
+        """Weak ETag of a page of orders."""
+        return weak_etag([(order.id, order.updated_at) for order in orders])
+
+    async def get_order_payload(self, order: Order) -> Dict[str, Any]:
+        """
+        Order read model as plain data, in the shape of OrderRead.
+
+        Used directly by the fast JSON path, which encodes it without building
+        pydantic objects.
+        """
+        return {
+            "id": order.id,
+            "user_id": order.user_id,
+            "order_number": order.order_number,
+            "status": order.status,
+            "payment_status": order.payment_status,
+            "subtotal": order.subtotal,
+            "tax": order.tax,
+            "shipping_cost": order.shipping_cost,
+            "total": order.total,
+            "shipping_name": order.shipping_name,
+            "shipping_email": order.shipping_email,
+            "shipping_phone": order.shipping_phone,
+            "shipping_address": order.shipping_address,
+            "shipping_city": order.shipping_city,
+            "shipping_state": order.shipping_state,
+            "shipping_postal_code": order.shipping_postal_code,
+            "shipping_country": order.shipping_country,
+            "notes": order.notes,
+            "items": [
+                {
+                    "id": item.id,
+                    "product_id": item.product_id,
+                    "product_name": item.product_name,
+                    "quantity": item.quantity,
+                    "unit_price": item.unit_price,
+                    "total_price": item.total_price,
+                    "created_at": item.created_at,
+                }
+                for item in order.items
+            ],
+            "created_at": order.created_at,
+            "updated_at": order.updated_at,
+            "paid_at": order.paid_at,
+            "shipped_at": order.shipped_at,
+            "delivered_at": order.delivered_at,
+        }
+
     async def get_order_read_model(self, order: Order) -> OrderRead:
         """Convert order to read model."""
-        order_items = []
-        for item in order.items:
-            order_item_read = OrderItemRead(
-                id=item.id,
-                product_id=item.product_id,
-                product_name=item.product_name,
-                quantity=item.quantity,
-                unit_price=item.unit_price,
-                total_price=item.total_price,
-                created_at=item.created_at,
-            )
-            order_items.append(order_item_read)
-
-        return OrderRead(
-            id=order.id,
-            user_id=order.user_id,
-            order_number=order.order_number,
-            status=order.status,
-            payment_status=order.payment_status,
-            subtotal=order.subtotal,
-            tax=order.tax,
-            shipping_cost=order.shipping_cost,
-            total=order.total,
-            shipping_name=order.shipping_name,
-            shipping_email=order.shipping_email,
-            shipping_phone=order.shipping_phone,
-            shipping_address=order.shipping_address,
-            shipping_city=order.shipping_city,
-            shipping_state=order.shipping_state,
-            shipping_postal_code=order.shipping_postal_code,
-            shipping_country=order.shipping_country,
-            notes=order.notes,
-            items=order_items,
-            created_at=order.created_at,
-            updated_at=order.updated_at,
-            paid_at=order.paid_at,
-            shipped_at=order.shipped_at,
-            delivered_at=order.delivered_at,
-        )
+        return OrderRead.model_validate(await self.get_order_payload(order))
@@ -0,0 +1,31 @@
+"""
+Named relationship loading profiles.
+
+Cart and order relationships load lazily by default, and a lazy load cannot
+run implicitly under asyncio, so every query that reads related rows chooses
+one of these profiles and states exactly what it loads. Anything outside the
+profile raises instead of silently issuing another SELECT.
+"""
+
+from sqlalchemy.orm import joinedload, raiseload, selectinload
+from app.models.cart import Cart, CartItem
+from app.models.order import Order, OrderItem
+
+# Cart page, ETag and checkout: items with their current products
+CART_VIEW = (selectinload(Cart.items).selectinload(CartItem.product),)
+
+# Cart maintenance that moves or deletes items but never reads products;
+# validation resolves products itself through a batched ProductLoader
+CART_ITEMS = (selectinload(Cart.items).raiseload(CartItem.product),)
+
+# Status changes and summaries served from the stored totals
+CART_TOTALS_ONLY = (raiseload(Cart.items),)
+
+# A single cart item returned to the client with its product name
+CART_ITEM_VIEW = (joinedload(CartItem.product),)
+
+# Order history: only the item count is shown
+ORDER_LIST = (selectinload(Order.items).load_only(OrderItem.id, raiseload=True),)
+
+# Order detail: every item column; product_name is the stored snapshot
+ORDER_DETAIL = (selectinload(Order.items).raiseload(OrderItem.product),)
@@ -0,0 +1,114 @@
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Set
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func, case
+from app.core.cache import SingleFlight, register_cache
+from app.core.config import PRODUCT_CACHE_TTL_SECONDS
+from app.models.product import Product, CategoryFacet
+
+
+class ProductFacets:
+    """
+    Per-category counts and price ranges, kept in memory.
+
+    The first read computes every category with one GROUP BY query. After that,
+    product writes adjust the counts in place; only a category whose minimum or
+    maximum price was removed is recomputed, and only that category. A full
+    reload happens after ttl_seconds to pick up writes made by other processes.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = PRODUCT_CACHE_TTL_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self._facets: Dict[str, CategoryFacet] = {}
+        self._stale: Set[str] = set()
+        self._loaded_at: Optional[float] = None
+        self._loads = SingleFlight("product_facets")
+        register_cache(self)
+
+    async def get(self, session: AsyncSession) -> List[CategoryFacet]:
+        if self._loaded_at is None or self.clock() - self._loaded_at > self.ttl_seconds:
+            await self._loads.do("all", lambda: self._load(session, None))
+        elif self._stale:
+            await self._loads.do("stale", lambda: self._load(session, self._stale))
+        return [self._facets[c] for c in sorted(self._facets)]
+
+    def add(self, category: str, price: float, stock: int) -> None:
+        if self._loaded_at is None:
+            return
+        facet = self._facets.get(category)
+        if facet is None:
+            self._facets[category] = CategoryFacet(
+                category=category,
+                product_count=1,
+                in_stock_count=int(stock > 0),
+                min_price=price,
+                max_price=price,
+            )
+            return
+        facet.product_count += 1
+        facet.in_stock_count += int(stock > 0)
+        facet.min_price = min(facet.min_price, price)
+        facet.max_price = max(facet.max_price, price)
+
+    def remove(self, category: str, price: float, stock: int) -> None:
+        facet = self._facets.get(category)
+        if self._loaded_at is None or facet is None:
+            return
+        facet.product_count -= 1
+        facet.in_stock_count -= int(stock > 0)
+        if facet.product_count <= 0:
+            del self._facets[category]
+            self._stale.discard(category)
+        elif price <= facet.min_price or price >= facet.max_price:
+            # The bound may have belonged to the removed product
+            self._stale.add(category)
+
+    def clear(self) -> None:
+        self._facets = {}
+        self._stale = set()
+        self._loaded_at = None
+
+    async def _load(
+        self, session: AsyncSession, categories: Optional[Iterable[str]]
+    ) -> None:
+        query = select(
+            Product.category,
+            func.count(Product.id),
+            func.sum(case((Product.stock > 0, 1), else_=0)),
+            func.min(Product.price),
+            func.max(Product.price),
+        ).group_by(Product.category)
+
+        if categories is not None:
+            categories = set(categories)
+            query = query.where(Product.category.in_(categories))
+
+        result = await session.execute(query)
+        facets = {
+            category: CategoryFacet(
+                category=category,
+                product_count=count,
+                in_stock_count=in_stock or 0,
+                min_price=min_price,
+                max_price=max_price,
+            )
+            for category, count, in_stock, min_price, max_price in result.all()
+        }
+
+        if categories is None:
+            self._facets = facets
+            self._stale = set()
+            self._loaded_at = self.clock()
+        else:
+            for category in categories:
+                self._facets.pop(category, None)
+            self._facets.update(facets)
+            self._stale -= categories
+
+
+product_facets = ProductFacets()
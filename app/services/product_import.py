@@ -0,0 +1,182 @@
+import codecs
+import csv
+import io
+import json
+from enum import Enum
+from typing import Any, AsyncIterator, Dict, List, Tuple
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import text
+from app.core.config import PRODUCT_IMPORT_BATCH_SIZE
+from app.database import dialect_insert, dialect_name
+from app.models.product import Product, ProductCreate, ProductImportResult
+from app.services.product_facets import product_facets
+from app.services.product_service import product_cache
+from app.services.product_suggest import suggest_index
+
+MAX_REPORTED_ERRORS = 50
+
+IMPORT_COLUMNS = ["name", "price", "category", "description", "image_url", "stock"]
+
+
+class ImportFormat(str, Enum):
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Split a stream of byte chunks into text lines without buffering the whole."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending.rstrip("\r")
+
+
+async def iter_records(
+    chunks: AsyncIterator[bytes], fmt: ImportFormat
+) -> AsyncIterator[Tuple[int, Any]]:
+    """Yield (row number, raw record) pairs from a CSV or NDJSON stream."""
+    row_number = 0
+
+    if fmt == ImportFormat.NDJSON:
+        async for line in iter_lines(chunks):
+            if not line.strip():
+                continue
+            row_number += 1
+            try:
+                yield row_number, json.loads(line)
+            except json.JSONDecodeError:
+                yield row_number, None
+        return
+
+    header: List[str] = []
+    record = ""
+    async for line in iter_lines(chunks):
+        record = f"{record}\n{line}" if record else line
+        # A quoted field may span lines; wait until all quotes are closed
+        if record.count('"') % 2:
+            continue
+        fields = next(csv.reader(io.StringIO(record)), [])
+        record = ""
+        if not any(field.strip() for field in fields):
+            continue
+        if not header:
+            header = [field.strip() for field in fields]
+            continue
+        row_number += 1
+        # Empty cells fall back to the field defaults of ProductCreate
+        yield row_number, {k: v for k, v in zip(header, fields) if v != ""}
+
+
+class ProductImporter:
+    """
+    Streams products into the catalog in fixed-size batches.
+
+    Each batch is validated against ProductCreate, loaded with COPY into a
+    temporary staging table and upserted on name, then committed, so memory
+    stays bounded by the batch size whatever the size of the upload.
+
+    Unlike the other services, the importer commits each batch itself rather
+    than leaving the commit to unit_of_work: the staging table is dropped on
+    commit, and one transaction for the whole upload would hold its locks
+    and undo log for as long as the client keeps streaming. A failed upload
+    keeps the batches already committed. Caches are cleared after the last
+    commit.
+    """
+
+    def __init__(self, session: AsyncSession, batch_size: int = 0):
+        self.session = session
+        self.batch_size = batch_size or PRODUCT_IMPORT_BATCH_SIZE
+
+    async def run(
+        self, chunks: AsyncIterator[bytes], fmt: ImportFormat
+    ) -> ProductImportResult:
+        result = ProductImportResult(received=0, imported=0, rejected=0)
+        batch: List[ProductCreate] = []
+
+        async for row_number, raw in iter_records(chunks, fmt):
+            result.received += 1
+            try:
+                batch.append(ProductCreate.model_validate(raw))
+            except ValidationError as e:
+                self._reject(result, row_number, e.errors()[0]["msg"])
+                continue
+
+            if len(batch) >= self.batch_size:
+                result.imported += await self._write_batch(batch)
+                batch = []
+
+        if batch:
+            result.imported += await self._write_batch(batch)
+
+        if result.imported:
+            product_cache.clear()
+            product_facets.clear()
+            await suggest_index.load(self.session)
+
+        return result
+
+    def _reject(self, result: ProductImportResult, row_number: int, msg: str) -> None:
+        result.rejected += 1
+        if len(result.errors) < MAX_REPORTED_ERRORS:
+            result.errors.append(f"Row {row_number}: {msg}")
+
+    async def _write_batch(self, batch: List[ProductCreate]) -> int:
+        # Later rows win when a name repeats within the batch
+        rows: Dict[str, Dict[str, Any]] = {p.name: p.model_dump() for p in batch}
+
+        if dialect_name(self.session) == "postgresql":
+            count = await self._copy_upsert(list(rows.values()))
+        else:
+            count = await self._insert_upsert(list(rows.values()))
+
+        await self.session.commit()
+        return count
+
+    async def _copy_upsert(self, rows: List[Dict[str, Any]]) -> int:
+        await self.session.execute(
+            text(
+                "CREATE TEMP TABLE product_import_staging ("
+                "name text, price double precision, category text, "
+                "description text, image_url text, stock integer"
+                ") ON COMMIT DROP"
+            )
+        )
+
+        connection = await self.session.connection()
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            "product_import_staging",
+            records=[tuple(row[c] for c in IMPORT_COLUMNS) for row in rows],
+            columns=IMPORT_COLUMNS,
+        )
+
+        columns = ", ".join(IMPORT_COLUMNS)
+        updates = ", ".join(
+            f"{c} = excluded.{c}" for c in IMPORT_COLUMNS[1:] + ["updated_at"]
+        )
+        result = await self.session.execute(
+            text(
+                f"INSERT INTO product ({columns}, created_at, updated_at) "
+                f"SELECT {columns}, LOCALTIMESTAMP, LOCALTIMESTAMP "
+                "FROM product_import_staging "
+                f"ON CONFLICT (name) DO UPDATE SET {updates}"
+            )
+        )
+        return result.rowcount
+
+    async def _insert_upsert(self, rows: List[Dict[str, Any]]) -> int:
+        insert = dialect_insert(self.session)
+        stmt = insert(Product)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Product.name],
+            set_={c: stmt.excluded[c] for c in IMPORT_COLUMNS[1:] + ["updated_at"]},
+        )
+        await self.session.execute(stmt, rows)
+        return len(rows)
@@ -0,0 +1,98 @@
+import asyncio
+from typing import Dict, Iterable, List, Optional, Set
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from app.core.config import PRODUCT_BATCH_MAX_IDS
+from app.models.product import Product
+
+
+class ProductLoader:
+    """
+    DataLoader-style batching of product lookups for one session.
+
+    Every load() issued in the same event loop tick is collected and resolved
+    with a single `WHERE id IN (...)` query, and each id is fetched at most once
+    for the lifetime of the loader. Services create one per session, so code
+    that resolves products item by item still costs one query per batch.
+    """
+
+    def __init__(self, session: AsyncSession, max_batch_size: int = 0):
+        self.session = session
+        self.max_batch_size = max_batch_size or PRODUCT_BATCH_MAX_IDS
+        self._futures: Dict[int, "asyncio.Future[Optional[Product]]"] = {}
+        self._queue: List[int] = []
+        # AsyncSession does not allow concurrent queries
+        self._lock = asyncio.Lock()
+        self._tasks: Set["asyncio.Task[None]"] = set()
+
+    async def load(self, product_id: int) -> Optional[Product]:
+        """Load one product, batched with every other load in this tick."""
+        future = self._futures.get(product_id)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._futures[product_id] = future
+            self._queue.append(product_id)
+            if len(self._queue) == 1:
+                loop.call_soon(self._schedule_dispatch)
+        # Shielded so one cancelled caller does not fail the others
+        return await asyncio.shield(future)
+
+    async def load_many(self, product_ids: Iterable[int]) -> List[Optional[Product]]:
+        """Load several products in one query; missing ids resolve to None."""
+        return list(await asyncio.gather(*(self.load(i) for i in product_ids)))
+
+    def prime(self, product: Product) -> None:
+        """Seed the loader with an already loaded product."""
+        if product.id not in self._futures:
+            future = asyncio.get_running_loop().create_future()
+            future.set_result(product)
+            self._futures[product.id] = future
+
+    def clear(self, product_id: Optional[int] = None) -> None:
+        """Forget loaded products so the next load queries again."""
+        if product_id is None:
+            self._futures = {i: f for i, f in self._futures.items() if not f.done()}
+        elif product_id in self._futures and self._futures[product_id].done():
+            del self._futures[product_id]
+
+    def _schedule_dispatch(self) -> None:
+        # Hold a reference until the task finishes so it is not collected
+        task = asyncio.ensure_future(self._dispatch())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _dispatch(self) -> None:
+        ids, self._queue = self._queue, []
+        async with self._lock:
+            for start in range(0, len(ids), self.max_batch_size):
+                chunk = ids[start : start + self.max_batch_size]
+                try:
+                    result = await self.session.execute(
+                        select(Product).where(Product.id.in_(chunk))
+                    )
+                    found = {p.id: p for p in result.scalars().all()}
+                except asyncio.CancelledError:
+                    self._fail(ids[start:], None)
+                    raise
+                except Exception as e:
+                    self._fail(ids[start:], e)
+                    return
+
+                for product_id in chunk:
+                    future = self._futures[product_id]
+                    if not future.done():
+                        future.set_result(found.get(product_id))
+
+    def _fail(self, product_ids: List[int], error: Optional[Exception]) -> None:
+        # Failed loads are dropped so the next caller queries again
+        for product_id in product_ids:
+            future = self._futures.pop(product_id, None)
+            if future is None or future.done():
+                continue
+            if error is None:
+                future.cancel()
+            else:
+                future.set_exception(error)
+                # Mark as retrieved so a load nobody awaits does not warn
+                future.exception()
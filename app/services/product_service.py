@@ -0,0 +1,448 @@
+import csv
+import io
+import re
+from datetime import datetime
+from typing import Any, AsyncIterator, List, Optional, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy import select, func, literal_column, and_, or_, tuple_
+from sqlalchemy.orm import load_only
+from pydantic import BaseModel
+from app.database import after_commit, dialect_name
+from app.core.cache import TTLCache, SingleFlight, MISSING
+from app.core.config import PRODUCT_CACHE_MAX_ENTRIES, PRODUCT_CACHE_TTL_SECONDS
+from app.models.product import (
+    CategoryFacet,
+    Product,
+    ProductCreate,
+    ProductRead,
+    ProductSort,
+    ProductUpdate,
+    product_read_model,
+)
+from app.services.cart_service import CartService
+from app.services.product_facets import product_facets
+from app.services.product_loader import ProductLoader
+from app.services.product_suggest import suggest_index
+from app.utils.etags import weak_etag
+from app.utils.pagination import decode_cursor, next_cursor_for, InvalidCursorError
+
+# Shared by every request in this process. Pages are tagged with the category
+# they were filtered on ("category:*" when unfiltered) and with the ids of the
+# products they contain, so writes only drop the entries they can affect.
+product_cache = TTLCache(
+    "products",
+    max_entries=PRODUCT_CACHE_MAX_ENTRIES,
+    ttl_seconds=PRODUCT_CACHE_TTL_SECONDS,
+)
+product_loads = SingleFlight("products")
+
+EXPORT_BATCH_SIZE = 1000
+EXPORT_CSV_COLUMNS = list(ProductRead.model_fields)
+
+# Sort key column and direction for each listing order; ties break on id
+PRODUCT_SORTS = {
+    ProductSort.ID: (Product.id, False),
+    ProductSort.PRICE: (Product.price, False),
+    ProductSort.PRICE_DESC: (Product.price, True),
+    ProductSort.CREATED_AT: (Product.created_at, False),
+    ProductSort.CREATED_AT_DESC: (Product.created_at, True),
+    ProductSort.NAME: (Product.name, False),
+}
+
+# Fields whose change can move a product between listing pages
+LISTING_FIELDS = {"category", "price", "stock", "name"}
+
+# Fields that make up the full-text search document, plus the category that
+# searches can be filtered on
+SEARCH_FIELDS = {"name", "description", "category"}
+SEARCH_TAG = "search"
+
+
+def _product_tag(product_id: int) -> str:
+    return f"product:{product_id}"
+
+
+def _listing_tag(category: Optional[str]) -> str:
+    return f"category:{category}" if category else "category:*"
+
+
+def _category_tags(*categories: Optional[str]) -> List[str]:
+    """Tags of every listing a product in these categories can appear in."""
+    return [_listing_tag(None)] + [_listing_tag(c) for c in categories if c]
+
+
+class ProductService:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def list_products(
+        self,
+        limit: int,
+        offset: int = 0,
+        category: Optional[str] = None,
+        cursor: Optional[str] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        in_stock: Optional[bool] = None,
+        sort: ProductSort = ProductSort.ID,
+        fields: Optional[Tuple[str, ...]] = None,
+    ) -> Tuple[List[BaseModel], Optional[str], str]:
+        """
+        List products, served from the catalog cache when possible.
+
+        With a cursor the page is found by seeking past the last seen
+        (sort key, id) on the matching composite index, so deep pages cost the
+        same as the first one. Offset paging is kept for existing clients.
+        With a sparse fieldset (see parse_product_fields) only those columns are
+        loaded and the page holds trimmed read models.
+        Returns the page, the cursor for the next page (None when there is no
+        next page) and a weak ETag over the (id, updated_at) of its rows.
+        """
+        key = (
+            "page",
+            category,
+            limit,
+            offset,
+            cursor,
+            min_price,
+            max_price,
+            in_stock,
+            sort,
+            fields,
+        )
+        cached = product_cache.get(key)
+        if cached is not MISSING:
+            return cached
+
+        column, descending = PRODUCT_SORTS[sort]
+        query = select(Product)
+        read_model: type[BaseModel] = ProductRead
+        if fields:
+            # The sort key and version are needed for the cursor and ETag even
+            # if not selected
+            columns = {getattr(Product, f) for f in fields}
+            columns |= {column, Product.updated_at}
+            query = query.options(load_only(*columns))
+            read_model = product_read_model(fields)
+
+        if category:
+            query = query.where(Product.category == category)
+        if min_price is not None:
+            query = query.where(Product.price >= min_price)
+        if max_price is not None:
+            query = query.where(Product.price <= max_price)
+        if in_stock is not None:
+            query = query.where(Product.stock > 0 if in_stock else Product.stock <= 0)
+
+        if cursor is not None:
+            query = query.where(self._seek(sort, decode_cursor(cursor, sort.value)))
+        elif offset:
+            query = query.offset(offset)
+
+        if sort == ProductSort.ID:
+            order_by = [column]
+        else:
+            order_by = [column, Product.id]
+        if descending:
+            order_by = [c.desc() for c in order_by]
+
+        query = query.order_by(*order_by).limit(limit)
+        result = await self.session.execute(query)
+        rows = result.scalars().all()
+        products = [read_model.model_validate(p) for p in rows]
+
+        last_values = self._cursor_values(sort, rows[-1]) if rows else None
+        next_cursor = next_cursor_for(sort.value, last_values, len(products), limit)
+        etag = weak_etag(fields, next_cursor, [(p.id, p.updated_at) for p in rows])
+        page = (products, next_cursor, etag)
+
+        tags = [_listing_tag(category)] + [_product_tag(p.id) for p in products]
+        product_cache.set(key, page, tags=tags)
+        return page
+
+    @staticmethod
+    def _cursor_values(sort: ProductSort, product: Product) -> List[Any]:
+        if sort == ProductSort.ID:
+            return [product.id]
+        value = getattr(product, PRODUCT_SORTS[sort][0].key)
+        if isinstance(value, datetime):
+            value = value.isoformat()
+        return [value, product.id]
+
+    @staticmethod
+    def _seek(sort: ProductSort, values: List[Any]):
+        """Keyset predicate selecting rows after the cursor position."""
+        column, descending = PRODUCT_SORTS[sort]
+
+        if sort == ProductSort.ID:
+            if len(values) != 1 or not isinstance(values[0], int):
+                raise InvalidCursorError("Malformed cursor")
+            return Product.id < values[0] if descending else Product.id > values[0]
+
+        if len(values) != 2 or not isinstance(values[1], int):
+            raise InvalidCursorError("Malformed cursor")
+        value, last_id = values
+        try:
+            if column is Product.created_at:
+                value = datetime.fromisoformat(value)
+            elif column is Product.price:
+                value = float(value)
+            elif not isinstance(value, str):
+                raise TypeError
+        except (TypeError, ValueError) as e:
+            raise InvalidCursorError("Malformed cursor") from e
+
+        position = tuple_(column, Product.id)
+        if descending:
+            return position < tuple_(value, last_id)
+        return position > tuple_(value, last_id)
+
+    async def get_product(self, product_id: int) -> Optional[ProductRead]:
+        """
+        Get a single product from the cache, loading it on a miss.
+
+        Concurrent misses for the same id share one query.
+        """
+        key = ("product", product_id)
+        cached = product_cache.get(key)
+        if cached is not MISSING:
+            return cached
+
+        async def load() -> Optional[ProductRead]:
+            product = await self._get_product(product_id)
+            if not product:
+                return None
+            product_read = ProductRead.model_validate(product)
+            product_cache.set(key, product_read, tags=[_product_tag(product_id)])
+            return product_read
+
+        return await product_loads.do(key, load)
+
+    async def get_products(self, product_ids: List[int]) -> List[ProductRead]:
+        """
+        Get several products by id, in request order.
+
+        Cached products are served from memory and the rest are fetched with a
+        single IN query. Unknown ids are skipped and repeated ids returned once.
+        """
+        product_ids = list(dict.fromkeys(product_ids))
+        found = {}
+        for product_id in product_ids:
+            cached = product_cache.get(("product", product_id))
+            if cached is not MISSING and cached is not None:
+                found[product_id] = cached
+
+        missing = [i for i in product_ids if i not in found]
+        if missing:
+            loader = ProductLoader(self.session)
+            for product in await loader.load_many(missing):
+                if product is None:
+                    continue
+                product_read = ProductRead.model_validate(product)
+                product_cache.set(
+                    ("product", product.id),
+                    product_read,
+                    tags=[_product_tag(product.id)],
+                )
+                found[product.id] = product_read
+
+        return [found[i] for i in product_ids if i in found]
+
+    async def search_products(
+        self, q: str, limit: int, category: Optional[str] = None
+    ) -> List[ProductRead]:
+        """
+        Keyword search over product name and description, best matches first.
+
+        On Postgres this uses the GIN-indexed search_vector column and ranks with
+        ts_rank; other dialects fall back to an equivalent term match.
+        """
+        key = ("search", q, limit, category)
+        cached = product_cache.get(key)
+        if cached is not MISSING:
+            return cached
+
+        if dialect_name(self.session) == "postgresql":
+            products = await self._search_postgres(q, limit, category)
+        else:
+            products = await self._search_fallback(q, limit, category)
+
+        results = [ProductRead.model_validate(p) for p in products]
+        tags = [SEARCH_TAG] + [_product_tag(p.id) for p in results]
+        product_cache.set(key, results, tags=tags)
+        return results
+
+    async def _search_postgres(
+        self, q: str, limit: int, category: Optional[str]
+    ) -> List[Product]:
+        search_vector = literal_column("product.search_vector")
+        ts_query = func.websearch_to_tsquery("english", q)
+
+        query = select(Product).where(search_vector.op("@@")(ts_query))
+        if category:
+            query = query.where(Product.category == category)
+
+        query = query.order_by(
+            func.ts_rank(search_vector, ts_query).desc(), Product.id
+        ).limit(limit)
+        result = await self.session.execute(query)
+        return list(result.scalars().all())
+
+    async def _search_fallback(
+        self, q: str, limit: int, category: Optional[str]
+    ) -> List[Product]:
+        terms = re.findall(r"\w+", q.lower())
+        if not terms:
+            return []
+
+        query = select(Product).where(
+            and_(
+                *(
+                    or_(
+                        Product.name.icontains(term, autoescape=True),
+                        Product.description.icontains(term, autoescape=True),
+                    )
+                    for term in terms
+                )
+            )
+        )
+        if category:
+            query = query.where(Product.category == category)
+
+        result = await self.session.execute(query)
+
+        def rank(product: Product) -> float:
+            # Mirror the A/B weights of the Postgres search document
+            name = product.name.lower()
+            description = (product.description or "").lower()
+            return sum(
+                1.0 * name.count(term) + 0.4 * description.count(term) for term in terms
+            )
+
+        products = sorted(result.scalars().all(), key=lambda p: (-rank(p), p.id))
+        return products[:limit]
+
+    async def export_products(self, fmt: str) -> AsyncIterator[str]:
+        """
+        Stream the whole catalog as NDJSON or CSV text chunks.
+
+        Rows are fetched through a server-side cursor in batches of
+        EXPORT_BATCH_SIZE, so the table is never materialized in memory.
+        """
+        if fmt == "csv":
+            yield ",".join(EXPORT_CSV_COLUMNS) + "\r\n"
+
+        query = (
+            select(Product)
+            .order_by(Product.id)
+            .execution_options(yield_per=EXPORT_BATCH_SIZE)
+        )
+        result = await self.session.stream_scalars(query)
+        async for partition in result.partitions():
+            rows = [ProductRead.model_validate(p) for p in partition]
+            if fmt == "csv":
+                buffer = io.StringIO()
+                writer = csv.writer(buffer)
+                for row in rows:
+                    data = row.model_dump(mode="json")
+                    writer.writerow([data[c] for c in EXPORT_CSV_COLUMNS])
+                yield buffer.getvalue()
+            else:
+                yield "".join(row.model_dump_json() + "\n" for row in rows)
+
+    async def get_facets(self) -> List[CategoryFacet]:
+        """Per-category product counts, in-stock counts and price ranges."""
+        return await product_facets.get(self.session)
+
+    async def create_product(self, product_data: ProductCreate) -> Product:
+        """Create a product. Raises IntegrityError if the name is taken."""
+        product = Product(**product_data.model_dump())
+        self.session.add(product)
+        try:
+            await self.session.flush()
+        except IntegrityError:
+            await self.session.rollback()
+            raise
+        await self.session.refresh(product)
+
+        product_id, name = product.id, product.name
+        category, price, stock = product.category, product.price, product.stock
+
+        def publish() -> None:
+            product_cache.invalidate_tags(SEARCH_TAG, *_category_tags(category))
+            suggest_index.add(product_id, name)
+            product_facets.add(category, price, stock)
+
+        after_commit(self.session, publish)
+        return product
+
+    async def update_product(
+        self, product_id: int, payload: ProductUpdate
+    ) -> Optional[Product]:
+        """Apply a partial update. Returns None if the product does not exist."""
+        product = await self._get_product(product_id)
+        if not product:
+            return None
+
+        old_category, old_price, old_stock = (
+            product.category,
+            product.price,
+            product.stock,
+        )
+        changes = payload.model_dump(exclude_unset=True)
+        for key, value in changes.items():
+            setattr(product, key, value)
+
+        await self.session.flush()
+        await self.session.refresh(product)
+
+        tags = [_product_tag(product_id)]
+        if LISTING_FIELDS & changes.keys():
+            tags += _category_tags(old_category, product.category)
+        if SEARCH_FIELDS & changes.keys():
+            tags.append(SEARCH_TAG)
+        name = product.name
+        category, price, stock = product.category, product.price, product.stock
+
+        def publish() -> None:
+            product_cache.invalidate_tags(*tags)
+            if "name" in changes:
+                suggest_index.add(product_id, name)
+            if {"category", "price", "stock"} & changes.keys():
+                product_facets.remove(old_category, old_price, old_stock)
+                product_facets.add(category, price, stock)
+
+        after_commit(self.session, publish)
+        return product
+
+    async def delete_product(self, product_id: int) -> bool:
+        """Delete a product. Returns False if it does not exist."""
+        product = await self._get_product(product_id)
+        if not product:
+            return False
+
+        # The items would go with the product by cascade; remove them first so
+        # the carts' stored totals are recounted
+        await CartService(self.session).remove_product_from_carts(product_id)
+        await self.session.delete(product)
+        await self.session.flush()
+
+        category, price, stock = product.category, product.price, product.stock
+
+        def publish() -> None:
+            # Later offset pages shift, so the whole category is affected
+            product_cache.invalidate_tags(
+                _product_tag(product_id), *_category_tags(category)
+            )
+            suggest_index.remove(product_id)
+            product_facets.remove(category, price, stock)
+
+        after_commit(self.session, publish)
+        return True
+
+    async def _get_product(self, product_id: int) -> Optional[Product]:
+        result = await self.session.execute(
+            select(Product).where(Product.id == product_id)
+        )
+        return result.scalars().first()
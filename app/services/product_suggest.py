@@ -0,0 +1,106 @@
+import re
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, List, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from app.core.cache import register_cache
+from app.models.product import Product, ProductSuggestion
+
+
+def _normalize(text: str) -> str:
+    return " ".join(re.findall(r"\w+", text.lower()))
+
+
+class ProductSuggestIndex:
+    """
+    In-memory prefix index over product names for typeahead.
+
+    Names are kept in sorted arrays and looked up with bisect, so a query costs
+    O(log n) and never touches the database. Whole-name prefix matches come
+    first, followed by matches on later words ("head" finds
+    "Wireless Headphones").
+    """
+
+    def __init__(self) -> None:
+        self._names: List[Tuple[str, int]] = []
+        self._words: List[Tuple[str, int]] = []
+        self._by_id: Dict[int, str] = {}
+        register_cache(self)
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    async def load(self, session: AsyncSession) -> None:
+        """Rebuild the index from the product table."""
+        result = await session.execute(select(Product.id, Product.name))
+        self.rebuild(result.all())
+
+    def rebuild(self, products: Iterable[Tuple[int, str]]) -> None:
+        self._by_id = {product_id: name for product_id, name in products}
+        names: List[Tuple[str, int]] = []
+        words: List[Tuple[str, int]] = []
+        for product_id, name in self._by_id.items():
+            name_keys, word_keys = self._keys(product_id, name)
+            names.extend(name_keys)
+            words.extend(word_keys)
+        self._names = sorted(names)
+        self._words = sorted(words)
+
+    def add(self, product_id: int, name: str) -> None:
+        if product_id in self._by_id:
+            self.remove(product_id)
+        self._by_id[product_id] = name
+        name_keys, word_keys = self._keys(product_id, name)
+        for key in name_keys:
+            insort(self._names, key)
+        for key in word_keys:
+            insort(self._words, key)
+
+    def remove(self, product_id: int) -> None:
+        name = self._by_id.pop(product_id, None)
+        if name is None:
+            return
+        name_keys, word_keys = self._keys(product_id, name)
+        for keys, index in ((name_keys, self._names), (word_keys, self._words)):
+            for key in keys:
+                position = bisect_left(index, key)
+                if position < len(index) and index[position] == key:
+                    del index[position]
+
+    def clear(self) -> None:
+        self._names = []
+        self._words = []
+        self._by_id = {}
+
+    def suggest(self, q: str, limit: int = 10) -> List[ProductSuggestion]:
+        prefix = _normalize(q)
+        if not prefix:
+            return []
+
+        suggestions: List[ProductSuggestion] = []
+        seen = set()
+        for index in (self._names, self._words):
+            position = bisect_left(index, (prefix, 0))
+            while position < len(index) and len(suggestions) < limit:
+                key, product_id = index[position]
+                if not key.startswith(prefix):
+                    break
+                if product_id not in seen:
+                    seen.add(product_id)
+                    suggestions.append(
+                        ProductSuggestion(id=product_id, name=self._by_id[product_id])
+                    )
+                position += 1
+        return suggestions
+
+    @staticmethod
+    def _keys(
+        product_id: int, name: str
+    ) -> Tuple[List[Tuple[str, int]], List[Tuple[str, int]]]:
+        words = _normalize(name).split(" ")
+        name_keys = [(" ".join(words), product_id)]
+        word_keys = [(" ".join(words[i:]), product_id) for i in range(1, len(words))]
+        return name_keys, word_keys
+
+
+suggest_index = ProductSuggestIndex()
@@ -0,0 +1,36 @@
+"""Weak ETags and If-None-Match handling for conditional GETs."""
+
+import hashlib
+from typing import Any, Mapping, Optional
+from fastapi import Request, Response
+
+# Per-user representations: browsers may keep them but must revalidate, and
+# shared caches must not store them
+PRIVATE_CACHE_HEADERS = {"Cache-Control": "private, no-cache"}
+
+
+def weak_etag(*parts: Any) -> str:
+    """
+    Weak ETag over the row versions a representation is built from.
+
+    Parts should be cheap identifiers (ids, timestamps, counts), never the
+    rendered body, so the tag can be checked before building the response.
+    """
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=16).hexdigest()
+    return f'W/"{digest}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Whether If-None-Match names this ETag, using weak comparison."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    tags = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return etag.removeprefix("W/") in tags
+
+
+def not_modified(etag: str, headers: Optional[Mapping[str, str]] = None) -> Response:
+    """304 response carrying the validator and any caching headers."""
+    return Response(status_code=304, headers={**(headers or {}), "ETag": etag})
@@ -0,0 +1,111 @@
+"""
+MessagePack content negotiation for the API routers.
+
+Routers opt in with `route_class=NegotiatedRoute` and
+`default_response_class=NegotiatedResponse` (see app.utils.responses).
+Request bodies sent as MessagePack are decoded straight into the data FastAPI
+validates, and responses are encoded as MessagePack when the Accept header
+prefers it. JSON stays the default.
+"""
+
+from contextvars import ContextVar
+from typing import Any, Callable, Coroutine
+
+from fastapi import HTTPException, Request, Response
+from fastapi.routing import APIRoute
+import msgpack
+
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+MSGPACK_MEDIA_TYPES = {
+    MSGPACK_MEDIA_TYPE,
+    "application/x-msgpack",
+    "application/vnd.msgpack",
+}
+
+_prefers_msgpack: ContextVar[bool] = ContextVar("prefers_msgpack", default=False)
+
+
+def prefers_msgpack() -> bool:
+    """Whether the response to the current request should be MessagePack."""
+    return _prefers_msgpack.get()
+
+
+def _media_type(value: str) -> str:
+    return value.split(";", 1)[0].strip().lower()
+
+
+def accepts_msgpack(accept: str) -> bool:
+    """
+    Whether an Accept header prefers MessagePack over JSON.
+
+    Wildcards count for JSON only, so MessagePack must be asked for explicitly.
+    """
+    msgpack_q = json_q = 0.0
+    for entry in accept.split(","):
+        media_type, *params = entry.split(";")
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        media_type = media_type.strip().lower()
+        if media_type in MSGPACK_MEDIA_TYPES:
+            msgpack_q = max(msgpack_q, q)
+        elif media_type in ("application/json", "application/*", "*/*"):
+            json_q = max(json_q, q)
+    return msgpack_q > 0 and msgpack_q >= json_q
+
+
+def packb(content: Any) -> bytes:
+    """Encode JSON-compatible data as MessagePack."""
+    return msgpack.packb(content, use_bin_type=True)
+
+
+class MsgPackRequest(Request):
+    """
+    Request whose MessagePack body FastAPI reads as its JSON body.
+
+    The route presents the body as application/json, so FastAPI takes the
+    payload from json(); returning the unpacked data there hands it to body
+    validation without a JSON round trip.
+    """
+
+    async def json(self) -> Any:
+        if not hasattr(self, "_json"):
+            try:
+                self._json = msgpack.unpackb(await self.body(), raw=False)
+            except (ValueError, TypeError, msgpack.UnpackException) as e:
+                raise HTTPException(
+                    status_code=400, detail="Malformed MessagePack body"
+                ) from e
+        return self._json
+
+
+class NegotiatedRoute(APIRoute):
+    """Route that decodes MessagePack bodies and records the preferred format."""
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        handler = super().get_route_handler()
+
+        async def route_handler(request: Request) -> Response:
+            content_type = _media_type(request.headers.get("content-type", ""))
+            if content_type in MSGPACK_MEDIA_TYPES:
+                scope = dict(request.scope)
+                scope["headers"] = [
+                    (k, b"application/json" if k == b"content-type" else v)
+                    for k, v in request.scope["headers"]
+                ]
+                request = MsgPackRequest(scope, request.receive)
+
+            token = _prefers_msgpack.set(
+                accepts_msgpack(request.headers.get("accept", ""))
+            )
+            try:
+                return await handler(request)
+            finally:
+                _prefers_msgpack.reset(token)
+
+        return route_handler
@@ -0,0 +1,45 @@
+"""Opaque cursor helpers for keyset (seek) pagination."""
+
+import base64
+import json
+from typing import Any, List, Optional
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded or does not apply."""
+
+
+def encode_cursor(sort: str, values: List[Any]) -> str:
+    """
+    Encode the sort key values of the last row of a page as an opaque cursor.
+
+    The cursor records which sort it was produced for, so it cannot be replayed
+    against a listing ordered differently.
+    """
+    payload = json.dumps({"s": sort, "v": values}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str) -> List[Any]:
+    """Decode a cursor produced by encode_cursor for the given sort."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, TypeError) as e:
+        raise InvalidCursorError("Malformed cursor") from e
+
+    if not isinstance(payload, dict) or not isinstance(payload.get("v"), list):
+        raise InvalidCursorError("Malformed cursor")
+    if payload.get("s") != sort:
+        raise InvalidCursorError("Cursor does not match the requested sort order")
+
+    return payload["v"]
+
+
+def next_cursor_for(
+    sort: str, values: Optional[List[Any]], page_size: int, limit: int
+) -> Optional[str]:
+    """Return the cursor for the following page, or None on the last page."""
+    if values is None or page_size < limit:
+        return None
+    return encode_cursor(sort, values)
@@ -0,0 +1,89 @@
+"""Response helpers shared by the routers."""
+
+from functools import lru_cache
+from typing import Any, Mapping, Optional
+import orjson
+import pydantic_core
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, TypeAdapter
+from app.models.product import product_read_model
+from app.utils.negotiation import MSGPACK_MEDIA_TYPE, packb, prefers_msgpack
+
+
+class NegotiatedResponse(JSONResponse):
+    """
+    JSON response that switches to MessagePack when the client prefers it.
+
+    Used as the default response class of the routers, together with
+    NegotiatedRoute which records the preference for the current request.
+    """
+
+    def __init__(self, content: Any = None, *args: Any, **kwargs: Any):
+        self.msgpack = prefers_msgpack()
+        if self.msgpack:
+            self.media_type = MSGPACK_MEDIA_TYPE
+        super().__init__(content, *args, **kwargs)
+
+    def render(self, content: Any) -> bytes:
+        if self.msgpack:
+            return packb(pydantic_core.to_jsonable_python(content))
+        return super().render(content)
+
+
+def fieldset_response(
+    data: Any, fields: tuple[str, ...], headers: Optional[Mapping[str, str]] = None
+) -> JSONResponse:
+    """
+    Serialize products trimmed to a sparse fieldset.
+
+    Returned as a response directly, as the full ProductRead response_model
+    would reject the missing fields.
+    """
+    model = product_read_model(fields)
+    if isinstance(data, list):
+        content = [model.model_validate(p).model_dump(mode="json") for p in data]
+    else:
+        content = model.model_validate(data).model_dump(mode="json")
+    return NegotiatedResponse(content, headers=headers)
+
+
+@lru_cache(maxsize=None)
+def _list_adapter(model: type[BaseModel]) -> TypeAdapter:
+    return TypeAdapter(list[model])  # type: ignore[valid-type]
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Encode a response body without validating it again.
+
+    Pydantic models (or lists of one model) are encoded by their compiled
+    serializer. Plain data (dicts, lists, datetimes, UUIDs, enums) goes through
+    orjson.
+    """
+    if isinstance(content, BaseModel):
+        return content.__pydantic_serializer__.to_json(content)
+    if isinstance(content, list) and content and isinstance(content[0], BaseModel):
+        return _list_adapter(type(content[0])).dump_json(content)
+    return orjson.dumps(content, option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS)
+
+
+def fast_json_response(
+    content: Any,
+    status_code: int = 200,
+    headers: Optional[Mapping[str, str]] = None,
+) -> Response:
+    """
+    JSON response for the FAST_JSON_RESPONSES mode (MessagePack if preferred).
+
+    Returning a Response bypasses the route's response_model, so the content
+    must already have the response model's shape.
+    """
+    if prefers_msgpack():
+        body = packb(pydantic_core.to_jsonable_python(content))
+        media_type = MSGPACK_MEDIA_TYPE
+    else:
+        body, media_type = dumps(content), "application/json"
+    return Response(
+        body, status_code=status_code, headers=headers, media_type=media_type
+    )
@@ -0,0 +1,166 @@
+"""
+Benchmark response serialization for the hot product, cart and order endpoints.
+
+Compares the default path (services build pydantic read models, FastAPI
+validates them against the response_model and encodes them) with the
+FAST_JSON_RESPONSES path (plain payloads or cached models encoded directly).
+Reports CPU time per request for the serialization work alone; no database is
+needed as the rows are built in memory.
+
+Usage:
+    poetry run python scripts/bench_serialization.py
+    poetry run python scripts/bench_serialization.py --items 100 --requests 5000
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import List
+from uuid import uuid4
+
+# Add the project root to the path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from pydantic import TypeAdapter
+
+from app.models.cart import Cart, CartItem, CartRead, CartStatus
+from app.models.order import Order, OrderItem, OrderRead, OrderStatus, PaymentStatus
+from app.models.product import Product, ProductRead
+from app.services.cart_service import CartService
+from app.services.checkout_service import CheckoutService
+from app.utils.responses import dumps
+
+
+def build_rows(items: int):
+    now = datetime.utcnow()
+    products = [
+        Product(
+            id=i + 1,
+            name=f"Product {i}",
+            price=9.99 + i,
+            category="general",
+            description="A fairly ordinary product description. " * 5,
+            stock=100,
+            created_at=now,
+        )
+        for i in range(items)
+    ]
+    cart = Cart(
+        id=uuid4(),
+        user_id=uuid4(),
+        status=CartStatus.ACTIVE,
+        created_at=now,
+        updated_at=now,
+        items=[
+            CartItem(
+                id=uuid4(),
+                product_id=p.id,
+                product=p,
+                quantity=2,
+                unit_price=p.price,
+                created_at=now,
+                updated_at=now,
+            )
+            for p in products
+        ],
+    )
+    order = Order(
+        id=uuid4(),
+        user_id=cart.user_id,
+        order_number="ORD-BENCH",
+        status=OrderStatus.PENDING,
+        payment_status=PaymentStatus.PENDING,
+        subtotal=100.0,
+        tax=0.0,
+        shipping_cost=0.0,
+        total=100.0,
+        shipping_name="Bench User",
+        shipping_email="bench@example.com",
+        shipping_address="1 Bench St",
+        shipping_city="Bench City",
+        shipping_postal_code="12345",
+        shipping_country="USA",
+        created_at=now,
+        updated_at=now,
+        items=[
+            OrderItem(
+                id=uuid4(),
+                product_id=p.id,
+                product_name=p.name,
+                quantity=2,
+                unit_price=p.price,
+                total_price=round(2 * p.price, 2),
+                created_at=now,
+            )
+            for p in products
+        ],
+    )
+    # Listings are served from the product cache as validated models
+    product_page = [ProductRead.model_validate(p) for p in products]
+    return product_page, cart, order
+
+
+async def cpu_per_request(fn, requests: int) -> float:
+    start = time.process_time()
+    for _ in range(requests):
+        await fn()
+    return (time.process_time() - start) / requests * 1_000_000
+
+
+async def run(items: int, requests: int):
+    product_page, cart, order = build_rows(items)
+    cart_service = CartService(None)  # type: ignore[arg-type]
+    checkout_service = CheckoutService(None)  # type: ignore[arg-type]
+
+    # What FastAPI does with a response_model: validate, then dump to JSON
+    product_adapter = TypeAdapter(List[ProductRead])
+    cart_adapter = TypeAdapter(CartRead)
+    order_adapter = TypeAdapter(OrderRead)
+
+    async def products_default():
+        return product_adapter.dump_json(product_adapter.validate_python(product_page))
+
+    async def products_fast():
+        return dumps(product_page)
+
+    async def cart_default():
+        model = await cart_service.get_cart_read_model(cart)
+        return cart_adapter.dump_json(cart_adapter.validate_python(model))
+
+    async def cart_fast():
+        return dumps(await cart_service.get_cart_payload(cart))
+
+    async def order_default():
+        model = await checkout_service.get_order_read_model(order)
+        return order_adapter.dump_json(order_adapter.validate_python(model))
+
+    async def order_fast():
+        return dumps(await checkout_service.get_order_payload(order))
+
+    print(f"[INFO] {items} items per response, {requests} requests each")
+    print(f"{'endpoint':<22}{'default (us)':>14}{'fast (us)':>12}{'speedup':>10}")
+    for name, default, fast in [
+        ("GET /products/", products_default, products_fast),
+        ("GET /cart", cart_default, cart_fast),
+        ("GET /orders/{id}", order_default, order_fast),
+    ]:
+        await default()
+        await fast()
+        before = await cpu_per_request(default, requests)
+        after = await cpu_per_request(fast, requests)
+        print(f"{name:<22}{before:>14.1f}{after:>12.1f}{before / after:>9.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark JSON serialization")
+    parser.add_argument("--items", type=int, default=50, help="Items per response")
+    parser.add_argument("--requests", type=int, default=2000, help="Iterations")
+    args = parser.parse_args()
+    asyncio.run(run(args.items, args.requests))
+
+
+if __name__ == "__main__":
+    main()
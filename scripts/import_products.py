@@ -0,0 +1,62 @@
+"""
+Bulk import products from a CSV or NDJSON file.
+
+Rows are validated against the ProductCreate rules and upserted on name in
+batches (COPY into a staging table on Postgres), so files of any size can be
+loaded with bounded memory.
+
+Usage:
+    poetry run python scripts/import_products.py products.csv
+    poetry run python scripts/import_products.py products.ndjson --format ndjson
+"""
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+# Add the project root to the path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.database import async_session
+from app.services.product_import import ImportFormat, ProductImporter
+
+CHUNK_SIZE = 64 * 1024
+
+
+async def read_chunks(path: Path):
+    with path.open("rb") as f:
+        while chunk := f.read(CHUNK_SIZE):
+            yield chunk
+
+
+async def import_products(path: Path, fmt: ImportFormat, batch_size: int):
+    async with async_session() as session:
+        importer = ProductImporter(session, batch_size=batch_size)
+        result = await importer.run(read_chunks(path), fmt)
+
+    print(f"[INFO] Read {result.received} rows from {path}")
+    print(f"[SUCCESS] Imported {result.imported} products")
+    if result.rejected:
+        print(f"[WARNING] Rejected {result.rejected} rows:")
+        for error in result.errors:
+            print(f"   {error}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk import products")
+    parser.add_argument("path", type=Path, help="CSV or NDJSON file")
+    parser.add_argument(
+        "--format",
+        choices=[f.value for f in ImportFormat],
+        help="File format (defaults to the file extension)",
+    )
+    parser.add_argument("--batch-size", type=int, default=0, help="Rows per COPY batch")
+    args = parser.parse_args()
+
+    fmt = args.format or ("csv" if args.path.suffix == ".csv" else "ndjson")
+    asyncio.run(import_products(args.path, ImportFormat(fmt), args.batch_size))
+
+
+if __name__ == "__main__":
+    main()
@@ -7,6 +7,7 @@ from sqlalchemy.pool import StaticPool
 
 os.environ.setdefault("SECRET_KEY", "test_secret_for_pytest")
 
+from app.core.cache import clear_all_caches
 from app.database import get_session
 from app.main import app as fastapi_app
 from app.models.user import Base
@@ -33,6 +34,9 @@ AsyncTestingSessionLocal = async_sessionmaker(
 
 @pytest_asyncio.fixture(scope="function")
 async def setup_db():
+    # In-process caches outlive the per-test database, so start each test empty
+    clear_all_caches()
+
     # Create all tables using Base.metadata
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.drop_all)
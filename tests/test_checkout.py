@@ -4,8 +4,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.user import User
 from app.models.product import Product
 from app.models.cart import Cart, CartItem, CartStatus
-from app.models.order import Order, OrderStatus, PaymentStatus
-from uuid import uuid4
+from app.models.order import Order, OrderItem, OrderStatus, PaymentStatus
+from uuid import UUID, uuid4
 from datetime import datetime
 
 
@@ -381,3 +381,838 @@ async def test_cancel_order(client: AsyncClient, async_session: AsyncSession):
     assert response.status_code == 200
     data = response.json()
     assert data["status"] == OrderStatus.CANCELLED
+
+
+@pytest.mark.asyncio
+async def test_fast_json_responses_match_default(
+    client: AsyncClient, async_session: AsyncSession, monkeypatch
+):
+    """The fast JSON path must produce the same bodies as the response models."""
+    user = User(
+        id=uuid4(),
+        email="fast@example.com",
+        hashed_password="hashed_password",
+        username="fastuser",
+        is_active=True,
+        is_superuser=False,
+        is_verified=False,
+    )
+    product = Product(name="Fast Product", price=12.34)
+    async_session.add_all([user, product])
+    await async_session.commit()
+
+    cart = Cart(
+        id=uuid4(),
+        user_id=user.id,
+        status=CartStatus.ACTIVE,
+        created_at=datetime.utcnow(),
+        updated_at=datetime.utcnow(),
+    )
+    order = Order(
+        id=uuid4(),
+        user_id=user.id,
+        order_number="ORD-FAST-1",
+        status=OrderStatus.PENDING,
+        payment_status=PaymentStatus.PENDING,
+        subtotal=24.68,
+        tax=0.0,
+        shipping_cost=0.0,
+        total=24.68,
+        shipping_name="Test User",
+        shipping_email="fast@example.com",
+        shipping_address="123 Test St",
+        shipping_city="Test City",
+        shipping_postal_code="12345",
+        shipping_country="USA",
+        created_at=datetime.utcnow(),
+        updated_at=datetime.utcnow(),
+    )
+    async_session.add_all([cart, order])
+    await async_session.commit()
+    async_session.add_all(
+        [
+            CartItem(
+                id=uuid4(),
+                cart_id=cart.id,
+                product_id=product.id,
+                quantity=2,
+                unit_price=product.price,
+                created_at=datetime.utcnow(),
+                updated_at=datetime.utcnow(),
+            ),
+            OrderItem(
+                order_id=order.id,
+                product_id=product.id,
+                product_name=product.name,
+                quantity=2,
+                unit_price=product.price,
+                total_price=24.68,
+                created_at=datetime.utcnow(),
+            ),
+        ]
+    )
+    await async_session.commit()
+
+    from app.main import app as fastapi_app
+    from app.routers import cart as cart_router, orders, products
+    from app.routers.profile import current_active_user, current_user_optional
+
+    async def override_current_user():
+        return user
+
+    fastapi_app.dependency_overrides[current_active_user] = override_current_user
+    fastapi_app.dependency_overrides[current_user_optional] = override_current_user
+
+    paths = ["/cart", "/orders", f"/orders/{order.id}", "/products/", "/products/1"]
+    try:
+        default = [(await client.get(path)).json() for path in paths]
+        for module in (cart_router, orders, products):
+            monkeypatch.setattr(module, "FAST_JSON_RESPONSES", True)
+        fast = [(await client.get(path)).json() for path in paths]
+    finally:
+        fastapi_app.dependency_overrides.clear()
+
+    assert default[0]["items"][0]["product_name"] == "Fast Product"
+    assert default[2]["items"][0]["total_price"] == 24.68
+    assert fast == default
+
+
+@pytest.mark.asyncio
+async def test_conditional_get_returns_not_modified(
+    client: AsyncClient, async_session: AsyncSession
+):
+    """Unchanged carts and orders answer If-None-Match with 304."""
+    user = User(
+        id=uuid4(),
+        email="etag@example.com",
+        hashed_password="hashed_password",
+        username="etaguser",
+        is_active=True,
+        is_superuser=False,
+        is_verified=False,
+    )
+    product = Product(name="ETag Product", price=5.00)
+    async_session.add_all([user, product])
+    await async_session.commit()
+
+    order = Order(
+        id=uuid4(),
+        user_id=user.id,
+        order_number="ORD-ETAG-1",
+        status=OrderStatus.PENDING,
+        payment_status=PaymentStatus.PENDING,
+        subtotal=5.00,
+        tax=0.0,
+        shipping_cost=0.0,
+        total=5.00,
+        shipping_name="Test User",
+        shipping_email="etag@example.com",
+        shipping_address="123 Test St",
+        shipping_city="Test City",
+        shipping_postal_code="12345",
+        shipping_country="USA",
+        created_at=datetime.utcnow(),
+        updated_at=datetime.utcnow(),
+    )
+    async_session.add(order)
+    await async_session.commit()
+
+    from app.main import app as fastapi_app
+    from app.routers.profile import current_active_user, current_user_optional
+
+    async def override_current_user():
+        return user
+
+    fastapi_app.dependency_overrides[current_active_user] = override_current_user
+    fastapi_app.dependency_overrides[current_user_optional] = override_current_user
+
+    try:
+        for path in ["/cart", "/orders", f"/orders/{order.id}"]:
+            response = await client.get(path)
+            assert response.status_code == 200
+            etag = response.headers["etag"]
+            assert etag.startswith('W/"')
+            assert response.headers["cache-control"] == "private, no-cache"
+
+            response = await client.get(path, headers={"If-None-Match": etag})
+            assert response.status_code == 304, path
+            assert response.headers["etag"] == etag
+            assert response.content == b""
+
+        cart_etag = (await client.get("/cart")).headers["etag"]
+        response = await client.post(
+            "/cart/items", json={"product_id": product.id, "quantity": 1}
+        )
+        assert response.status_code == 200
+        response = await client.get("/cart", headers={"If-None-Match": cart_etag})
+        assert response.status_code == 200
+    finally:
+        fastapi_app.dependency_overrides.clear()
+
+
+@pytest.mark.asyncio
+async def test_add_item_upserts_quantity(async_session: AsyncSession):
+    """Adding a product already in the cart sums quantities on one row."""
+    from app.services.cart_service import CartService
+
+    product = Product(name="Upsert Product", price=4.25)
+    cart = Cart(id=uuid4(), session_id="upsert-session", status=CartStatus.ACTIVE)
+    async_session.add_all([product, cart])
+    await async_session.commit()
+
+    cart_service = CartService(async_session)
+    first = await cart_service.add_item(cart.id, product.id, quantity=2)
+    second = await cart_service.add_item(cart.id, product.id, quantity=3)
+
+    assert second.id == first.id
+    assert second.quantity == 5
+    assert second.product_name == "Upsert Product"
+    assert second.unit_price == 4.25
+    assert second.total_price == 21.25
+
+    with pytest.raises(ValueError):
+        await cart_service.add_item(cart.id, 999999, quantity=1)
+
+
+@pytest.mark.asyncio
+async def test_cart_activity_touch_is_throttled(async_session: AsyncSession):
+    """Reads only record cart activity once the touch interval has passed."""
+    from datetime import timedelta
+
+    from app.services.cart_service import CART_ACTIVITY_TOUCH_INTERVAL, CartService
+
+    recent = datetime.utcnow()
+    cart = Cart(
+        id=uuid4(),
+        session_id="touch-session",
+        status=CartStatus.ACTIVE,
+        created_at=recent,
+        updated_at=recent,
+    )
+    async_session.add(cart)
+    await async_session.commit()
+
+    cart_service = CartService(async_session)
+    cart = await cart_service.get_or_create_cart(session_id="touch-session")
+    assert cart.updated_at == recent
+
+    stale = recent - CART_ACTIVITY_TOUCH_INTERVAL - timedelta(seconds=1)
+    cart.updated_at = stale
+    await async_session.commit()
+    cart = await cart_service.get_or_create_cart(session_id="touch-session")
+    assert cart.updated_at > stale
+
+
+@pytest.mark.asyncio
+async def test_bulk_update_cart(client: AsyncClient, async_session: AsyncSession):
+    """PUT /cart/bulk sets every quantity and returns the updated cart."""
+    user = User(
+        id=uuid4(),
+        email="bulk@example.com",
+        hashed_password="hashed_password",
+        username="bulkuser",
+        is_active=True,
+        is_superuser=False,
+        is_verified=False,
+    )
+    products = [Product(name=f"Bulk {i}", price=2.0 + i) for i in range(3)]
+    async_session.add_all([user, *products])
+    await async_session.commit()
+
+    from app.main import app as fastapi_app
+    from app.routers.profile import current_active_user, current_user_optional
+
+    async def override_current_user():
+        return user
+
+    fastapi_app.dependency_overrides[current_active_user] = override_current_user
+    fastapi_app.dependency_overrides[current_user_optional] = override_current_user
+
+    try:
+        items = [
+            (
+                await client.post(
+                    "/cart/items", json={"product_id": p.id, "quantity": 1}
+                )
+            ).json()
+            for p in products
+        ]
+        response = await client.put(
+            "/cart/bulk",
+            json={
+                "items": [
+                    {"id": items[0]["id"], "quantity": 4},
+                    {"id": items[2]["id"], "quantity": 7},
+                    {"id": str(uuid4()), "quantity": 2},
+                ]
+            },
+        )
+    finally:
+        fastapi_app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    quantities = {i["id"]: i["quantity"] for i in response.json()["items"]}
+    assert quantities == {items[0]["id"]: 4, items[1]["id"]: 1, items[2]["id"]: 7}
+    assert response.json()["summary"]["total_quantity"] == 12
+
+
+@pytest.mark.asyncio
+async def test_cart_totals_are_maintained(
+    client: AsyncClient, async_session: AsyncSession
+):
+    """Every cart mutation keeps the stored totals equal to the items."""
+    from sqlalchemy import event
+
+    from app.services.cart_service import CartService
+    from tests.conftest import engine
+
+    first = Product(name="Totals A", price=2.50)
+    second = Product(name="Totals B", price=10.00)
+    async_session.add_all([first, second])
+    await async_session.commit()
+
+    # A guest cart bound to the client's session cookie, created by its
+    # first item
+    a = (
+        await client.post("/cart/items", json={"product_id": first.id, "quantity": 2})
+    ).json()
+    cart = (await client.get("/cart")).json()
+    cart_id, session_id = UUID(cart["id"]), cart["session_id"]
+    cart_service = CartService(async_session)
+
+    async def totals():
+        summary = await cart_service.get_summary(session_id=session_id)
+        return summary.total_items, summary.total_quantity, summary.subtotal
+
+    assert await totals() == (1, 2, 5.00)
+    await cart_service.add_item(cart_id, first.id, quantity=1)
+    b = await cart_service.add_item(cart_id, second.id, quantity=1)
+    assert await totals() == (2, 4, 17.50)
+
+    await cart_service.update_item_quantity(cart_id, b.id, quantity=3)
+    assert await totals() == (2, 6, 37.50)
+
+    await cart_service.bulk_update_quantities(cart_id, {UUID(a["id"]): 1, b.id: 1})
+    assert await totals() == (2, 2, 12.50)
+
+    await cart_service.remove_item(cart_id, b.id)
+    assert await totals() == (1, 1, 2.50)
+
+    await cart_service.clear_cart(cart_id)
+    assert await totals() == (0, 0, 0.0)
+
+    await cart_service.add_item(cart_id, second.id, quantity=2)
+    statements = []
+
+    def count(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", count)
+    try:
+        response = await client.get("/cart/summary")
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", count)
+
+    assert response.json() == {
+        "total_items": 1,
+        "total_quantity": 2,
+        "subtotal": 20.0,
+    }
+    assert len(statements) == 1
+
+
+@pytest.mark.asyncio
+async def test_cart_validation_engine_batches_products(async_session: AsyncSession):
+    """Validating a cart loads all of its products with one query."""
+    from sqlalchemy import event, select
+    from sqlalchemy.orm import selectinload
+
+    from app.services.cart_validation import CartValidationEngine
+    from tests.conftest import engine
+
+    products = [Product(name=f"Validate {i}", price=5.0 + i) for i in range(5)]
+    cart = Cart(id=uuid4(), session_id="validate-session", status=CartStatus.ACTIVE)
+    async_session.add_all([*products, cart])
+    await async_session.commit()
+    async_session.add_all(
+        [
+            CartItem(
+                cart_id=cart.id,
+                product_id=p.id,
+                quantity=120 if i == 1 else 1,
+                # The first item was added before a price change
+                unit_price=p.price - 1 if i == 0 else p.price,
+            )
+            for i, p in enumerate(products)
+        ]
+    )
+    await async_session.commit()
+    async_session.expunge_all()
+
+    cart = (
+        await async_session.execute(
+            select(Cart)
+            .where(Cart.id == cart.id)
+            .options(selectinload(Cart.items).lazyload(CartItem.product))
+        )
+    ).scalar_one()
+
+    statements = []
+
+    def count(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    validator = CartValidationEngine(async_session)
+    event.listen(engine.sync_engine, "before_cursor_execute", count)
+    try:
+        validation = await validator.validate(cart)
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", count)
+
+    assert len(statements) == 1
+    assert validation.is_valid
+    assert [item.product_id for item, _ in validation.price_updates] == [products[0].id]
+    assert [item.product_id for item in validation.over_limit] == [products[1].id]
+    assert len(validation.warnings) == 2
+
+    changed = validator.apply_fixes(validation)
+    assert {item.product_id for item in changed} == {products[0].id, products[1].id}
+    assert changed[0].unit_price == products[0].price
+    assert validation.over_limit[0].quantity == 99
+
+
+@pytest.mark.asyncio
+async def test_request_commits_once(client: AsyncClient, async_session: AsyncSession):
+    """Each request is one unit of work with a single commit."""
+    from sqlalchemy import event
+
+    from tests.conftest import engine
+
+    product = Product(name="Unit Of Work", price=3.00)
+    async_session.add(product)
+    await async_session.commit()
+    await client.get("/cart")
+
+    commits = []
+
+    def count(conn):
+        commits.append(conn)
+
+    event.listen(engine.sync_engine, "commit", count)
+    try:
+        response = await client.post(
+            "/cart/items", json={"product_id": product.id, "quantity": 2}
+        )
+        assert response.status_code == 200
+        assert len(commits) == 1
+
+        # A failing request is rolled back instead of committed
+        response = await client.post(
+            "/cart/items", json={"product_id": 999999, "quantity": 1}
+        )
+        assert response.status_code == 404
+        assert len(commits) == 1
+
+        response = await client.get("/cart")
+        assert response.json()["summary"]["total_quantity"] == 2
+    finally:
+        event.remove(engine.sync_engine, "commit", count)
+
+
+@pytest.mark.asyncio
+async def test_endpoint_query_counts(client: AsyncClient, async_session: AsyncSession):
+    """Each endpoint loads exactly what its loader profile names."""
+    from sqlalchemy import event
+
+    from app.main import app as fastapi_app
+    from app.routers.profile import current_active_user
+    from tests.conftest import engine
+
+    user = User(
+        id=uuid4(),
+        email="profiles@example.com",
+        hashed_password="hashed_password",
+        username="profiles",
+        is_active=True,
+        is_superuser=False,
+        is_verified=False,
+    )
+    first = Product(name="Profile A", price=4.00)
+    second = Product(name="Profile B", price=6.00)
+    async_session.add_all([user, first, second])
+    await async_session.commit()
+
+    for product in (first, second):
+        await client.post("/cart/items", json={"product_id": product.id, "quantity": 1})
+
+    order = Order(
+        id=uuid4(),
+        user_id=user.id,
+        order_number="ORD-PROFILES",
+        status=OrderStatus.PENDING,
+        payment_status=PaymentStatus.PENDING,
+        subtotal=10.00,
+        tax=0.0,
+        shipping_cost=0.0,
+        total=10.00,
+        shipping_name="Test User",
+        shipping_email="profiles@example.com",
+        shipping_address="123 Test St",
+        shipping_city="Test City",
+        shipping_postal_code="12345",
+        shipping_country="USA",
+        items=[
+            OrderItem(
+                product_id=product.id,
+                product_name=product.name,
+                quantity=1,
+                unit_price=product.price,
+                total_price=product.price,
+            )
+            for product in (first, second)
+        ],
+    )
+    async_session.add(order)
+    await async_session.commit()
+
+    statements = []
+
+    def count(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    async def queries(path, method="GET", **kwargs):
+        statements.clear()
+        event.listen(engine.sync_engine, "before_cursor_execute", count)
+        try:
+            response = await client.request(method, path, **kwargs)
+        finally:
+            event.remove(engine.sync_engine, "before_cursor_execute", count)
+        assert response.status_code == 200
+        return len(statements)
+
+    # Cart, items, products
+    assert await queries("/cart") == 3
+    assert await queries("/cart/summary") == 1
+
+    # Writes and checks start from the current cart's view, whatever the
+    # number of items; never one query per item or product
+    item_id = (await client.get("/cart")).json()["items"][0]["id"]
+    # Upsert, totals, product name
+    add = {"json": {"product_id": first.id, "quantity": 1}}
+    assert await queries("/cart/items", "POST", **add) == 6
+    # Locked item with its product, totals, item
+    update = {"json": {"quantity": 3}}
+    assert await queries(f"/cart/items/{item_id}", "PUT", **update) == 6
+    # Set-based update, recount, reload through CART_VIEW
+    bulk = {"json": {"items": [{"id": item_id, "quantity": 2}]}}
+    assert await queries("/cart/bulk", "PUT", **bulk) == 8
+    # Products come from the already loaded view
+    assert await queries("/cart/validate", "POST") == 3
+    assert await queries("/cart/health") == 3
+
+    async def override_current_user():
+        return user
+
+    fastapi_app.dependency_overrides[current_active_user] = override_current_user
+    try:
+        # Orders, then item ids or rows; never products
+        assert await queries("/orders") == 2
+        assert await queries(f"/orders/{order.id}") == 2
+    finally:
+        fastapi_app.dependency_overrides.clear()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("dialect", ["sql", "python"])
+async def test_merge_carts_combines_items(
+    async_session: AsyncSession, monkeypatch, dialect: str
+):
+    """Merging sums and caps shared products, keeps the newer price, moves the rest."""
+    from datetime import timedelta
+
+    from app.services import cart_resolution
+    from app.services.cart_resolution import CartResolutionService
+    from app.services.loader_profiles import CART_ITEMS
+
+    if dialect == "python":
+        monkeypatch.setattr(cart_resolution, "dialect_name", lambda session: "other")
+
+    shared = Product(name="Shared", price=12.00)
+    user_only = Product(name="User Only", price=1.00)
+    session_only = Product(name="Session Only", price=3.00)
+    async_session.add_all([shared, user_only, session_only])
+    await async_session.flush()
+
+    earlier = datetime.utcnow() - timedelta(hours=1)
+    user_cart = Cart(id=uuid4(), user_id=uuid4(), status=CartStatus.ACTIVE)
+    session_cart = Cart(id=uuid4(), session_id="merge", status=CartStatus.ACTIVE)
+    async_session.add_all([user_cart, session_cart])
+    async_session.add_all(
+        [
+            CartItem(
+                cart_id=user_cart.id,
+                product_id=shared.id,
+                quantity=98,
+                unit_price=10.00,
+                updated_at=earlier,
+            ),
+            CartItem(
+                cart_id=user_cart.id,
+                product_id=user_only.id,
+                quantity=1,
+                unit_price=1.00,
+            ),
+            CartItem(
+                cart_id=session_cart.id,
+                product_id=shared.id,
+                quantity=5,
+                unit_price=12.00,
+            ),
+            CartItem(
+                cart_id=session_cart.id,
+                product_id=session_only.id,
+                quantity=2,
+                unit_price=3.00,
+            ),
+        ]
+    )
+    await async_session.commit()
+    async_session.expunge_all()
+
+    resolution = CartResolutionService(async_session)
+    merged, messages = await resolution.resolve_cart_conflicts(
+        user_cart=await resolution.cart_service.get_cart_by_id(
+            user_cart.id, CART_ITEMS
+        ),
+        session_cart=await resolution.cart_service.get_cart_by_id(
+            session_cart.id, CART_ITEMS
+        ),
+    )
+    await async_session.commit()
+
+    quantities = {
+        item.product.name: (item.quantity, item.unit_price) for item in merged.items
+    }
+    assert quantities == {
+        "Shared": (99, 12.00),
+        "User Only": (1, 1.00),
+        "Session Only": (2, 3.00),
+    }
+    assert (merged.total_items, merged.total_quantity) == (3, 102)
+    assert any("capped at 99" in message for message in messages)
+    assert any("Using newer price $12.00" in message for message in messages)
+
+    abandoned = await async_session.get(Cart, session_cart.id, populate_existing=True)
+    assert abandoned.status == CartStatus.ABANDONED
+    assert abandoned.total_items == 0
+
+
+@pytest.mark.asyncio
+async def test_guest_cart_is_created_on_first_add(
+    client: AsyncClient, async_session: AsyncSession
+):
+    """Anonymous reads get a virtual empty cart; only adding an item inserts it."""
+    from sqlalchemy import event, func, select
+
+    from tests.conftest import engine
+
+    product = Product(name="First Add", price=4.00)
+    async_session.add(product)
+    await async_session.commit()
+
+    statements = []
+
+    def count(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", count)
+    try:
+        # A new session cannot have a cart: no query at all
+        response = await client.get("/cart")
+        assert len(statements) == 0
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", count)
+
+    virtual = response.json()
+    assert virtual["items"] == []
+    assert virtual["summary"]["total_items"] == 0
+
+    second = await client.get("/cart")
+    assert second.json()["id"] == virtual["id"]
+    assert second.headers["ETag"] == response.headers["ETag"]
+    assert (await client.get("/cart/health")).json()["total_items"] == 0
+    assert await async_session.scalar(select(func.count()).select_from(Cart)) == 0
+
+    response = await client.post(
+        "/cart/items", json={"product_id": product.id, "quantity": 1}
+    )
+    assert response.status_code == 200
+    assert await async_session.scalar(select(func.count()).select_from(Cart)) == 1
+    cart = (await client.get("/cart")).json()
+    assert [item["product_name"] for item in cart["items"]] == ["First Add"]
+    assert cart["id"] != virtual["id"]
+
+
+@pytest.mark.asyncio
+async def test_unsaved_cart_summary_adds_up_items(async_session: AsyncSession):
+    """A cart that was never flushed has no stored totals yet."""
+    from app.services.cart_service import CartService
+
+    cart = Cart(
+        id=uuid4(),
+        status=CartStatus.ACTIVE,
+        items=[
+            CartItem(product_id=1, quantity=2, unit_price=2.50),
+            CartItem(product_id=2, quantity=1, unit_price=10.00),
+        ],
+    )
+    summary = await CartService(async_session).calculate_cart_summary(cart)
+    assert (summary.total_items, summary.total_quantity, summary.subtotal) == (
+        2,
+        3,
+        15.00,
+    )
+
+
+@pytest.mark.asyncio
+async def test_update_item_quantity_rereads_the_row(async_session: AsyncSession):
+    """The totals delta comes from the row's current quantity, not a stale copy."""
+    from sqlalchemy import update
+
+    from app.services.cart_service import CartService
+
+    product = Product(name="Reread", price=2.00)
+    async_session.add(product)
+    await async_session.commit()
+
+    cart_service = CartService(async_session)
+    cart = await cart_service.get_or_create_cart(session_id="reread-session")
+    item = await cart_service.add_item(cart.id, product.id, quantity=1)
+    await async_session.commit()
+
+    # Another request changed the row after this session loaded the item
+    await cart_service.reload_cart(cart.id)
+    await async_session.execute(
+        update(CartItem.__table__)
+        .where(CartItem.__table__.c.id == item.id)
+        .values(quantity=5)
+    )
+    await async_session.execute(
+        update(Cart.__table__)
+        .where(Cart.__table__.c.id == cart.id)
+        .values(total_quantity=5, subtotal=10.00)
+    )
+
+    await cart_service.update_item_quantity(cart.id, item.id, quantity=2)
+    summary = await cart_service.get_summary(session_id="reread-session")
+    assert (summary.total_quantity, summary.subtotal) == (2, 4.00)
+
+
+@pytest.mark.asyncio
+async def test_deleting_product_recounts_cart_totals(async_session: AsyncSession):
+    """Carts holding a deleted product drop its items from their stored totals."""
+    from app.services.cart_service import CartService
+    from app.services.product_service import ProductService
+
+    kept = Product(name="Kept", price=1.00)
+    deleted = Product(name="Deleted", price=5.00)
+    async_session.add_all([kept, deleted])
+    await async_session.commit()
+
+    cart_service = CartService(async_session)
+    cart = await cart_service.get_or_create_cart(session_id="deleted-product")
+    await cart_service.add_item(cart.id, kept.id, quantity=1)
+    await cart_service.add_item(cart.id, deleted.id, quantity=2)
+    await async_session.commit()
+
+    assert await ProductService(async_session).delete_product(deleted.id)
+
+    summary = await cart_service.get_summary(session_id="deleted-product")
+    assert (summary.total_items, summary.total_quantity, summary.subtotal) == (
+        1,
+        1,
+        1.00,
+    )
+
+
+@pytest.mark.asyncio
+async def test_checkout_rejects_one_cent_price_change(async_session: AsyncSession):
+    """A one-cent price change blocks checkout at any price level."""
+    from app.services.cart_service import CartService
+    from app.services.checkout_service import CheckoutService
+
+    product = Product(name="One Cent", price=10.00)
+    async_session.add(product)
+    await async_session.commit()
+
+    cart_service = CartService(async_session)
+    cart = await cart_service.get_or_create_cart(user_id=uuid4())
+    await cart_service.add_item(cart.id, product.id, quantity=1)
+    product.price = 10.01
+    await async_session.commit()
+
+    cart = await cart_service.reload_cart(cart.id)
+    is_valid, errors = await CheckoutService(async_session).validate_cart_for_checkout(
+        cart
+    )
+    assert not is_valid
+    assert any("Price changed for One Cent" in error for error in errors)
+
+
+@pytest.mark.asyncio
+async def test_checkout_applies_cart_validation_rules(async_session: AsyncSession):
+    """Checkout validates with the shared engine: whole cents, expiry, item limit."""
+    from datetime import timedelta
+
+    from app.services.cart_service import CartService
+    from app.services.cart_validation import MAX_CART_ITEMS
+    from app.services.checkout_service import CheckoutService
+
+    products = [
+        Product(name=f"Rule {i}", price=0.30) for i in range(MAX_CART_ITEMS + 1)
+    ]
+    async_session.add_all(products)
+    await async_session.commit()
+
+    cart_service = CartService(async_session)
+    checkout = CheckoutService(async_session)
+    cart = await cart_service.get_or_create_cart(user_id=uuid4())
+    await cart_service.add_item(cart.id, products[0].id, quantity=1)
+    cart = await cart_service.reload_cart(cart.id)
+
+    # Float noise below a cent is not a price change
+    cart.items[0].unit_price = 0.1 + 0.2
+    assert await checkout.validate_cart_for_checkout(cart) == (True, [])
+
+    cart.expires_at = datetime.utcnow() - timedelta(minutes=1)
+    assert await checkout.validate_cart_for_checkout(cart) == (
+        False,
+        ["Cart has expired"],
+    )
+    cart.expires_at = None
+
+    for product in products[1:]:
+        await cart_service.add_item(cart.id, product.id, quantity=1)
+    cart = await cart_service.reload_cart(cart.id)
+    is_valid, errors = await checkout.validate_cart_for_checkout(cart)
+    assert not is_valid
+    assert errors == [
+        f"Cart has {MAX_CART_ITEMS + 1} items, maximum allowed is {MAX_CART_ITEMS}"
+    ]
+
+
+@pytest.mark.asyncio
+async def test_cart_health_of_persisted_cart(client: AsyncClient, async_session):
+    """The health report works for a saved cart, whose status loads as a str."""
+    product = Product(name="Healthy", price=3.00)
+    async_session.add(product)
+    await async_session.commit()
+
+    await client.post("/cart/items", json={"product_id": product.id, "quantity": 2})
+    response = await client.get("/cart/health")
+
+    assert response.status_code == 200
+    report = response.json()
+    assert report["status"] == "active"
+    assert (report["total_items"], report["total_quantity"]) == (1, 2)
+    assert report["is_valid"] is True
@@ -1,10 +1,22 @@
+import asyncio
+import csv
+import io
+import json
+
+import msgpack
 import pytest
+from sqlalchemy import event
 from sqlmodel import select
 from httpx import AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.product import Product
 from app.models.product import ProductCreate
+from app.services.product_loader import ProductLoader
+from app.services.product_service import ProductService
+from app.services.product_suggest import ProductSuggestIndex
+from app.utils.negotiation import accepts_msgpack
+from tests.conftest import engine
 
 
 @pytest.mark.asyncio
@@ -55,6 +67,672 @@ async def test_pagination(client: AsyncClient, async_session: AsyncSession):
     assert data[0]["name"] == "p2"
 
 
+@pytest.mark.asyncio
+async def test_cursor_pagination(client: AsyncClient, async_session: AsyncSession):
+    products = [Product(name=f"p{i}", price=float(i + 1)) for i in range(5)]
+    async_session.add_all(products)
+    await async_session.commit()
+
+    headers = await get_auth_headers(client)
+
+    response = await client.get("/products/?limit=2", headers=headers)
+    assert response.status_code == 200
+    assert [p["name"] for p in response.json()] == ["p0", "p1"]
+    cursor = response.headers["X-Next-Cursor"]
+
+    response = await client.get(f"/products/?limit=2&cursor={cursor}", headers=headers)
+    assert [p["name"] for p in response.json()] == ["p2", "p3"]
+    cursor = response.headers["X-Next-Cursor"]
+
+    response = await client.get(f"/products/?limit=2&cursor={cursor}", headers=headers)
+    assert [p["name"] for p in response.json()] == ["p4"]
+    assert "X-Next-Cursor" not in response.headers
+
+
+@pytest.mark.asyncio
+async def test_cursor_pagination_with_category(
+    client: AsyncClient, async_session: AsyncSession
+):
+    async_session.add_all(
+        [
+            Product(name=f"p{i}", price=1.0, category="even" if i % 2 == 0 else "odd")
+            for i in range(6)
+        ]
+    )
+    await async_session.commit()
+
+    headers = await get_auth_headers(client)
+
+    response = await client.get("/products/?limit=2&category=odd", headers=headers)
+    assert [p["name"] for p in response.json()] == ["p1", "p3"]
+
+    cursor = response.headers["X-Next-Cursor"]
+    response = await client.get(
+        f"/products/?limit=2&category=odd&cursor={cursor}", headers=headers
+    )
+    assert [p["name"] for p in response.json()] == ["p5"]
+
+
+@pytest.mark.asyncio
+async def test_invalid_cursor_rejected(client: AsyncClient):
+    headers = await get_auth_headers(client)
+
+    response = await client.get("/products/?cursor=not-a-cursor", headers=headers)
+    assert response.status_code == 400
+
+    response = await client.get("/products/?cursor=abc&offset=2", headers=headers)
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_list_products_is_cached(
+    client: AsyncClient, async_session: AsyncSession
+):
+    async_session.add(Product(name="cached", price=1.0))
+    await async_session.commit()
+
+    headers = await get_auth_headers(client)
+    first = (await client.get("/products/", headers=headers)).json()
+
+    # Rows written behind the service's back are not visible until invalidation
+    async_session.add(Product(name="hidden", price=1.0))
+    await async_session.commit()
+    second = (await client.get("/products/", headers=headers)).json()
+    assert second == first
+
+    # A write through the API invalidates the affected listings
+    await client.post("/products/", json={"name": "new", "price": 2}, headers=headers)
+    names = [
+        p["name"] for p in (await client.get("/products/", headers=headers)).json()
+    ]
+    assert names == ["cached", "hidden", "new"]
+
+    metrics = (await client.get("/metrics")).text
+    assert 'pyshop_cache_hits_total{cache="products"}' in metrics
+
+
+@pytest.mark.asyncio
+async def test_update_invalidates_only_affected_pages(
+    client: AsyncClient, async_session: AsyncSession
+):
+    async_session.add_all(
+        [Product(name="a", price=1.0, category="x"), Product(name="b", price=1.0)]
+    )
+    await async_session.commit()
+    headers = await get_auth_headers(client)
+
+    await client.get("/products/?category=x", headers=headers)
+    await client.get("/products/?category=general", headers=headers)
+
+    from app.services.product_service import product_cache
+
+    assert len(product_cache) == 2
+
+    response = await client.get("/products/?category=x", headers=headers)
+    product_id = response.json()[0]["id"]
+    await client.put(f"/products/{product_id}", json={"price": 5}, headers=headers)
+
+    # Only the page containing the updated product was dropped
+    assert len(product_cache) == 1
+    data = (await client.get("/products/?category=x", headers=headers)).json()
+    assert data[0]["price"] == 5
+
+
+@pytest.mark.asyncio
+async def test_get_product(client: AsyncClient, async_session: AsyncSession):
+    product = Product(name="Single", price=3.5)
+    async_session.add(product)
+    await async_session.commit()
+
+    headers = await get_auth_headers(client)
+    response = await client.get(f"/products/{product.id}", headers=headers)
+    assert response.status_code == 200
+    assert response.json()["name"] == "Single"
+
+    response = await client.get("/products/999", headers=headers)
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_concurrent_product_loads_share_one_query(async_session: AsyncSession):
+    product = Product(name="Viral", price=1.0)
+    async_session.add(product)
+    await async_session.commit()
+
+    statements = []
+
+    def count(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", count)
+    try:
+        service = ProductService(async_session)
+        results = await asyncio.gather(
+            *(service.get_product(product.id) for _ in range(5))
+        )
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", count)
+
+    assert all(r.name == "Viral" for r in results)
+    assert len(statements) == 1
+
+
+@pytest.mark.asyncio
+async def test_search_products(client: AsyncClient, async_session: AsyncSession):
+    async_session.add_all(
+        [
+            Product(name="Desk Lamp", price=20.0, description="Bright wireless light"),
+            Product(name="Wireless Mouse", price=25.0, description="Ergonomic mouse"),
+            Product(name="Keyboard", price=30.0, description="Mechanical keys"),
+        ]
+    )
+    await async_session.commit()
+
+    headers = await get_auth_headers(client)
+    response = await client.get("/products/search?q=wireless", headers=headers)
+    assert response.status_code == 200
+    # Name matches rank above description matches
+    assert [p["name"] for p in response.json()] == ["Wireless Mouse", "Desk Lamp"]
+
+    response = await client.get("/products/search?q=wireless+lamp", headers=headers)
+    assert [p["name"] for p in response.json()] == ["Desk Lamp"]
+
+
+@pytest.mark.asyncio
+async def test_search_sees_renamed_products(
+    client: AsyncClient, async_session: AsyncSession
+):
+    product = Product(name="Old Widget", price=1.0)
+    async_session.add(product)
+    await async_session.commit()
+
+    headers = await get_auth_headers(client)
+    response = await client.get("/products/search?q=gadget", headers=headers)
+    assert response.json() == []
+
+    await client.put(
+        f"/products/{product.id}", json={"name": "Shiny Gadget"}, headers=headers
+    )
+    response = await client.get("/products/search?q=gadget", headers=headers)
+    assert [p["name"] for p in response.json()] == ["Shiny Gadget"]
+
+    # Moving into a category shows up in searches filtered on it
+    url = "/products/search?q=gadget&category=toys"
+    assert (await client.get(url, headers=headers)).json() == []
+    await client.put(
+        f"/products/{product.id}", json={"category": "toys"}, headers=headers
+    )
+    response = await client.get(url, headers=headers)
+    assert [p["name"] for p in response.json()] == ["Shiny Gadget"]
+
+
+def test_suggest_index_prefix_lookup():
+    index = ProductSuggestIndex()
+    index.rebuild(
+        [(1, "Wireless Headphones"), (2, "Headphone Stand"), (3, "Webcam 1080P HD")]
+    )
+
+    # Whole-name prefixes rank before matches on later words
+    assert [s.id for s in index.suggest("head")] == [2, 1]
+    assert [s.name for s in index.suggest("WE")] == ["Webcam 1080P HD"]
+    assert index.suggest("zzz") == []
+
+    index.remove(2)
+    assert [s.id for s in index.suggest("head")] == [1]
+
+    index.add(1, "Studio Monitor")
+    assert index.suggest("wireless") == []
+    assert [s.id for s in index.suggest("studio mon")] == [1]
+
+
+@pytest.mark.asyncio
+async def test_suggest_follows_product_writes(client: AsyncClient):
+    headers = await get_auth_headers(client)
+    response = await client.post(
+        "/products/", json={"name": "Gaming Mouse", "price": 10}, headers=headers
+    )
+    product_id = response.json()["id"]
+
+    # Typeahead is public and served from memory
+    response = await client.get("/products/suggest?q=gam")
+    assert response.status_code == 200
+    assert response.json() == [{"id": product_id, "name": "Gaming Mouse"}]
+
+    await client.put(
+        f"/products/{product_id}", json={"name": "Office Mouse"}, headers=headers
+    )
+    assert (await client.get("/products/suggest?q=gam")).json() == []
+    assert len((await client.get("/products/suggest?q=mouse")).json()) == 1
+
+    await client.delete(f"/products/{product_id}", headers=headers)
+    assert (await client.get("/products/suggest?q=office")).json() == []
+
+
+@pytest.mark.asyncio
+async def test_product_writes_publish_after_commit(async_session: AsyncSession):
+    """Caches and the suggest index only see writes once they are committed."""
+    from app.models.product import ProductCreate, ProductUpdate
+    from app.services.product_service import ProductService
+    from app.services.product_suggest import suggest_index
+
+    service = ProductService(async_session)
+    product = await service.create_product(ProductCreate(name="Desk Lamp", price=5))
+    product_id = product.id
+    assert suggest_index.suggest("desk") == []
+    await async_session.commit()
+    assert [s.id for s in suggest_index.suggest("desk")] == [product_id]
+
+    await service.update_product(product_id, ProductUpdate(name="Floor Lamp"))
+    await async_session.rollback()
+    assert suggest_index.suggest("floor") == []
+
+    # The rolled-back update does not resurface on a later commit
+    await async_session.commit()
+    assert [s.id for s in suggest_index.suggest("desk")] == [product_id]
+
+
+@pytest.mark.asyncio
+async def test_import_products_csv(client: AsyncClient, async_session: AsyncSession):
+    async_session.add(Product(name="Existing", price=1.0, stock=5))
+    await async_session.commit()
+
+    body = (
+        "name,price,category,description,stock\n"
+        "Existing,9.99,tools,,7\n"
+        'Lamp,19.5,home,"Warm light,\nwith dimmer",3\n'
+        "Broken,-1,home,,1\n"
+        "Chair,45,home,,\n"
+    )
+    headers = await get_auth_headers(client)
+    headers["Content-Type"] = "text/csv"
+    response = await client.post("/products/import", content=body, headers=headers)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["received"] == 4
+    assert data["imported"] == 3
+    assert data["rejected"] == 1
+    assert data["errors"][0].startswith("Row 3:")
+
+    result = await async_session.execute(select(Product).order_by(Product.name))
+    products = {p.name: p for p in result.scalars().all()}
+    assert set(products) == {"Chair", "Existing", "Lamp"}
+    assert products["Existing"].price == 9.99
+    assert products["Existing"].category == "tools"
+    assert products["Lamp"].description == "Warm light,\nwith dimmer"
+    assert products["Chair"].stock == 100
+
+    # The suggest index picks up imported names
+    assert (await client.get("/products/suggest?q=lamp")).json()[0]["name"] == "Lamp"
+
+
+@pytest.mark.asyncio
+async def test_import_products_ndjson_in_batches(
+    client: AsyncClient, async_session: AsyncSession
+):
+    from app.services.product_import import ImportFormat, ProductImporter
+
+    async def chunks():
+        # Split records across chunk boundaries
+        data = "".join(
+            f'{{"name": "item{i}", "price": {i + 1}}}\n' for i in range(25)
+        ).encode()
+        for start in range(0, len(data), 7):
+            yield data[start : start + 7]
+
+    importer = ProductImporter(async_session, batch_size=10)
+    result = await importer.run(chunks(), ImportFormat.NDJSON)
+
+    assert result.received == 25
+    assert result.imported == 25
+    count = await async_session.execute(select(Product))
+    assert len(count.scalars().all()) == 25
+
+
+@pytest.mark.asyncio
+async def test_export_products(client: AsyncClient, async_session: AsyncSession):
+    async_session.add_all(
+        [
+            Product(name=f"p{i}", price=float(i + 1), description="a, b")
+            for i in range(3)
+        ]
+    )
+    await async_session.commit()
+    headers = await get_auth_headers(client)
+
+    response = await client.get("/products/export", headers=headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [r["name"] for r in rows] == ["p0", "p1", "p2"]
+
+    response = await client.get("/products/export?format=csv", headers=headers)
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [r["name"] for r in rows] == ["p0", "p1", "p2"]
+    assert rows[0]["description"] == "a, b"
+
+
+@pytest.mark.asyncio
+async def test_product_facets(client: AsyncClient, async_session: AsyncSession):
+    async_session.add_all(
+        [
+            Product(name="shirt", price=20.0, category="clothing", stock=0),
+            Product(name="jeans", price=50.0, category="clothing", stock=3),
+            Product(name="phone", price=500.0, category="electronics", stock=1),
+        ]
+    )
+    await async_session.commit()
+    headers = await get_auth_headers(client)
+
+    response = await client.get("/products/facets", headers=headers)
+    assert response.status_code == 200
+    assert response.json() == [
+        {
+            "category": "clothing",
+            "product_count": 2,
+            "in_stock_count": 1,
+            "min_price": 20.0,
+            "max_price": 50.0,
+        },
+        {
+            "category": "electronics",
+            "product_count": 1,
+            "in_stock_count": 1,
+            "min_price": 500.0,
+            "max_price": 500.0,
+        },
+    ]
+
+    # Writes through the API adjust the facets without a full recount
+    response = await client.post(
+        "/products/",
+        json={"name": "hat", "price": 10, "category": "clothing", "stock": 2},
+        headers=headers,
+    )
+    hat_id = response.json()["id"]
+    facets = (await client.get("/products/facets", headers=headers)).json()
+    assert facets[0]["product_count"] == 3
+    assert facets[0]["in_stock_count"] == 2
+    assert facets[0]["min_price"] == 10.0
+
+    await client.put(
+        f"/products/{hat_id}", json={"category": "accessories"}, headers=headers
+    )
+    facets = (await client.get("/products/facets", headers=headers)).json()
+    assert [f["category"] for f in facets] == ["accessories", "clothing", "electronics"]
+    assert facets[1]["product_count"] == 2
+    assert facets[1]["min_price"] == 20.0
+
+
+@pytest.mark.asyncio
+async def test_sorted_cursor_pagination(
+    client: AsyncClient, async_session: AsyncSession
+):
+    prices = [30.0, 10.0, 20.0, 10.0, 40.0]
+    async_session.add_all(
+        [Product(name=f"p{i}", price=price) for i, price in enumerate(prices)]
+    )
+    await async_session.commit()
+    headers = await get_auth_headers(client)
+
+    async def collect(query):
+        names, url = [], f"/products/?limit=2&{query}"
+        while True:
+            response = await client.get(url, headers=headers)
+            assert response.status_code == 200
+            names += [p["name"] for p in response.json()]
+            if "X-Next-Cursor" not in response.headers:
+                return names
+            url = (
+                f"/products/?limit=2&{query}&cursor={response.headers['X-Next-Cursor']}"
+            )
+
+    assert await collect("sort=price") == ["p1", "p3", "p2", "p0", "p4"]
+    assert await collect("sort=-price") == ["p4", "p0", "p2", "p3", "p1"]
+    assert await collect("sort=name") == ["p0", "p1", "p2", "p3", "p4"]
+    assert await collect("sort=created_at") == ["p0", "p1", "p2", "p3", "p4"]
+
+    # A cursor only applies to the sort it was issued for
+    response = await client.get("/products/?limit=2&sort=price", headers=headers)
+    cursor = response.headers["X-Next-Cursor"]
+    response = await client.get(f"/products/?cursor={cursor}", headers=headers)
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_price_and_stock_filters(
+    client: AsyncClient, async_session: AsyncSession
+):
+    async_session.add_all(
+        [
+            Product(name="cheap", price=5.0, stock=0),
+            Product(name="mid", price=15.0, stock=2),
+            Product(name="pricey", price=50.0, stock=1),
+        ]
+    )
+    await async_session.commit()
+    headers = await get_auth_headers(client)
+
+    response = await client.get("/products/?min_price=10&max_price=20", headers=headers)
+    assert [p["name"] for p in response.json()] == ["mid"]
+
+    response = await client.get("/products/?in_stock=true&sort=-price", headers=headers)
+    assert [p["name"] for p in response.json()] == ["pricey", "mid"]
+
+    # A price change moves the product between filtered pages
+    product_id = response.json()[0]["id"]
+    await client.put(f"/products/{product_id}", json={"price": 12}, headers=headers)
+    response = await client.get("/products/?min_price=10&max_price=20", headers=headers)
+    assert [p["name"] for p in response.json()] == ["mid", "pricey"]
+
+
+@pytest.mark.asyncio
+async def test_batch_lookup(client: AsyncClient, async_session: AsyncSession):
+    products = [Product(name=f"Batch {i}", price=i + 1.0) for i in range(3)]
+    async_session.add_all(products)
+    await async_session.commit()
+    ids = [products[2].id, 999, products[0].id, products[2].id]
+    headers = await get_auth_headers(client)
+
+    response = await client.get(
+        "/products/batch", params={"ids": ",".join(map(str, ids))}, headers=headers
+    )
+    assert response.status_code == 200
+    assert [p["name"] for p in response.json()] == ["Batch 2", "Batch 0"]
+
+    response = await client.post("/products/batch", json={"ids": ids}, headers=headers)
+    assert [p["name"] for p in response.json()] == ["Batch 2", "Batch 0"]
+
+    response = await client.get("/products/batch?ids=1,x", headers=headers)
+    assert response.status_code == 400
+    response = await client.post(
+        "/products/batch", json={"ids": list(range(1, 500))}, headers=headers
+    )
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_product_loader_batches_loads(async_session: AsyncSession):
+    products = [Product(name=f"Loader {i}", price=1.0) for i in range(4)]
+    async_session.add_all(products)
+    await async_session.commit()
+
+    statements = []
+
+    def count(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    loader = ProductLoader(async_session)
+    event.listen(engine.sync_engine, "before_cursor_execute", count)
+    try:
+        first, second, missing = await asyncio.gather(
+            loader.load(products[0].id),
+            loader.load(products[1].id),
+            loader.load(999),
+        )
+        rest = await loader.load_many([p.id for p in products])
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", count)
+
+    assert (first.name, second.name, missing) == ("Loader 0", "Loader 1", None)
+    assert [p.name for p in rest] == [p.name for p in products]
+    # One query for the first tick, one for the two ids not seen before
+    assert len(statements) == 2
+
+
+@pytest.mark.asyncio
+async def test_sparse_fieldsets(client: AsyncClient, async_session: AsyncSession):
+    async_session.add_all(
+        [
+            Product(name=f"Sparse {i}", price=10.0 - i, description="x" * 500)
+            for i in range(3)
+        ]
+    )
+    await async_session.commit()
+    headers = await get_auth_headers(client)
+
+    statements = []
+
+    def count(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", count)
+    try:
+        response = await client.get(
+            "/products/?limit=2&sort=price&fields=name,image_url", headers=headers
+        )
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", count)
+
+    assert response.status_code == 200
+    assert response.json() == [
+        {"name": "Sparse 2", "image_url": None, "id": 3},
+        {"name": "Sparse 1", "image_url": None, "id": 2},
+    ]
+    product_query = next(s for s in statements if "FROM product" in s)
+    assert "description" not in product_query
+
+    # Paging continues on the sort key even though price was not selected
+    cursor = response.headers["X-Next-Cursor"]
+    response = await client.get(
+        f"/products/?limit=2&sort=price&fields=name&cursor={cursor}", headers=headers
+    )
+    assert response.json() == [{"name": "Sparse 0", "id": 1}]
+
+    response = await client.get("/products/1?fields=price", headers=headers)
+    assert response.json() == {"price": 10.0, "id": 1}
+
+    response = await client.get("/products/?fields=name,secret", headers=headers)
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_public_catalog_is_cacheable(
+    client: AsyncClient, async_session: AsyncSession
+):
+    async_session.add_all(
+        [Product(name="Lamp", price=20.0), Product(name="Desk", price=90.0)]
+    )
+    await async_session.commit()
+
+    response = await client.get("/catalog/products?limit=1&fields=name")
+    assert response.status_code == 200
+    assert response.json() == [{"name": "Lamp", "id": 1}]
+    assert response.headers["cache-control"].startswith("public, max-age=")
+    assert "stale-while-revalidate=" in response.headers["cache-control"]
+    assert response.headers["vary"].startswith("Accept, Accept-Encoding")
+    assert "set-cookie" not in response.headers
+
+    cursor = response.headers["X-Next-Cursor"]
+    response = await client.get(f"/catalog/products?cursor={cursor}")
+    assert [p["name"] for p in response.json()] == ["Desk"]
+
+    response = await client.get("/catalog/products/2")
+    assert response.json()["name"] == "Desk"
+    assert response.headers["cache-control"].startswith("public")
+
+    response = await client.get("/catalog/search?q=lamp")
+    assert [p["name"] for p in response.json()] == ["Lamp"]
+
+    # Errors must not be stored by shared caches
+    response = await client.get("/catalog/products/999")
+    assert response.status_code == 404
+    assert "cache-control" not in response.headers
+
+
+def test_accepts_msgpack():
+    assert accepts_msgpack("application/msgpack")
+    assert accepts_msgpack("application/x-msgpack, application/json;q=0.5")
+    assert not accepts_msgpack("application/json")
+    assert not accepts_msgpack("*/*")
+    assert not accepts_msgpack("application/msgpack;q=0.5, application/json")
+
+
+@pytest.mark.asyncio
+async def test_msgpack_negotiation(client: AsyncClient):
+    headers = await get_auth_headers(client)
+    msgpack_headers = {
+        **headers,
+        "Accept": "application/msgpack",
+        "Content-Type": "application/msgpack",
+    }
+
+    response = await client.post(
+        "/products/",
+        content=msgpack.packb({"name": "Packed", "price": 4.5}),
+        headers=msgpack_headers,
+    )
+    assert response.status_code == 201
+    assert response.headers["content-type"] == "application/msgpack"
+    created = msgpack.unpackb(response.content)
+    assert (created["name"], created["price"]) == ("Packed", 4.5)
+
+    response = await client.get("/products/", headers=msgpack_headers)
+    assert [p["name"] for p in msgpack.unpackb(response.content)] == ["Packed"]
+
+    # JSON stays the default
+    response = await client.get("/products/", headers=headers)
+    assert response.headers["content-type"] == "application/json"
+    assert response.json()[0]["created_at"] == created["created_at"]
+
+    response = await client.post("/products/", content=b"\xc1", headers=msgpack_headers)
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_product_list_etag(client: AsyncClient, async_session: AsyncSession):
+    product = Product(name="Tagged", price=3.50)
+    async_session.add(product)
+    await async_session.commit()
+    headers = await get_auth_headers(client)
+
+    response = await client.get("/products/", headers=headers)
+    etag = response.headers["etag"]
+    response = await client.get(
+        "/products/", headers={**headers, "If-None-Match": etag}
+    )
+    assert response.status_code == 304
+    assert response.content == b""
+
+    # The tag depends on the fieldset as well as the rows
+    response = await client.get(
+        "/products/?fields=name", headers={**headers, "If-None-Match": etag}
+    )
+    assert response.status_code == 200
+
+    await client.put(f"/products/{product.id}", json={"price": 4.50}, headers=headers)
+    response = await client.get(
+        "/products/", headers={**headers, "If-None-Match": etag}
+    )
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+
+    response = await client.get("/catalog/products", headers={"If-None-Match": "*"})
+    assert response.status_code == 304
+    assert response.headers["cache-control"].startswith("public")
+
+
 @pytest.mark.asyncio
 async def test_update_product(client: AsyncClient, async_session: AsyncSession):
     # Create a product first
@@ -65,3 +65,62 @@ async def test_cart_works_with_session_middleware(client: AsyncClient):
     assert "items" in cart_data
     assert cart_data["items"] == []
     assert cart_data["summary"]["total_items"] == 0
+
+
+@pytest.mark.asyncio
+async def test_login_merges_guest_cart_once(client: AsyncClient, async_session):
+    """Login merges the guest cart and marks the session cookie."""
+    from sqlalchemy import event
+
+    from app.models.product import Product
+    from tests.conftest import engine
+
+    product = Product(name="Guest Item", price=5.00)
+    async_session.add(product)
+    await async_session.commit()
+
+    await client.post("/cart/items", json={"product_id": product.id, "quantity": 2})
+    await client.post(
+        "/auth/register",
+        json={
+            "email": "merge@example.com",
+            "username": "mergeuser",
+            "password": "SecurePass123",
+        },
+    )
+    response = await client.post(
+        "/auth/jwt/login",
+        data={"username": "merge@example.com", "password": "SecurePass123"},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    assert "pyshop_cart_session" in response.cookies
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    statements = []
+
+    def count(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", count)
+    try:
+        response = await client.get("/cart", headers=headers)
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", count)
+
+    cart = response.json()
+    assert cart["user_id"] is not None
+    assert [item["quantity"] for item in cart["items"]] == [2]
+    # The marker skips the session-cart lookup
+    assert not any("cart.session_id = " in statement for statement in statements)
+
+    # So does a bearer-only client, whose session is new on every request
+    client.cookies.clear()
+    statements.clear()
+    event.listen(engine.sync_engine, "before_cursor_execute", count)
+    try:
+        response = await client.get("/cart", headers=headers)
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", count)
+
+    assert [item["quantity"] for item in response.json()["items"]] == [2]
+    assert not any("cart.session_id = " in statement for statement in statements)